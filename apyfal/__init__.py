@@ -39,7 +39,7 @@ from apyfal._utilities import (
     get_logger as _get_logger, memoizedmethod as _memoizedmethod)
 from apyfal._iterators import iter_accelerators
 from apyfal._pool_executor import (
-    AcceleratorPoolExecutor, _AbstractAsyncAccelerator)
+    AcceleratorPoolExecutor, _AbstractAsyncAccelerator, _InFlightProcesses)
 
 
 # Makes get_logger available here for easy access
@@ -78,6 +78,9 @@ class Accelerator(_AbstractAsyncAccelerator):
     # Number of parallel workers
     _WORKERS_COUNT = 8
 
+    # Number of process inputs prefetched for queued process operations
+    _PREFETCH_COUNT = 2
+
     def __init__(self, accelerator=None, config=None, accelize_client_id=None,
                  accelize_secret_id=None, host_type=None, host_ip=None,
                  stop_mode=None, prefer_self_hosted=None, **host_kwargs):
@@ -92,6 +95,10 @@ class Accelerator(_AbstractAsyncAccelerator):
         # Initialize configuration
         config = _cfg.create_configuration(config)
 
+        # Coalesces identical operations in flight (Disabled by default)
+        self._in_flight = _InFlightProcesses() if config['cache'].get_literal(
+            'coalesce_in_flight') else None
+
         # Create host object
         host_type, is_local = self._get_host(
             config, host_type, prefer_self_hosted)
@@ -189,6 +196,29 @@ class Accelerator(_AbstractAsyncAccelerator):
         """
         return _ThreadPoolExecutor(max_workers=self._WORKERS_COUNT)
 
+    @property
+    def _prefetch_window(self):
+        """
+        Maximum number of inputs fetched in advance for process operations
+        not yet started.
+
+        Returns:
+            int: count.
+        """
+        return self._PREFETCH_COUNT
+
+    def _prefetch(self, src):
+        """
+        Returns context manager that fetches a process input in advance.
+
+        Args:
+            src (path-like object or file-like object): Process input.
+
+        Returns:
+            context manager or None: None if input don't need to be fetched.
+        """
+        return self._client._prefetch(src)
+
     @property
     def process_running_count(self):
         """
@@ -252,6 +282,9 @@ class Accelerator(_AbstractAsyncAccelerator):
             # Set accelerator URL to host URL
             self._client.url = self._host.url
 
+            # Opens connection to host while preparing first request
+            self._client._preconnect()
+
             # Get environment
             host_env = self._host.get_configuration_env(**(host_env or dict()))
 
@@ -269,6 +302,8 @@ class Accelerator(_AbstractAsyncAccelerator):
             src (path-like object or file-like object):
                 Source data to process.
                 Path-like object can be path, URL or cloud object URL.
+                URL can end with a "#bytes=start-end" byte range to process
+                only a part of source (See "apyfal.storage.split_range").
             dst (path-like object or file-like object):
                 Processed data destination.
                 Path-like object can be path, URL or cloud object URL.
@@ -307,10 +342,17 @@ class Accelerator(_AbstractAsyncAccelerator):
 
         See "apyfal.Accelerator.process"
 
+        If "coalesce_in_flight" is enabled in configuration, identical
+        operations (Same "src" and "parameters") submitted while an operation
+        is in flight are attached to this operation and share its result.
+        Processed data is copied to "dst" if it differs.
+
         Args:
             src (path-like object or file-like object):
                 Source data to process.
                 Path-like object can be path, URL or cloud object URL.
+                URL can end with a "#bytes=start-end" byte range to process
+                only a part of source (See "apyfal.storage.split_range").
             dst (path-like object or file-like object):
                 Processed data destination.
                 Path-like object can be path, URL or cloud object URL.
@@ -333,8 +375,13 @@ class Accelerator(_AbstractAsyncAccelerator):
                 content.
         """
         # Submits process
-        future = self._workers.submit(self.process, src=src, dst=dst,
-                                      info_dict=info_dict, **parameters)
+        if self._in_flight is not None:
+            future = self._in_flight.submit(
+                self._workers.submit, self.process, src=src, dst=dst,
+                info_dict=info_dict, **parameters)
+        else:
+            future = self._workers.submit(self.process, src=src, dst=dst,
+                                          info_dict=info_dict, **parameters)
 
         # Keeps track of running tasks (Or planned in queue)
         self._tasks_count += 1
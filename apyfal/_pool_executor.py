@@ -1,12 +1,18 @@
 # coding=utf-8
 """concurrent.futures like Accelerator pool executor"""
 from abc import abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    Future, ThreadPoolExecutor, as_completed, wait)
+from copy import deepcopy
+import json as _json
+from threading import Lock
 from time import time
 
 import apyfal.exceptions as _exc
+import apyfal.storage as _srg
+from apyfal.client._write_behind import wait_upload
 from apyfal.configuration import create_configuration
-from apyfal._utilities import ABC
+from apyfal._utilities import ABC, fsdecode, get_logger
 
 
 class _AbstractAsyncAccelerator(ABC):
@@ -30,14 +36,18 @@ class _AbstractAsyncAccelerator(ABC):
         Map process execution on multiples files.
 
         Args:
-            srcs (iterable of path-like object or file-like object):
+            srcs (str or iterable of path-like object or file-like object):
                 Iterable of input data to process.
                 Must be an iterable of "src" parameters of the "process" method.
                 Path-like object can be path, URL or cloud object URL.
-            dsts (iterable of path-like object or file-like object):
+                If str, is a glob pattern of input files URL
+                (See "apyfal.storage.glob").
+            dsts (str or iterable of path-like object or file-like object):
                 Iterable of output data.
                 Must be an iterable of "dst" parameters of the "process" method.
                 Path-like object can be path, URL or cloud object URL.
+                If str, is a directory URL ending with "/" or an URL
+                containing "{name}" that is replaced by "srcs" file names.
             timeout (float): The maximum number of seconds to wait. If None,
                 then there is no limit on the wait time.
             parameters (path-like object, str or dict): Accelerator process
@@ -66,6 +76,18 @@ class _AbstractAsyncAccelerator(ABC):
         if timeout is not None:
             end_time = timeout + time()
 
+        # Expands files patterns
+        if isinstance(srcs, str):
+            srcs = _srg.glob(srcs)
+        if isinstance(dsts, str):
+            if srcs is None:
+                raise _exc.ClientConfigurationException(
+                    '"dsts" pattern requires "srcs".')
+            try:
+                dsts = _srg._get_destinations(srcs, dsts)
+            except _exc.StorageConfigurationException as exception:
+                raise _exc.ClientConfigurationException(str(exception))
+
         # Get file count
         src = dst = None
         if srcs is not None:
@@ -95,6 +117,10 @@ class _AbstractAsyncAccelerator(ABC):
                 src=src, dst=dst, info_dict=self._get_info_dict(info_list),
                 **parameters))
 
+        # Fetches next inputs in advance
+        if size_src:
+            self._prefetch_inputs(srcs, futures)
+
         def result_iterator():
             """
             Yield must be hidden in closure so that the futures are submitted
@@ -115,6 +141,99 @@ class _AbstractAsyncAccelerator(ABC):
 
         return result_iterator()
 
+    # Delay between checks of prefetched process operations start in seconds
+    _PREFETCH_POLL_INTERVAL = 0.1
+
+    @property
+    def _prefetch_window(self):
+        """
+        Maximum number of inputs fetched in advance for process operations
+        not yet started.
+
+        Returns:
+            int: count. 0 if prefetch is not supported.
+        """
+        return 0
+
+    def _prefetch(self, src):
+        """
+        Returns context manager that fetches a process input in advance.
+
+        Args:
+            src (path-like object or file-like object): Process input.
+
+        Returns:
+            context manager or None: None if input don't need to be fetched.
+        """
+
+    def _prefetch_inputs(self, srcs, futures):
+        """
+        Fetches process inputs in advance, in submission order, while
+        previous process operations are running.
+
+        Only inputs of process operations not yet started are fetched, running
+        operations fetch their input themselves.
+
+        Args:
+            srcs (list of path-like object or file-like object): Inputs.
+            futures (list of concurrent.futures.Future): Process futures
+                related to inputs.
+        """
+        window = self._prefetch_window
+        if not window:
+            return
+
+        prefetches = [(prefetch, future) for prefetch, future in zip(
+            (self._prefetch(src) for src in srcs), futures)
+            if prefetch is not None]
+        if not prefetches:
+            return
+
+        def release(prefetch):
+            """
+            Releases fetched input.
+
+            Args:
+                prefetch (context manager): Prefetch context manager.
+            """
+            try:
+                prefetch.__exit__(None, None, None)
+            except Exception as exception:
+                get_logger().debug("Unable to release input: %s", exception)
+
+        def hold(prefetch, future):
+            """
+            Fetches input and keeps it until process operation completion.
+
+            The window slot is freed once the process operation started.
+
+            Args:
+                prefetch (context manager): Prefetch context manager.
+                future (concurrent.futures.Future): Process future.
+            """
+            # Process operation already started: Nothing to fetch in advance
+            if future.running() or future.done():
+                return
+
+            try:
+                prefetch.__enter__()
+
+            # Process operation handles errors itself
+            except Exception as exception:
+                get_logger().debug("Unable to prefetch input: %s", exception)
+                return
+
+            future.add_done_callback(lambda _: release(prefetch))
+            while not (future.running() or future.done()):
+                wait([future], timeout=self._PREFETCH_POLL_INTERVAL)
+
+        # Number of workers limits inputs fetched in advance
+        executor = ThreadPoolExecutor(
+            max_workers=min(window, len(prefetches)))
+        for prefetch, future in prefetches:
+            executor.submit(hold, prefetch, future)
+        executor.shutdown(wait=False)
+
     @staticmethod
     def _get_info_dict(info_list):
         """
@@ -133,6 +252,202 @@ class _AbstractAsyncAccelerator(ABC):
         return None
 
 
+class _InFlightProcesses(object):
+    """
+    Coalesces identical concurrent process operations.
+
+    A process operation with same source and parameters than an operation
+    already in flight is not processed again: It is attached to the
+    first operation and share a copy of its result. If destination differs,
+    the processed data is copied from first operation destination.
+    """
+
+    def __init__(self):
+        self._processes = {}
+        self._lock = Lock()
+
+    def submit(self, submit, process, src=None, dst=None, info_dict=None,
+               **parameters):
+        """
+        Schedules the process operation or attaches it to an identical
+        operation in flight.
+
+        Args:
+            submit (callable): Executor "submit" method.
+            process (callable): Process function.
+            src (path-like object or file-like object):
+                Source data to process.
+            dst (path-like object or file-like object):
+                Processed data destination.
+            info_dict (dict or None): If a dict passed, this dict is updated
+                with extra information from current operation.
+            parameters: Accelerator process specific parameters.
+
+        Returns:
+            concurrent.futures.Future: Future object representing execution.
+        """
+        key = self._get_key(src, parameters)
+        if key is not None:
+            with self._lock:
+                try:
+                    leader, leader_dst, leader_info_dict = self._processes[key]
+                except KeyError:
+                    # First operation: Processes it normally
+                    future = submit(process, src=src, dst=dst,
+                                    info_dict=info_dict, **parameters)
+                    self._processes[key] = (
+                        future, self._get_dst(dst), info_dict)
+                    leader = None
+
+            # Callback is called immediately if already done: Must be added
+            # outside lock
+            if leader is None:
+                future.add_done_callback(lambda _: self._release(key, future))
+                return future
+
+            # Operation in flight: Attaches to it if its output can be shared
+            if dst is None or leader_dst is not None:
+                return self._attach(
+                    submit, leader, leader_dst, leader_info_dict, dst,
+                    info_dict)
+
+        return submit(process, src=src, dst=dst, info_dict=info_dict,
+                      **parameters)
+
+    def _release(self, key, future):
+        """
+        Removes operation from operations in flight.
+
+        Only for use as callback.
+
+        Args:
+            key (str): Operation key.
+            future (concurrent.futures.Future): Operation future.
+        """
+        with self._lock:
+            if self._processes.get(key, (None,))[0] is future:
+                del self._processes[key]
+
+    @staticmethod
+    def _attach(submit, leader, leader_dst, leader_info_dict, dst,
+                info_dict):
+        """
+        Attaches an operation to an operation in flight.
+
+        Args:
+            submit (callable): Executor "submit" method.
+            leader (concurrent.futures.Future): Operation in flight future.
+            leader_dst (str or None): Operation in flight destination.
+            leader_info_dict (dict or None): Operation in flight info dict.
+            dst (path-like object or file-like object):
+                Processed data destination.
+            info_dict (dict or None): Info dict.
+
+        Returns:
+            concurrent.futures.Future: Future object representing execution.
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def complete(result, copy=False):
+            """
+            Copies processed data to destination and returns result.
+
+            Args:
+                result: Operation in flight result.
+                copy (bool): If True, copies processed data.
+
+            Returns:
+                Copy of result.
+            """
+            if copy:
+                wait_upload(leader_dst)
+                _srg.copy(leader_dst, dst)
+            if info_dict is not None and leader_info_dict is not None:
+                info_dict.update(deepcopy(leader_info_dict))
+            return deepcopy(result)
+
+        def resolve(done):
+            """
+            Sets result from a completed future.
+
+            Only for use as callback.
+            """
+            try:
+                result = done.result()
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        def fan_out(_):
+            """
+            Sets result and copies processed data to destination.
+
+            Only for use as callback.
+            """
+            try:
+                result = leader.result()
+
+                # Copies on its own task to not block the operation in flight
+                # worker with copies of each attached operation
+                if dst is not None and (
+                        hasattr(dst, 'write') or fsdecode(dst) != leader_dst):
+                    submit(complete, result, True).add_done_callback(
+                        resolve)
+                    return
+
+                result = complete(result)
+            except BaseException as exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+        get_logger().debug("Process operation attached to in flight operation")
+        leader.add_done_callback(fan_out)
+        return future
+
+    @staticmethod
+    def _get_key(src, parameters):
+        """
+        Gets operation key.
+
+        Args:
+            src (path-like object or file-like object):
+                Source data to process.
+            parameters (dict): Process parameters.
+
+        Returns:
+            str or None: key, None if operation can't be coalesced.
+        """
+        # Requires an input that can be identified: Result of processing
+        # without input may not be reproducible
+        if src is None or _srg.parse_url(src, host=False)[0] == 'stream':
+            return None
+
+        try:
+            return _json.dumps([fsdecode(src), parameters], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _get_dst(dst):
+        """
+        Gets destination that can be used to copy processed data.
+
+        Args:
+            dst (path-like object or file-like object):
+                Processed data destination.
+
+        Returns:
+            str or None: Destination, None if processed data can't be copied.
+        """
+        if dst is None or _srg.parse_url(dst, host=False)[0] in (
+                'stream', 'host'):
+            return None
+        return fsdecode(dst)
+
+
 class AcceleratorPoolExecutor(_AbstractAsyncAccelerator):
     """
     An executor that uses a pool of workers_count identically configured
@@ -179,6 +494,12 @@ class AcceleratorPoolExecutor(_AbstractAsyncAccelerator):
             accelize_secret_id=accelize_secret_id, host_type=host_type,
             stop_mode=stop_mode, **host_kwargs) for _ in range(workers_count)]
 
+        # Coalesces identical operations in flight on all workers
+        in_flight = _InFlightProcesses() if config['cache'].get_literal(
+            'coalesce_in_flight') else None
+        for worker in self._workers:
+            worker._in_flight = in_flight
+
     def __enter__(self):
         return self
 
@@ -255,6 +576,9 @@ class AcceleratorPoolExecutor(_AbstractAsyncAccelerator):
         Returns:
             list: List of "Accelerator.start" results.
         """
+        # Creates all hosts instances together
+        self._start_hosts(stop_mode)
+
         with ThreadPoolExecutor(max_workers=self._workers_count) as executor:
             futures = [executor.submit(
                 worker.start, stop_mode=stop_mode, src=src,
@@ -263,6 +587,50 @@ class AcceleratorPoolExecutor(_AbstractAsyncAccelerator):
                 for worker in self._workers]
         return [future.result() for future in as_completed(futures)]
 
+    @property
+    def _prefetch_window(self):
+        """
+        Maximum number of inputs fetched in advance for process operations
+        not yet started.
+
+        Returns:
+            int: count.
+        """
+        return sum(worker._prefetch_window for worker in self._workers)
+
+    def _prefetch(self, src):
+        """
+        Returns context manager that fetches a process input in advance.
+
+        Args:
+            src (path-like object or file-like object): Process input.
+
+        Returns:
+            context manager or None: None if input don't need to be fetched.
+        """
+        # Fetched inputs are shared between all clients of current process:
+        # Any worker can fetch it
+        return self._workers[0]._prefetch(src)
+
+    def _start_hosts(self, stop_mode=None):
+        """
+        Creates and starts workers hosts instances together.
+
+        Host initialization is done once and instances are launched with a
+        single request if supported by the host.
+
+        Args:
+            stop_mode (str or int): Host stop mode.
+        """
+        # Needs to lazy import to avoid importing issues
+        from apyfal.host._csp import CSPHost
+
+        hosts = [host for host in self.hosts if isinstance(host, CSPHost)]
+        if hosts:
+            CSPHost._start_many(
+                hosts, accelerator=self._workers[0].client.name,
+                stop_mode=stop_mode)
+
     def process_submit(self, src=None, dst=None, info_dict=None,
                        **parameters):
         """
@@ -271,6 +639,11 @@ class AcceleratorPoolExecutor(_AbstractAsyncAccelerator):
 
         See "apyfal.Accelerator.process".
 
+        If "coalesce_in_flight" is enabled in configuration, identical
+        operations (Same "src" and "parameters") submitted while an operation
+        is in flight on any worker are attached to this operation and share
+        its result. Processed data is copied to "dst" if it differs.
+
         Args:
             src (path-like object or file-like object):
                 Source data to process.
@@ -6,10 +6,12 @@ import collections
 from contextlib import contextmanager
 from importlib import import_module
 from ipaddress import ip_network
+import json
 import logging
 import os
 import re
 import sys
+from tempfile import mkstemp
 from threading import Lock
 from socket import socket, AF_INET, SOCK_STREAM, SHUT_RDWR
 import time
@@ -18,8 +20,16 @@ import requests
 from requests.adapters import HTTPAdapter
 import warnings
 
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:
+    # Not available on this platform: Not locked between processes
+    flock = None
+
 
 _CACHE = dict()  # Store some cached values
+_SHARED_CLIENTS = dict()  # Clients shared in current process
+_SHARED_CLIENTS_LOCK = Lock()
 SSH_DIR = os.path.expanduser('~/.ssh')  # SSH Directory
 
 PUBLIC_IP_API = [
@@ -30,6 +40,7 @@ if sys.version_info[0] >= 3:
     # Python 3: redirect name to existing objects
     fsdecode = os.fsdecode
     makedirs = os.makedirs
+    replace = os.replace
     ABC = abc.ABC
 
 else:
@@ -59,6 +70,9 @@ else:
             if not exist_ok or not os.path.isdir(name):
                 raise
 
+    # "os.rename" replaces existing destination on POSIX
+    replace = os.rename
+
     # Back port of "abc.ABC" base abstract class
     ABC = abc.ABCMeta('ABC', (object,), {})
 
@@ -454,6 +468,64 @@ def create_key_pair_file(key_pair, key_content):
     os.chmod(key_filename, 0o400)
 
 
+@contextmanager
+def atomic_write(path, mode='wt'):
+    """
+    Writes a file atomically.
+
+    File is written in a temporary file in the same directory, that replaces
+    the file once written. Concurrent readers see the previous or the new
+    file, never a partially written file.
+
+    Args:
+        path (str): Path of the file to write.
+        mode (str): Writing mode ('wt' or 'wb').
+
+    Returns:
+        file-like object: Temporary file opened in "mode".
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = mkstemp(prefix='.%s.' % name, dir=directory or '.')
+    try:
+        with os.fdopen(fd, mode) as file:
+            yield file
+        replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Locks a file between processes.
+
+    The lock is taken on a "<path>.lock" file. If this file can't be
+    created or if platform does not support it, nothing is locked.
+
+    Args:
+        path (str): Path of the file to lock.
+    """
+    try:
+        makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        lock_file = open(path + '.lock', 'a')
+    except (IOError, OSError):
+        yield
+        return
+
+    try:
+        if flock is not None:
+            flock(lock_file.fileno(), LOCK_EX)
+        yield
+    finally:
+        if flock is not None:
+            flock(lock_file.fileno(), LOCK_UN)
+        lock_file.close()
+
+
 def memoizedmethod(method):
     """
     Decorator that caches method result. This function is thread safe.
@@ -486,6 +558,49 @@ def memoizedmethod(method):
     return patched
 
 
+def shared_client(factory, *args, **kwargs):
+    """
+    Returns a client shared by all objects of current process. Client is
+    created on first call with same factory and arguments.
+
+    Only thread safe clients should be shared.
+
+    Args:
+        factory (callable): Function or class that returns the client.
+        args: Factory positional arguments. Including credentials and region.
+        kwargs: Factory keyword arguments. Including credentials and region.
+
+    Returns:
+        object: Client.
+    """
+    key = (factory, json.dumps([args, kwargs], sort_keys=True, default=repr))
+    with _SHARED_CLIENTS_LOCK:
+        try:
+            return _SHARED_CLIENTS[key]
+        except KeyError:
+            client = _SHARED_CLIENTS[key] = factory(*args, **kwargs)
+            return client
+
+
+def new_client(factory, *args, **kwargs):
+    """
+    Returns a new client that is not shared.
+
+    Client creation is serialized with shared clients creation. Allows to
+    create not thread safe clients from shared clients.
+
+    Args:
+        factory (callable): Function or class that returns the client.
+        args: Factory positional arguments.
+        kwargs: Factory keyword arguments.
+
+    Returns:
+        object: Client.
+    """
+    with _SHARED_CLIENTS_LOCK:
+        return factory(*args, **kwargs)
+
+
 def gen_msg(message_id, *args):
     """
     Provides pre-generated text messages.
@@ -1,13 +1,16 @@
 # coding=utf-8
 """Accelerator Client"""
 from abc import abstractmethod as _abstractmethod
+from collections import OrderedDict as _OrderedDict
 from contextlib import contextmanager as _contextmanager
 from copy import deepcopy as _deepcopy
 import json as _json
-from os import remove as _remove
+from os import remove as _remove, stat as _stat
 import os.path as _os_path
 from shutil import rmtree as _rmtree
 from tempfile import mkdtemp as _mkdtemp
+from threading import Lock as _Lock
+from time import time as _time
 from uuid import uuid4 as _uuid
 
 import apyfal._utilities as _utl
@@ -15,6 +18,28 @@ import apyfal.exceptions as _exc
 import apyfal.configuration as _cfg
 import apyfal.storage as _srg
 from apyfal._utilities import get_logger as _get_logger
+from apyfal.client._result_cache import ResultCache as _ResultCache
+from apyfal.client._tmp_space import TmpSpace as _TmpSpace
+from apyfal.client._write_behind import (
+    WriteBehind as _WriteBehind, wait_upload as _wait_upload)
+
+
+def _is_json(value):
+    """
+    Checks if a value is kept unchanged by a JSON serialization round trip.
+
+    Args:
+        value: Value.
+
+    Returns:
+        bool: True if JSON value.
+    """
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json(item)
+                   for key, item in value.items())
+    elif isinstance(value, list):
+        return all(_is_json(item) for item in value)
+    return value is None or isinstance(value, (str, int, float))
 
 
 class AcceleratorClient(_utl.ABC):
@@ -57,6 +82,13 @@ class AcceleratorClient(_utl.ABC):
     #: Default directories that can be processed remotely on host
     DEFAULT_AUTHORIZED_HOST_DIRS = ['~/shared']
 
+    # Maximum number of cached process parameters templates
+    _PARAMETERS_TEMPLATES_SIZE = 32
+
+    # Minimum interval in seconds between checks of a storage parameters
+    # JSON file ETag
+    _PARAMETERS_ETAG_TTL = 10.0
+
     def __new__(cls, *args, **kwargs):
         # If call from a subclass, instantiate this subclass directly
         if cls is not AcceleratorClient:
@@ -82,6 +114,7 @@ class AcceleratorClient(_utl.ABC):
 
         # Dict to cache values
         self._cache = {}
+        self._parameters_templates_lock = _Lock()
 
         # Read configuration
         self._config = config = _cfg.create_configuration(config)
@@ -108,6 +141,27 @@ class AcceleratorClient(_utl.ABC):
         self._process_parameters = self._load_configuration(
             self.DEFAULT_PROCESS_PARAMETERS, 'process')
 
+        # Process results cache (Disabled by default)
+        section = config['cache']
+        self._result_cache = _ResultCache(
+            section['result_cache'],
+            section.get_literal('result_cache_size')) if (
+            section['result_cache']) else None
+
+        # Temporary space
+        section = config['tmp']
+        self._tmp_space = _TmpSpace(
+            _cfg.ACCELERATOR_TMP_ROOT, section.get_literal('ram_max_size'),
+            section['disk_dir'], section.get_literal('disk_max_size'),
+            section.get_literal('cache_max_size'))
+
+        # Background output files uploads (Disabled by default)
+        self._write_behind = _WriteBehind(
+            section.get_literal('write_behind_workers'),
+            section.get_literal('write_behind_retries'),
+            section.get_literal('write_behind_max_pending')) if (
+            section.get_literal('write_behind')) else None
+
     def __enter__(self):
         return self
 
@@ -127,6 +181,19 @@ class AcceleratorClient(_utl.ABC):
 
     __repr__ = __str__
 
+    @property
+    def write_behind(self):
+        """
+        Background output files uploads.
+
+        Enabled with "write_behind" in "tmp" configuration section.
+
+        Returns:
+            apyfal.client._write_behind.WriteBehind or None: Background
+                uploads manager, None if disabled.
+        """
+        return self._write_behind
+
     @property
     def name(self):
         """
@@ -214,6 +281,10 @@ class AcceleratorClient(_utl.ABC):
             src (path-like object or file-like object):
                 Source data to process.
                 Path-like object can be path, URL or cloud object URL.
+                URL can end with a "#bytes=start-end" byte range to process
+                only a part of source (See "apyfal.storage.split_range"),
+                or byte range can be passed as "src_range=(start, end)"
+                parameter.
             dst (path-like object or file-like object):
                 Processed data destination.
                 Path-like object can be path, URL or cloud object URL.
@@ -233,15 +304,27 @@ class AcceleratorClient(_utl.ABC):
             Result from process operation, depending used accelerator.
         """
         # Configures processing
-        parameters = self._get_parameters(parameters, self._process_parameters)
-
-        # Handle files
+        parameters = self._get_process_parameters(parameters)
+        src = self._get_src_range(
+            self._get_url(src, parameters, ('src', 'file_in')), parameters)
+        dst = self._get_url(dst, parameters, ('dst', 'file_out'))
+
+        # Gets result from cache
+        cache_key = self._get_result_cache_key(src, dst, parameters)
+        if cache_key is not None:
+            cached, result = self._result_cache.get(cache_key, dst)
+            if cached:
+                return result
+
+        # Handle files, output size is estimated with input size
         with self._data_file(
-                src, parameters, ('src', 'file_in'), mode='rb') as src:
+                src, parameters, ('src', 'file_in'), mode='rb') as src_file:
             with self._data_file(
-                    dst, parameters, ('dst', 'file_out'), mode='wb') as dst:
+                    dst, parameters, ('dst', 'file_out'), mode='wb',
+                    size_hint=None if src_file is None else
+                    self._get_stat(src_file)[0]) as dst_file:
                 # Processes
-                response = self._process(src, dst, parameters)
+                response = self._process(src_file, dst_file, parameters)
 
         # Check response status
         self._raise_for_status(response, "Processing failed: ")
@@ -253,6 +336,11 @@ class AcceleratorClient(_utl.ABC):
         if info_dict is not None and response:
             _utl.recursive_update(info_dict, response)
 
+        # Saves result in cache
+        if cache_key is not None:
+            _wait_upload(dst)
+            self._result_cache.put(cache_key, result, dst)
+
         # Returns result
         return result
 
@@ -283,17 +371,23 @@ class AcceleratorClient(_utl.ABC):
         """
         self._stopped = True
 
+        # Waits background uploads
+        if self._write_behind is not None:
+            self._write_behind.shutdown()
+
         # Stops
         if full_stop:
             response = self._stop()
             if info_dict is not None and response:
                 _utl.recursive_update(info_dict, response)
 
-        # Clears temporary directory
-        try:
-            _rmtree(self._cache['tmp_dir'])
-        except (OSError, KeyError):
-            pass
+        # Clears temporary directories
+        for tmp_dir in [self._cache.get('tmp_dir')] + list(
+                self._cache.get('tmp_dirs', dict()).values()):
+            try:
+                _rmtree(tmp_dir)
+            except (OSError, TypeError):
+                continue
 
         # Clears cache
         self._cache.clear()
@@ -307,6 +401,13 @@ class AcceleratorClient(_utl.ABC):
             dict or None: response.
         """
 
+    def _preconnect(self):
+        """
+        Opens connection to accelerator in background before first request.
+
+        Does nothing by default, override if client supports it.
+        """
+
     @staticmethod
     def _raise_for_status(api_result, message=""):
         """
@@ -380,6 +481,97 @@ class AcceleratorClient(_utl.ABC):
 
         return result
 
+    def _get_process_parameters(self, parameters):
+        """
+        Gets process parameters.
+
+        Parameters are merged with "_get_parameters" only once for each
+        distinct "parameters" value and result is cached serialized as JSON.
+        Next calls with same parameters only get a new copy of this result
+        deserialized from JSON.
+
+        Parameters or results that a JSON serialization would not keep
+        unchanged (Tuples, non str keys, ...) are not cached.
+
+        Args:
+            parameters (dict): parameters
+
+        Returns:
+            dict : parameters.
+        """
+        try:
+            key = self._parameters_template_key(parameters)
+        except (TypeError, ValueError, IOError, OSError):
+            return self._get_parameters(parameters, self._process_parameters)
+
+        with self._parameters_templates_lock:
+            templates = self._cache.setdefault(
+                'parameters_templates', _OrderedDict())
+            template = templates.get(key)
+
+        if template is None:
+            result = self._get_parameters(
+                parameters, self._process_parameters)
+            if not _is_json(result):
+                return result
+            template = _json.dumps(result)
+
+            with self._parameters_templates_lock:
+                # Limits cache size
+                if (key not in templates and
+                        len(templates) >= self._PARAMETERS_TEMPLATES_SIZE):
+                    templates.popitem(last=False)
+                templates[key] = template
+
+        return _json.loads(template)
+
+    def _parameters_template_key(self, parameters):
+        """
+        Gets cache key of parameters for "_get_process_parameters".
+
+        Storage parameters JSON file ETag is checked at most every
+        "_PARAMETERS_ETAG_TTL" seconds.
+
+        Args:
+            parameters (dict): parameters
+
+        Returns:
+            str: key
+
+        Raises:
+            TypeError: Parameters are not JSON serializable without changes.
+            ValueError: Parameters JSON file changes can't be detected.
+            OSError: Parameters JSON file not found.
+        """
+        if not _is_json(parameters):
+            raise TypeError('Parameters changed by JSON serialization')
+        key = _json.dumps(parameters, sort_keys=True)
+
+        # JSON file: Takes file changes in account
+        json_parameters = parameters.get('parameters')
+        if (json_parameters and not isinstance(json_parameters, dict) and
+                not json_parameters.rstrip().startswith('{')):
+            scheme, path = _srg.parse_url(json_parameters)
+
+            # Local file: Uses size and modification time
+            if scheme == 'file':
+                file_stat = _stat(path)
+                key += '%s:%s' % (file_stat.st_size, file_stat.st_mtime)
+
+            # Storage object: Uses ETag
+            else:
+                etags = self._cache.setdefault('parameters_etags', dict())
+                checked, etag = etags.get(json_parameters, (0, None))
+                if _time() - checked >= self._PARAMETERS_ETAG_TTL:
+                    etag = getattr(
+                        _srg.stat(json_parameters), 'st_etag', None)
+                    etags[json_parameters] = (_time(), etag)
+                if etag is None:
+                    raise ValueError('No ETag for "%s"' % json_parameters)
+                key += etag
+
+        return key
+
     def _load_configuration(self, default_parameters, section):
         """Load parameters from configuration.
 
@@ -397,8 +589,89 @@ class AcceleratorClient(_utl.ABC):
                  for key in self._config[section]}, parameters, copy=False)
         return parameters
 
+    def _get_result_cache_key(self, src, dst, parameters):
+        """
+        Gets process results cache key.
+
+        Args:
+            src (path-like object or file-like object): Input data.
+            dst (path-like object or file-like object): Output data.
+            parameters (dict): Parameters dict.
+
+        Returns:
+            str or None: Key. None if cache disabled or if result can't be
+                cached.
+        """
+        if self._result_cache is None:
+            return None
+
+        # Output data needs to be readable from client to be cached
+        if dst is not None and _srg.parse_url(
+                dst, not self.REMOTE)[0] in ('stream', 'host'):
+            return None
+
+        return self._result_cache.get_key(
+            self._name, parameters, src, host=not self.REMOTE)
+
+    @staticmethod
+    def _get_url(url, parameters, parameter_name):
+        """
+        Gets URL from argument or from parameters.
+
+        Args:
+            url (str or file-like object): Input URL.
+            parameters (dict): Parameters dict. URL is removed from parameters
+                if found.
+            parameter_name (str or tuple of str): Parameter name for input URL.
+
+        Returns:
+            str or file-like object or None: URL.
+        """
+        if url is not None:
+            return url
+
+        # Apyfal 1.1.0 Compatibility
+        if isinstance(parameter_name, tuple):
+            parameter_name, ap110_name = parameter_name
+        else:
+            ap110_name = parameter_name
+
+        # Get URL from parameters if not provided directly
+        specific = parameters['app']['specific']
+        try:
+            return specific.pop(parameter_name)
+        except KeyError:
+            return specific.pop(ap110_name, None)
+
+    @staticmethod
+    def _get_src_range(src, parameters):
+        """
+        Adds "src_range" parameter to source URL as a byte range.
+
+        Args:
+            src (path-like object or file-like object): Input URL.
+            parameters (dict): Parameters dict. "src_range" is removed from
+                parameters if found.
+
+        Returns:
+            path-like object or file-like object: URL.
+        """
+        src_range = parameters['app']['specific'].pop('src_range', None)
+        if src_range is None:
+            return src
+
+        if src is None or hasattr(src, 'read'):
+            raise _exc.ClientConfigurationException(
+                '"src_range" requires a "src" URL.')
+
+        start, end = src_range
+        return '%s#bytes=%s-%s' % (
+            _srg.split_range(src)[0], '' if start is None else int(start),
+            '' if end is None else int(end))
+
     @_contextmanager
-    def _data_file(self, url, parameters, parameter_name, mode):
+    def _data_file(self, url, parameters, parameter_name, mode,
+                   size_hint=None):
         """Get files with apyfal.storage.
 
         Args:
@@ -406,35 +679,31 @@ class AcceleratorClient(_utl.ABC):
             parameters (dict): Parameters dict.
             parameter_name (str or tuple of str): Parameter name for input URL.
             mode (str): Access mode. 'r' or 'w'.
+            size_hint (int): Estimated file size in bytes in 'w' mode.
 
         Returns:
             str or file-like object or None:
                 Local version of input path.
         """
+        url = self._get_url(url, parameters, parameter_name)
+
         # Apyfal 1.1.0 Compatibility
         if isinstance(parameter_name, tuple):
             parameter_name, ap110_name = parameter_name
         else:
             ap110_name = parameter_name
 
-        # No URL
+        # No URL, yields directly
         if url is None:
-            # Get URL from parameters if not provided directly
-            try:
-                url = parameters['app']['specific'].pop(parameter_name)
-
-            # Still no URL, yields directly
-            except KeyError:
-
-                # Apyfal 1.1.0 Compatibility
-                url = parameters['app']['specific'].pop(ap110_name, None)
-                if url is None:
-
-                    yield None
-                    return
+            yield None
+            return
 
         # Gets scheme and path from URL
-        scheme, path = _srg.parse_url(url, not self.REMOTE)
+        url_without_range, byte_range = _srg.split_range(url)
+        scheme, path = _srg.parse_url(url_without_range, not self.REMOTE)
+        if byte_range is not None and 'w' in mode:
+            raise _exc.ClientConfigurationException(
+                'Byte range is only supported on input: %s' % url)
 
         # File scheme: Check paths
         if scheme == 'file':
@@ -475,47 +744,169 @@ class AcceleratorClient(_utl.ABC):
                     parameter_name, 'stream') == 'file':
 
                 # Already a file
-                if scheme == 'file':
+                if scheme == 'file' and byte_range is None:
                     yield path
 
                 # Use temporary file
                 else:
-                    with self.as_tmp_file(url, mode) as file:
+                    with self.as_tmp_file(url, mode, size_hint) as file:
                         yield file
             # As stream
             else:
                 with _srg.open(url, mode) as stream:
                     yield stream
 
+    def _prefetch(self, src):
+        """
+        Returns context manager that fetches a process input in temporary
+        space, if this input will have to be fetched by client on process.
+
+        While context manager is entered, the input is shared with the process
+        operation using it (See "as_tmp_file").
+
+        Args:
+            src (path-like object or file-like object): Process input.
+
+        Returns:
+            context manager or None: None if input don't have to be fetched.
+        """
+        if (self.REMOTE or src is None or hasattr(src, 'read') or
+                self._PARAMETER_IO_FORMAT.get('src', 'stream') != 'file' or
+                _srg.split_range(src)[1] is None and
+                _srg.parse_url(src)[0] == 'file'):
+            return None
+        return self.as_tmp_file(src, 'rb')
+
     @_contextmanager
-    def as_tmp_file(self, url, mode):
+    def as_tmp_file(self, url, mode, size_hint=None):
         """
         Return temporary representation of a file.
 
+        The temporary file is placed in RAM or on disk depending on its size
+        and available space (See "tmp" configuration section).
+
+        In "rb" mode, the file is read-only and shared between users of
+        current process with same URL and ETag: It is fetched only once and
+        kept after use while space is available (See "cache_max_size" in
+        "tmp" configuration section).
+
+        In "w" mode, the file size is unknown until written: "size_hint" is
+        used to place it. If "write_behind" is enabled, the file is uploaded
+        in background (See "write_behind" property). Its temporary space is
+        released once uploaded.
+
         Args:
             url (str): apyfal.storage URL of the file.
             mode (str): Access mode. 'r' or 'w'.
+            size_hint (int): Estimated file size in bytes in "w" mode. For
+                instance, the size of the processed input.
 
         Returns:
             str or file-like object: temporary object.
         """
-        # Generates randomized temporary filename
-        local_path = _os_path.join(
-            self._tmp_dir, str(_uuid()))
+        # Input file from storage: Shares it with concurrent users
+        if mode == 'rb' and not hasattr(url, 'read'):
+            size, etag = self._get_stat(url)
+            with self._tmp_space.shared_file(
+                    (_utl.fsdecode(url), etag), size,
+                    lambda path: _srg.copy(url, path),
+                    cache=etag is not None) as local_path:
+                yield local_path
+            return
 
-        # Gets input file
-        if 'r' in mode:
-            _srg.copy(url, local_path)
+        size = self._get_stat(url)[0] if 'r' in mode else None
+        reservation = self._tmp_space.acquire(size, size_hint)
+        release = reservation.release
+        try:
+            # Generates randomized temporary filename
+            local_path = _os_path.join(
+                self._get_tmp_dir(reservation.directory), str(_uuid()))
+
+            # Gets input file
+            if 'r' in mode:
+                _srg.copy(url, local_path)
+
+            # Yields local temporary path
+            yield local_path
+
+            # Accounts output file real size
+            if 'w' in mode:
+                try:
+                    reservation.settle(_os_path.getsize(local_path))
+                except OSError:
+                    pass
+
+            # Sends output file in background, that releases space once done
+            if ('w' in mode and not hasattr(url, 'write') and
+                    self._write_behind is not None):
+                self._write_behind.submit(local_path, url, release)
+                release = None
+                return
+
+            # Sends output file
+            if 'w' in mode:
+                _srg.copy(local_path, url)
+
+            # Clears temporary file
+            _remove(local_path)
+
+        finally:
+            if release is not None:
+                release()
 
-        # Yields local temporary path
-        yield local_path
+    @staticmethod
+    def _get_stat(url):
+        """
+        Returns size and ETag of a file.
+
+        Args:
+            url (path-like object or file-like object): apyfal.storage URL
+                or file object.
 
-        # Sends output file
-        if 'w' in mode:
-            _srg.copy(local_path, url)
+        Returns:
+            tuple: Size in bytes or None if unknown, ETag or None if unknown.
+        """
+        try:
+            # File object: Size from current position
+            if hasattr(url, 'read'):
+                position = url.tell()
+                url.seek(0, 2)
+                size = url.tell() - position
+                url.seek(position)
+                return size, None
+
+            stat = _srg.stat(url)
+            size = stat.st_size
+
+            # Byte range: Size of range
+            byte_range = _srg.split_range(url)[1]
+            if byte_range is not None:
+                start, end = byte_range
+                size = max(min(size, size if end is None else end) - start, 0)
+
+            return size, getattr(stat, 'st_etag', None)
+        except (AttributeError, IOError, OSError, ValueError):
+            return None, None
+
+    def _get_tmp_dir(self, tmp_root):
+        """
+        Client temporary directory in a temporary root directory.
 
-        # Clears temporary file
-        _remove(local_path)
+        Args:
+            tmp_root (str): Temporary root directory.
+
+        Returns:
+            str: Temporary directory path.
+        """
+        if tmp_root == _cfg.ACCELERATOR_TMP_ROOT:
+            return self._tmp_dir
+
+        tmp_dirs = self._cache.setdefault('tmp_dirs', dict())
+        try:
+            return tmp_dirs[tmp_root]
+        except KeyError:
+            tmp_dirs[tmp_root] = _mkdtemp(dir=tmp_root)
+            return tmp_dirs[tmp_root]
 
     @property
     def _tmp_dir(self):
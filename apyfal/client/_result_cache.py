@@ -0,0 +1,337 @@
+# coding=utf-8
+"""Accelerator process results cache"""
+from contextlib import contextmanager as _contextmanager
+from hashlib import sha256 as _sha256
+import json as _json
+import os.path as _os_path
+from shutil import copyfileobj as _copyfileobj
+from threading import Lock as _Lock
+from time import time as _time
+
+import apyfal.storage as _srg
+import apyfal._utilities as _utl
+from apyfal._utilities import get_logger as _get_logger
+from apyfal.storage._checksum import local_md5 as _local_md5
+
+
+class ResultCache(object):
+    """
+    Content addressed cache of accelerator process results.
+
+    Entries are keyed by accelerator name, process parameters and input
+    content. Input content is identified by its MD5 checksum for local
+    files (Cached while file is not modified) and by its ETag for cloud
+    storage objects.
+
+    Least recently used entries are evicted when the cache size exceeds its
+    maximum size. Entries access times are written to the index at most
+    every "_ACCESS_WRITE_INTERVAL" seconds.
+
+    Args:
+        url (path-like object): Cache directory. Can be a local path or an
+            apyfal.storage URL.
+        max_size (int): Maximum cache size in MB.
+    """
+
+    #: Default maximum cache size in MB
+    DEFAULT_MAX_SIZE = 1024
+
+    # Index file name
+    _INDEX = 'index.json'
+
+    # Minimum interval in seconds between index writes on cache hits
+    _ACCESS_WRITE_INTERVAL = 60.0
+
+    def __init__(self, url, max_size=None):
+        self._url = _utl.fsdecode(url).rstrip('/')
+        self._max_size = int((max_size or self.DEFAULT_MAX_SIZE) * 2 ** 20)
+        self._index = None
+        self._accessed = dict()
+        self._access_written = _time()
+        self._lock = _Lock()
+
+        # Ensures local directory exists
+        scheme, path = _srg.parse_url(self._url)
+        if scheme == 'file':
+            _utl.makedirs(path, exist_ok=True)
+            self._index_path = _os_path.join(path, self._INDEX)
+        else:
+            self._index_path = None
+
+    def __str__(self):
+        return "<%s.%s url='%s'>" % (
+            self.__class__.__module__, self.__class__.__name__, self._url)
+
+    __repr__ = __str__
+
+    def get_key(self, accelerator, parameters, src, host=True):
+        """
+        Gets cache key of a process operation.
+
+        Args:
+            accelerator (str): Accelerator name.
+            parameters (dict): Process parameters.
+            src (path-like object or file-like object): Process input.
+            host (bool): If True, "host" scheme is considered as local file.
+
+        Returns:
+            str or None: Key, None if operation can't be cached.
+        """
+        input_digest = self._input_digest(src, host)
+        if input_digest is None:
+            return None
+
+        try:
+            return _sha256(_json.dumps(
+                [accelerator, parameters, input_digest],
+                sort_keys=True).encode()).hexdigest()
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key, dst=None):
+        """
+        Gets result from cache and write output data to destination.
+
+        Args:
+            key (str): Cache key.
+            dst (path-like object or file-like object):
+                Processed data destination.
+
+        Returns:
+            tuple: (True if found in cache, Result from process operation)
+        """
+        with self._lock:
+            entries = self._get_index()
+            if key not in entries or (
+                    dst is not None and not entries[key][1]):
+                return False, None
+
+        try:
+            with _srg.open(self._entry_url(key, 'json'), 'rt') as file:
+                result = _json.load(file)
+            if dst is not None:
+                self._copy(self._entry_url(key), dst)
+
+        # Entry removed by another process
+        except (IOError, OSError, ValueError):
+            with self._lock:
+                self._get_index().pop(key, None)
+                self._accessed.pop(key, None)
+            return False, None
+
+        # Persists access times for other processes, by batch
+        with self._lock:
+            self._accessed[key] = _time()
+            if (_time() - self._access_written >=
+                    self._ACCESS_WRITE_INTERVAL):
+                self._update_index()
+
+        _get_logger().debug("Process result '%s' found in cache", key)
+        return True, result
+
+    def put(self, key, result, dst=None):
+        """
+        Puts a result in cache.
+
+        Args:
+            key (str): Cache key.
+            result: Result from process operation.
+            dst (path-like object): Processed data destination.
+        """
+        try:
+            size = 0
+            if dst is not None:
+                self._copy(dst, self._entry_url(key))
+                with _srg.open(self._entry_url(key), 'rb') as file:
+                    file.seek(0, 2)
+                    size = file.tell()
+
+            with _srg.open(self._entry_url(key, 'json'), 'wt') as file:
+                _json.dump(result, file)
+
+        # Caching is optional and should not fail operation
+        except (IOError, OSError, TypeError, ValueError) as exception:
+            _get_logger().debug(
+                "Unable to cache process result '%s': %s", key, exception)
+            return
+
+        with self._lock:
+            self._update_index(key, [size, dst is not None, _time()])
+
+    def _input_digest(self, src, host):
+        """
+        Gets an identifier of input content.
+
+        Args:
+            src (path-like object or file-like object): Process input.
+            host (bool): If True, "host" scheme is considered as local file.
+
+        Returns:
+            str or None: Identifier. None if content can't be identified.
+        """
+        # Requires an input: Result of processing without input may not
+        # be reproducible (For instance, random number generator)
+        if src is None:
+            return None
+
+        # Byte range: Identifies whole file, then range
+        url, byte_range = _srg.split_range(src)
+        if byte_range is not None:
+            digest = self._input_digest(url, host)
+            return None if digest is None else '%s#%s-%s' % (
+                digest, byte_range[0], byte_range[1])
+
+        scheme, path = _srg.parse_url(src, host)
+
+        # Streams and remote host files can't be identified
+        if scheme in ('stream', 'host'):
+            return None
+
+        # Local file: Uses content checksum
+        if scheme == 'file':
+            try:
+                return 'md5:%s' % _local_md5(path)
+            except (IOError, OSError):
+                return None
+
+        # Cloud storage: Uses ETag
+        try:
+            etag = getattr(_srg.stat(src), 'st_etag', None)
+        except (IOError, OSError, AttributeError):
+            return None
+        return 'etag:%s:%s' % (scheme, etag) if etag else None
+
+    def _entry_url(self, key, extension=None):
+        """
+        Gets URL of an entry file.
+
+        Args:
+            key (str): Cache key.
+            extension (str): File extension.
+
+        Returns:
+            str: URL.
+        """
+        return '%s/%s%s' % (
+            self._url, key, '.%s' % extension if extension else '')
+
+    @staticmethod
+    def _copy(src, dst):
+        """
+        Copies file.
+
+        Args:
+            src (path-like object): Source.
+            dst (path-like object or file-like object): Destination.
+        """
+        if hasattr(dst, 'write'):
+            with _srg.open(src, 'rb') as file:
+                _copyfileobj(file, dst)
+            return
+
+        scheme, path = _srg.parse_url(dst)
+        if scheme == 'file':
+            _utl.makedirs(_os_path.dirname(_os_path.abspath(path)),
+                          exist_ok=True)
+        _srg.copy(src, dst)
+
+    def _get_index(self):
+        """
+        Gets index. Needs to be called with lock.
+
+        Returns:
+            dict: Index entries as key: [size, has data, last access time].
+        """
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _update_index(self, key=None, entry=None):
+        """
+        Updates index on cache storage with pending access times and an
+        optional new entry, then evicts entries. Needs to be called with lock.
+
+        Index is read again from cache storage, so entries added or evicted by
+        other processes are taken in account.
+
+        Args:
+            key (str): New entry key.
+            entry (list): New entry.
+        """
+        with self._index_lock():
+            entries = self._read_index()
+            for accessed_key, access_time in self._accessed.items():
+                if (accessed_key in entries and
+                        entries[accessed_key][2] < access_time):
+                    entries[accessed_key][2] = access_time
+            if key is not None:
+                entries[key] = entry
+
+            self._evict(entries)
+            self._write_index(entries)
+
+        self._index = entries
+        self._accessed.clear()
+        self._access_written = _time()
+
+    @_contextmanager
+    def _index_lock(self):
+        """
+        Locks index between processes while updating it.
+
+        Only local index is locked. Storage objects are written atomically,
+        but concurrent updates of a storage index may lose an entry.
+        """
+        if self._index_path is None:
+            yield
+        else:
+            with _utl.file_lock(self._index_path):
+                yield
+
+    def _read_index(self):
+        """
+        Reads index from cache storage.
+
+        Returns:
+            dict: Index entries.
+        """
+        try:
+            with _srg.open(self._entry_url(self._INDEX), 'rt') as file:
+                return _json.load(file)
+        except (IOError, OSError, ValueError):
+            return dict()
+
+    def _write_index(self, entries):
+        """
+        Writes index on cache storage. Local index is replaced atomically.
+
+        Args:
+            entries (dict): Index entries.
+        """
+        try:
+            with (_srg.open(self._entry_url(self._INDEX), 'wt') if
+                  self._index_path is None else
+                  _utl.atomic_write(self._index_path)) as file:
+                _json.dump(entries, file)
+        except (IOError, OSError) as exception:
+            _get_logger().debug("Unable to write cache index: %s", exception)
+
+    def _evict(self, entries):
+        """
+        Evicts least recently used entries until cache size fit in
+        maximum size.
+
+        Args:
+            entries (dict): Index entries.
+        """
+        size = sum(entry[0] for entry in entries.values())
+        for key in sorted(
+                entries, key=lambda entry_key: entries[entry_key][2]):
+            if size <= self._max_size:
+                break
+            size -= entries.pop(key)[0]
+            for url in (self._entry_url(key), self._entry_url(key, 'json')):
+                try:
+                    _srg.remove(url)
+                except (IOError, OSError):
+                    continue
@@ -0,0 +1,343 @@
+# coding=utf-8
+"""Accelerator client temporary space"""
+from collections import OrderedDict as _OrderedDict
+from contextlib import contextmanager as _contextmanager
+import os as _os
+import os.path as _os_path
+from tempfile import gettempdir as _gettempdir
+from threading import Condition as _Condition, Event as _Event, Lock as _Lock
+from uuid import uuid4 as _uuid
+
+import apyfal._utilities as _utl
+from apyfal._utilities import get_logger as _get_logger
+
+# Bytes reserved in each temporary directory by all clients of current process
+_RESERVED = {}
+_CONDITION = _Condition()
+
+# Temporary files shared between all clients of current process
+_SHARED = {}
+_SHARED_LOCK = _Lock()
+
+# Shared files no longer used, kept for next users in least recently used
+# order until evicted
+_CACHED = _OrderedDict()
+
+# Default maximum size of shared files kept after use in MB
+_CACHE_MAX_SIZE = 1024
+
+
+class _Reservation(object):
+    """
+    Space reserved in a temporary directory.
+
+    Args:
+        directory (str): Directory.
+        size (int): Reserved size in bytes.
+    """
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+
+    def settle(self, size):
+        """
+        Updates reserved size with the real file size.
+
+        Args:
+            size (int): Size in bytes.
+        """
+        with _CONDITION:
+            _RESERVED[self.directory] = (
+                _RESERVED.get(self.directory, 0) + size - self.size)
+            self.size = size
+            _CONDITION.notify_all()
+
+    def release(self):
+        """
+        Releases reserved space.
+        """
+        self.settle(0)
+
+
+class _SharedFile(object):
+    """Temporary file shared between users"""
+
+    def __init__(self):
+        self.path = None
+        self.reservation = None
+        self.size = None
+        self.users = 0
+        self.exception = None
+        self.ready = _Event()
+
+
+class TmpSpace(object):
+    """
+    Temporary space manager.
+
+    Places temporary files in RAM (tmpfs) or on disk depending on file size
+    and available space. Reserved bytes are accounted for all clients of
+    current process. If no directory has enough space, callers wait until
+    space is released.
+
+    Files of unknown size are placed on disk if a disk directory is
+    configured, else an estimated size is reserved in RAM. Their real size
+    is accounted once written.
+
+    Args:
+        ram_dir (str): RAM temporary directory.
+            If None, uses system default temporary directory.
+        ram_max_size (int): Maximum size to use in RAM directory in MB.
+            If None, limited only by free space.
+        disk_dir (str): Disk temporary directory, used when file does not fit
+            in RAM directory. If None, only RAM directory is used.
+        disk_max_size (int): Maximum size to use in disk directory in MB.
+            If None, limited only by free space.
+        cache_max_size (int): Maximum size of shared files kept after use in
+            MB. Default to 1024MB.
+    """
+
+    def __init__(self, ram_dir=None, ram_max_size=None, disk_dir=None,
+                 disk_max_size=None, cache_max_size=None):
+        self._cache_max_size = self._to_bytes(
+            _CACHE_MAX_SIZE if cache_max_size is None else cache_max_size)
+        self._dirs = [(ram_dir, self._to_bytes(ram_max_size))]
+        if disk_dir:
+            disk_dir = _os_path.abspath(_os_path.expanduser(disk_dir))
+            _utl.makedirs(disk_dir, exist_ok=True)
+            self._dirs.append((disk_dir, self._to_bytes(disk_max_size)))
+
+    @_contextmanager
+    def reserve(self, size=None, estimate=None):
+        """
+        Reserves space for a temporary file.
+
+        Args:
+            size (int): File size in bytes. If None, size is unknown.
+            estimate (int): Estimated file size in bytes if size is unknown.
+
+        Returns:
+            str: Directory where to place temporary file.
+        """
+        reservation = self.acquire(size, estimate)
+        try:
+            yield reservation.directory
+        finally:
+            reservation.release()
+
+    def acquire(self, size=None, estimate=None):
+        """
+        Reserves space for a temporary file until reservation is released.
+
+        If size is unknown, file is placed in disk directory if any, else
+        "estimate" is reserved in RAM directory. The real size should be
+        accounted with "settle" once file is written.
+
+        Args:
+            size (int): File size in bytes. If None, size is unknown.
+            estimate (int): Estimated file size in bytes if size is unknown.
+
+        Returns:
+            apyfal.client._tmp_space._Reservation: Reservation with
+                directory where to place temporary file.
+        """
+        if size is None:
+            if len(self._dirs) > 1 or not estimate:
+                return _Reservation(self._dirs[-1][0], 0)
+            size = estimate
+        return _Reservation(self._acquire(size), size)
+
+    @_contextmanager
+    def shared_file(self, key, size, fetch, cache=True):
+        """
+        Returns a read-only temporary file shared between all users of
+        current process.
+
+        The file is fetched once by the first user. When its last user exits,
+        the file is kept for next users if "cache", else it is removed. Least
+        recently used kept files are removed when their total size exceeds
+        "cache_max_size" or when temporary space is required.
+
+        Args:
+            key (hashable object): File key. For instance URL and ETag.
+            size (int): File size in bytes. If None, size is unknown.
+            fetch (callable): Function that writes file content to the path
+                passed as argument.
+            cache (bool): If True, keeps file after use. Key must change if
+                file content change.
+
+        Returns:
+            str: File path.
+        """
+        with _SHARED_LOCK:
+            try:
+                shared = _SHARED[key]
+                first_user = False
+                _CACHED.pop(key, None)
+            except KeyError:
+                shared = _SHARED[key] = _SharedFile()
+                first_user = True
+            shared.users += 1
+
+        try:
+            # First user: fetches file
+            if first_user:
+                try:
+                    shared.reservation = self.acquire(size)
+                    shared.path = _os_path.join(
+                        shared.reservation.directory or _gettempdir(),
+                        'apyfal_%s' % _uuid())
+                    fetch(shared.path)
+
+                    # Accounts real size
+                    shared.size = _os_path.getsize(shared.path)
+                    shared.reservation.settle(shared.size)
+                except BaseException as exception:
+                    shared.exception = exception
+                    raise
+                finally:
+                    shared.ready.set()
+
+            # Other users: Waits until file is ready
+            else:
+                shared.ready.wait()
+                if shared.exception is not None:
+                    raise shared.exception
+
+            yield shared.path
+
+        finally:
+            evicted = []
+            with _SHARED_LOCK:
+                shared.users -= 1
+                if not shared.users:
+
+                    # Last user: Keeps file for next users
+                    if cache and shared.exception is None:
+                        _CACHED[key] = shared
+                        cached_size = sum(
+                            cached.size for cached in _CACHED.values())
+                        while cached_size > self._cache_max_size:
+                            evicted.append(self._pop_cached())
+                            cached_size -= evicted[-1].size
+
+                    # Or removes it
+                    else:
+                        del _SHARED[key]
+                        evicted.append(shared)
+
+            for removed in evicted:
+                self._remove_shared(removed)
+
+    @staticmethod
+    def _pop_cached():
+        """
+        Removes least recently used kept shared file from shared files.
+
+        "_SHARED_LOCK" must be held by caller.
+
+        Returns:
+            _SharedFile: Shared file.
+        """
+        key, shared = _CACHED.popitem(last=False)
+        del _SHARED[key]
+        return shared
+
+    def _remove_shared(self, shared):
+        """
+        Removes shared file and releases its space.
+
+        Args:
+            shared (_SharedFile): Shared file.
+        """
+        try:
+            _os.remove(shared.path)
+        except (OSError, TypeError):
+            pass
+        if shared.reservation is not None:
+            shared.reservation.release()
+
+    def _acquire(self, size):
+        """
+        Waits until space is available and reserves it.
+
+        Args:
+            size (int): File size in bytes.
+
+        Returns:
+            str: Directory where space is reserved.
+        """
+        waiting = False
+        with _CONDITION:
+            while True:
+                for directory, max_size in self._dirs:
+                    reserved = _RESERVED.get(directory, 0)
+
+                    # Reserved files may already be written and counted
+                    # in free space: This is conservative
+                    available = self._free_space(directory) - reserved
+                    if max_size is not None:
+                        available = min(available, max_size - reserved)
+
+                    if size <= available:
+                        _RESERVED[directory] = reserved + size
+                        return directory
+
+                # Removes kept shared files to free space
+                with _SHARED_LOCK:
+                    shared = self._pop_cached() if _CACHED else None
+                if shared is not None:
+                    self._remove_shared(shared)
+                    continue
+
+                # Waits only if space can be released by other files
+                if not any(_RESERVED.get(directory)
+                           for directory, _ in self._dirs):
+                    break
+
+                if not waiting:
+                    _get_logger().debug(
+                        "Waiting for %d bytes of temporary space", size)
+                    waiting = True
+                _CONDITION.wait()
+
+            # File does not fit anywhere: Uses last directory anyway
+            directory = self._dirs[-1][0]
+            _get_logger().warning(
+                "Not enough temporary space for %d bytes in '%s'",
+                size, directory or _gettempdir())
+            _RESERVED[directory] = _RESERVED.get(directory, 0) + size
+            return directory
+
+    @staticmethod
+    def _free_space(directory):
+        """
+        Returns free space in directory.
+
+        Args:
+            directory (str): Directory. If None, uses system default
+                temporary directory.
+
+        Returns:
+            float: Free space in bytes.
+        """
+        try:
+            stat = _os.statvfs(directory or _gettempdir())
+        except (AttributeError, OSError):
+            # Not available on this platform
+            return float('inf')
+        return stat.f_bavail * stat.f_frsize
+
+    @staticmethod
+    def _to_bytes(size):
+        """
+        Converts size in MB to bytes.
+
+        Args:
+            size (int): Size in MB.
+
+        Returns:
+            int or None: Size in bytes.
+        """
+        return None if size is None else int(size * 2 ** 20)
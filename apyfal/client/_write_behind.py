@@ -0,0 +1,218 @@
+# coding=utf-8
+"""Accelerator client background uploads"""
+from concurrent.futures import (
+    ThreadPoolExecutor as _ThreadPoolExecutor, wait as _wait)
+from os import remove as _remove
+import os.path as _os_path
+from shutil import move as _move
+from threading import Lock as _Lock, Semaphore as _Semaphore
+from time import sleep as _sleep
+from uuid import uuid4 as _uuid
+
+import apyfal.configuration as _cfg
+import apyfal.storage as _srg
+import apyfal._utilities as _utl
+from apyfal._utilities import get_logger as _get_logger
+
+# Uploads pending in all clients of current process, by destination URL
+_PENDING = {}
+_PENDING_LOCK = _Lock()
+
+
+def wait_upload(url):
+    """
+    Waits until pending background upload to an URL is completed.
+
+    Args:
+        url (path-like object or file-like object): Destination URL.
+    """
+    if url is None or hasattr(url, 'write'):
+        return
+    with _PENDING_LOCK:
+        future = _PENDING.get(_utl.fsdecode(url))
+    if future is not None:
+        _wait([future])
+
+
+class WriteBehind(object):
+    """
+    Uploads output files in background.
+
+    Files that failed to upload after all retries are moved to
+    "apyfal.configuration.FAILED_UPLOADS".
+
+    Args:
+        max_workers (int): Maximum number of parallel uploads.
+        retries (int): Number of retries on upload failure.
+        max_pending (int): Maximum number of files pending upload. When
+            reached, new uploads wait until a pending upload is completed.
+    """
+
+    #: Default maximum number of parallel uploads
+    DEFAULT_MAX_WORKERS = 4
+
+    #: Default number of retries
+    DEFAULT_RETRIES = 2
+
+    #: Default maximum number of files pending upload
+    DEFAULT_MAX_PENDING = 16
+
+    # Delay between retries in seconds
+    _RETRY_DELAY = 1.0
+
+    def __init__(self, max_workers=None, retries=None, max_pending=None):
+        self._retries = self.DEFAULT_RETRIES if retries is None else retries
+        self._workers = _ThreadPoolExecutor(
+            max_workers=max_workers or self.DEFAULT_MAX_WORKERS)
+        self._pending = _Semaphore(max_pending or self.DEFAULT_MAX_PENDING)
+        self._futures = set()
+        self._error_callbacks = []
+
+    def add_error_callback(self, callback):
+        """
+        Adds a function called when an upload fails after all retries.
+
+        Args:
+            callback (callable): Function called with destination URL,
+                exception and path of the kept local file as arguments.
+        """
+        self._error_callbacks.append(callback)
+
+    def submit(self, local_path, url, release=None):
+        """
+        Schedules upload of a local file. The local file is removed once
+        uploaded.
+
+        Waits if "max_pending" files are already pending upload.
+
+        Args:
+            local_path (str): Local file path.
+            url (path-like object): Destination URL.
+            release (callable): Function called once local file is removed
+                or moved. For instance, to release its temporary space.
+
+        Returns:
+            concurrent.futures.Future: Future object representing upload.
+        """
+        url = _utl.fsdecode(url)
+        self._pending.acquire()
+        try:
+            with _PENDING_LOCK:
+                # Waits previous upload to same URL
+                previous = _PENDING.get(url)
+                future = _PENDING[url] = self._workers.submit(
+                    self._upload, local_path, url, previous, release)
+        except BaseException:
+            self._pending.release()
+            raise
+
+        self._futures.add(future)
+        future.add_done_callback(lambda _: self._set_done(url, future))
+        return future
+
+    def flush(self):
+        """
+        Waits until all pending uploads are completed.
+        """
+        _wait(self._futures.copy())
+
+    def shutdown(self):
+        """
+        Waits until all pending uploads are completed, then frees resources.
+        No more uploads can be submitted.
+        """
+        self._workers.shutdown(wait=True)
+
+    def _set_done(self, url, future):
+        """
+        Removes upload from pending uploads.
+
+        Only for use as callback.
+
+        Args:
+            url (str): Destination URL.
+            future (concurrent.futures.Future): Upload future.
+        """
+        self._futures.discard(future)
+        with _PENDING_LOCK:
+            if _PENDING.get(url) is future:
+                del _PENDING[url]
+        self._pending.release()
+
+    def _upload(self, local_path, url, previous=None, release=None):
+        """
+        Uploads file with retries.
+
+        Args:
+            local_path (str): Local file path.
+            url (str): Destination URL.
+            previous (concurrent.futures.Future): Previous upload to same URL.
+            release (callable): Function called once local file is removed
+                or moved.
+        """
+        if previous is not None:
+            _wait([previous])
+
+        try:
+            for retry in range(self._retries + 1):
+                try:
+                    _srg.copy(local_path, url)
+                    break
+                except (IOError, OSError) as exception:
+                    if retry == self._retries:
+                        self._on_error(
+                            url, exception, self._keep(local_path, url))
+                        raise
+                    _get_logger().debug(
+                        "Retrying upload to '%s': %s", url, exception)
+                    _sleep(self._RETRY_DELAY * (retry + 1))
+
+            try:
+                _remove(local_path)
+            except OSError:
+                pass
+
+        finally:
+            if release is not None:
+                release()
+
+    @staticmethod
+    def _keep(local_path, url):
+        """
+        Moves a file that failed to upload out of temporary directories.
+
+        Args:
+            local_path (str): Local file path.
+            url (str): Destination URL.
+
+        Returns:
+            str: Path of the kept file. The local file path if it can't
+                be moved.
+        """
+        kept_path = _os_path.join(_cfg.FAILED_UPLOADS, '%s_%s' % (
+            _uuid(), url.rstrip('/').rsplit('/', 1)[-1]))
+        try:
+            _utl.makedirs(_cfg.FAILED_UPLOADS, exist_ok=True)
+            _move(local_path, kept_path)
+        except (IOError, OSError):
+            return local_path
+        return kept_path
+
+    def _on_error(self, url, exception, local_path):
+        """
+        Reports upload failure.
+
+        Args:
+            url (str): Destination URL.
+            exception (Exception): Upload exception.
+            local_path (str): Path of the kept local file.
+        """
+        _get_logger().error(
+            "Unable to upload '%s', output kept in '%s': %s",
+            url, local_path, exception)
+        for callback in self._error_callbacks:
+            try:
+                callback(url, exception, local_path)
+            except Exception as callback_exception:
+                _get_logger().error(
+                    "Upload error callback failed: %s", callback_exception)
@@ -5,9 +5,11 @@ This client allows remote accelerator control."""
 import json as _json
 import os.path as _os_path
 import shutil as _shutil
+from threading import Thread as _Thread
 from uuid import uuid4 as _uuid
 
-from requests.exceptions import HTTPError as _HTTPError
+from requests.exceptions import (
+    HTTPError as _HTTPError, RequestException as _RequestException)
 from requests_toolbelt.multipart.encoder import (
     MultipartEncoder as _MultipartEncoder)
 
@@ -55,6 +57,9 @@ class RESTClient(_Client):
     # Number of retries for a request
     _REQUEST_RETRIES = 3
 
+    # Timeout in seconds of the request opening connection before first use
+    _PRECONNECT_TIMEOUT = 5.0
+
     def __init__(self, accelerator=None, host_ip=None, ssl_cert_crt=None,
                  *args, **kwargs):
         # Initialize client
@@ -188,6 +193,27 @@ class RESTClient(_Client):
             raise _exc.ClientRuntimeException(
                 gen_msg=('unable_reach_url', self._url))
 
+    def _preconnect(self):
+        """
+        Opens connection to accelerator in background before first request.
+
+        The connection is kept alive by the session and reused by next
+        request.
+        """
+        session = self._session
+        url = self.url
+
+        def preconnect():
+            """Requests URL to open connection"""
+            try:
+                session.head(url, timeout=self._PRECONNECT_TIMEOUT)
+            except _RequestException:
+                return
+
+        thread = _Thread(target=preconnect)
+        thread.daemon = True
+        thread.start()
+
     def _start(self, src, parameters):
         """
         Client specific start implementation.
@@ -1,11 +1,14 @@
 # coding=utf-8
 """Accelerator system call client."""
+from collections import deque as _deque
 from contextlib import contextmanager as _contextmanager
 from distutils.version import LooseVersion as _LooseVersion
+from hashlib import sha256 as _sha256
 import json as _json
-from os import remove as _remove
-from os.path import join as _join, exists as _exists
-from subprocess import Popen as _Popen, PIPE as _PIPE
+from logging import DEBUG as _DEBUG
+from os import remove as _remove, stat as _stat
+from os.path import join as _join, exists as _exists, dirname as _dirname
+from subprocess import Popen as _Popen, PIPE as _PIPE, STDOUT as _STDOUT
 from threading import Lock as _Lock
 from uuid import uuid4 as _uuid
 
@@ -15,14 +18,24 @@ import apyfal.configuration as _cfg
 from apyfal._utilities import get_logger as _get_logger
 import apyfal._utilities as _utl
 
+#: Number of command output lines kept for exception messages
+_OUTPUT_TAIL_LINES = 100
 
-def _call(command, check_file=None, **exc_args):
+#: Maximum length of a command output line
+_OUTPUT_LINE_MAX = 4096
+
+
+def _call(command, check_file=None, log_level=_DEBUG, **exc_args):
     """
     Call command in subprocess.
 
+    Command output is streamed to logger line by line and only its last
+    lines are kept in memory to be used in exception message.
+
     Args:
         command (list or tuple of str): Command to call.
         check_file (str): Returns file content in exception if exists.
+        log_level (int): Logging level used to forward command output.
         exc_args: Extra arguments for exception to raise
             if error.
 
@@ -30,16 +43,27 @@ def _call(command, check_file=None, **exc_args):
         apyfal.exceptions.ClientRuntimeException:
             Error while calling command.
     """
-    _get_logger().debug("Running shell command: '%s'" % ' '.join(command))
+    logger = _get_logger()
+    logger.debug("Running shell command: '%s'" % ' '.join(command))
+    outputs = _deque(maxlen=_OUTPUT_TAIL_LINES)
     try:
-        process = _Popen(
-            command, stdout=_PIPE, stderr=_PIPE, universal_newlines=True)
-        outputs = list(process.communicate())
-        in_error = process.returncode
+        process = _Popen(command, stdout=_PIPE, stderr=_STDOUT)
+
+        # Streams output
+        forward = logger.isEnabledFor(log_level)
+        for line in iter(lambda: process.stdout.readline(_OUTPUT_LINE_MAX),
+                         b''):
+            outputs.append(line)
+            if forward:
+                logger.log(log_level, line.decode(errors='replace').rstrip())
+        process.stdout.close()
+
+        in_error = process.wait()
     except OSError as exception:
         in_error = True
-        outputs = [str(exception)]
+        outputs.append(str(exception).encode())
     if in_error:
+        outputs = [b''.join(outputs).decode(errors='replace').rstrip()]
         if check_file and _exists(check_file):
             with open(check_file, 'rt') as file:
                 outputs.append(file.read())
@@ -158,6 +182,10 @@ class SysCallClient(_Client):
         try:
             return self._run_executable(mode='2', output_json=str(_uuid()))
         finally:
+            # Metering services are stopped: Configuration need to be
+            # reapplied on next start
+            self._metering_env = None
+            self._clear_metering_state()
             _systemctl('stop', 'meteringsession', 'meteringclient')
 
     def _run_executable(
@@ -240,6 +268,14 @@ class SysCallClient(_Client):
                 config_env == self._metering_env):
             return
 
+        # Same environment already applied by another process and
+        # configuration files unchanged since: Already configured
+        request_checksum = self._env_checksum(config_env)
+        if not reload and self._metering_state_match(
+                'request', request_checksum):
+            self._metering_env = config_env.copy()
+            return
+
         # Get current configuration from files
         cur_env, has_config = self._read_configuration_files()
 
@@ -269,9 +305,17 @@ class SysCallClient(_Client):
             full_env.get(key) != cur_env.get(key) for key in
             full_env if key not in ('client_id', 'client_secret'))
 
+        # Values read from files are str, environment may have been applied
+        # with other types.
+        full_checksum = self._env_checksum(full_env)
+        if update_config and self._metering_state_match(
+                'applied', full_checksum):
+            update_config = False
+
         # All is already up to date: caches values
         if not reload and not update_config and not update_credentials:
             self._metering_env = full_env
+            self._save_metering_state(request_checksum, full_checksum)
             return
 
         # Updates
@@ -287,6 +331,97 @@ class SysCallClient(_Client):
 
         # Caches values
         self._metering_env = full_env
+        self._save_metering_state(request_checksum, full_checksum)
+
+    @staticmethod
+    def _env_checksum(config_env):
+        """
+        Returns checksum of a metering environment.
+
+        Args:
+            config_env (dict): environment.
+
+        Returns:
+            str: checksum.
+        """
+        return _sha256(_json.dumps(
+            config_env, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _configuration_files_signature():
+        """
+        Returns signature of metering configuration files.
+
+        This allow to detect files changes without reading them.
+
+        Returns:
+            list: Size and modification time of each file.
+        """
+        signature = []
+        for path in (_cfg.METERING_CLIENT_CONFIG, _cfg.METERING_CREDENTIALS):
+            try:
+                file_stat = _stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append([file_stat.st_size, file_stat.st_mtime])
+        return signature
+
+    def _metering_state_match(self, key, checksum):
+        """
+        Checks if an environment checksum match with the last applied
+        metering state.
+
+        This does not run any subprocess, so it can be used as fast path
+        validation.
+
+        Args:
+            key (str): "request" for environment passed to "_init_metering",
+                "applied" for environment written in configuration files.
+            checksum (str): Environment checksum.
+
+        Returns:
+            bool: True if match.
+        """
+        try:
+            with open(_cfg.METERING_STATE, 'rt') as state_file:
+                state = _json.load(state_file)
+        except (IOError, OSError, ValueError):
+            return False
+        return (state.get(key) == checksum and state.get('files') ==
+                self._configuration_files_signature())
+
+    def _save_metering_state(self, request_checksum, full_checksum):
+        """
+        Saves metering state to allow other processes to skip metering
+        configuration.
+
+        Args:
+            request_checksum (str): Checksum of environment passed to
+                "_init_metering".
+            full_checksum (str): Checksum of environment applied.
+        """
+        try:
+            _utl.makedirs(_dirname(_cfg.METERING_STATE), exist_ok=True)
+            with open(_cfg.METERING_STATE, 'wt') as state_file:
+                _json.dump({
+                    'request': request_checksum, 'applied': full_checksum,
+                    'files': self._configuration_files_signature()},
+                    state_file)
+
+        # Not saving state only disable the optimization
+        except (IOError, OSError):
+            return
+
+    @staticmethod
+    def _clear_metering_state():
+        """
+        Clears metering state.
+        """
+        try:
+            _remove(_cfg.METERING_STATE)
+        except OSError:
+            pass
 
     def _credentials_needs_update(self, config_env, cur_env, full_env):
         """
@@ -15,6 +15,8 @@ Notes:
 """
 
 from ast import literal_eval as _literal_eval
+from contextlib import contextmanager as _contextmanager
+from copy import deepcopy as _deepcopy
 try:
     # Python 3
     from collections.abc import Mapping as _Mapping
@@ -27,9 +29,15 @@ except ImportError:
     from ConfigParser import ConfigParser
     CONFIG_PARSER_READ = 'readfp'
 
+from hashlib import sha256 as _sha256
 import json as _json
+import os as _os
 import os.path as _os_path
 from os import environ as _environ
+from threading import Lock as _Lock, Thread as _Thread
+from time import time as _time
+
+from requests import RequestException as _RequestException
 
 from apyfal import exceptions as _exc
 from apyfal import _utilities as _utl
@@ -55,15 +63,39 @@ METERING_CLIENT_CONFIG = '/etc/sysconfig/meteringclient'
 #: Apyfal directory in user home
 APYFAL_HOME = _os_path.join(_os_path.expanduser('~'), '.apyfal')
 
+#: Metering configuration state applied by Apyfal
+METERING_STATE = _os_path.join(APYFAL_HOME, 'metering_state.json')
+
+#: Local files checksums index
+CHECKSUMS_INDEX = _os_path.join(APYFAL_HOME, 'checksums.json')
+
+#: Accelize access tokens cache
+ACCESS_TOKENS = _os_path.join(APYFAL_HOME, 'access_tokens.json')
+
+#: Host configurations cache
+HOST_CONFIGURATIONS = _os_path.join(APYFAL_HOME, 'host_configurations.json')
+
+#: Verified hosts initialization resources cache
+HOST_INIT_CACHE = _os_path.join(APYFAL_HOME, 'host_init_cache.json')
+
+#: Output files kept after background upload failure
+FAILED_UPLOADS = _os_path.join(APYFAL_HOME, 'failed_uploads')
+
 #: Apyfal generated self signed wildcard certificate files
 APYFAL_CERT_CRT = _os_path.join(_utl.SSH_DIR, 'ApyfalCertificate.crt')
 APYFAL_CERT_KEY = _os_path.join(_utl.SSH_DIR, 'ApyfalCertificate.key')
 
-__all__ = ['create_configuration', 'Configuration',
+__all__ = ['create_configuration', 'Configuration', 'ConfigurationSnapshot',
            'accelerator_executable_available',
            'ACCELERATOR_EXECUTABLE', 'ACCELERATOR_TMP_ROOT', 'APYFAL_HOME',
            'METERING_SERVER', 'METERING_TMP', 'METERING_CLIENT_CONFIG',
-           'METERING_CREDENTIALS', 'APYFAL_CERT_CRT', 'APYFAL_CERT_KEY']
+           'METERING_CREDENTIALS', 'METERING_STATE', 'CHECKSUMS_INDEX',
+           'ACCESS_TOKENS', 'HOST_CONFIGURATIONS', 'HOST_INIT_CACHE',
+           'FAILED_UPLOADS', 'APYFAL_CERT_CRT', 'APYFAL_CERT_KEY']
+
+# Access tokens of current process by credentials
+_ACCESS_TOKENS = {}
+_ACCESS_TOKENS_LOCK = _Lock()
 
 
 def create_configuration(configuration_file):
@@ -210,6 +242,7 @@ class Configuration(_Mapping):
         configuration_file (apyfal.configuration.Configuration, path-like object or file-like object):
             If None, use default values.
             Path-like object can be path, URL or cloud object URL.
+            Can also be a "apyfal.configuration.ConfigurationSnapshot".
     """
     #: Default name for configuration file (Used for file detection)
     DEFAULT_CONFIG_FILE = "accelerator.conf"
@@ -217,6 +250,9 @@ class Configuration(_Mapping):
     # Request timeout
     _REQUEST_TIMEOUT = 10
 
+    # Default host configurations cache time to live in seconds
+    _HOST_CONFIGURATIONS_TTL = 3600
+
     def __init__(self, configuration_file=None):
         _Mapping.__init__(self)
 
@@ -224,6 +260,11 @@ class Configuration(_Mapping):
         self._sections = dict()
         self._cache = dict()
 
+        # Loads configuration snapshot
+        if isinstance(configuration_file, ConfigurationSnapshot):
+            self._load_snapshot(configuration_file)
+            return
+
         # Find configuration file to use
         configuration_file = self._find_config_file(configuration_file)
 
@@ -260,12 +301,52 @@ class Configuration(_Mapping):
     def __repr__(self):
         return '%s(%s)' % (object.__repr__(self), self.__str__())
 
+    def snapshot(self):
+        """
+        Returns an immutable and picklable snapshot of this configuration.
+
+        The snapshot contains configuration sections and, if already
+        retrieved, the access token and host configurations. It can be passed
+        as configuration to other processes to start from the same state
+        without reading configuration file or requesting Accelize server
+        again.
+
+        Returns:
+            apyfal.configuration.ConfigurationSnapshot: Snapshot.
+        """
+        access_token = self._cache.get('_get_access_token')
+        return ConfigurationSnapshot(
+            {name: dict(section) for name, section in self._sections.items()},
+            access_token.state if access_token is not None else None,
+            self._cache.get('get_host_configurations'))
+
+    def _load_snapshot(self, snapshot):
+        """
+        Loads configuration snapshot.
+
+        Args:
+            snapshot (apyfal.configuration.ConfigurationSnapshot): Snapshot.
+        """
+        self._sections = {
+            name: _Section(name, self, snapshot[name]) for name in snapshot}
+
+        if snapshot.host_configurations is not None:
+            self._cache['get_host_configurations'] = _deepcopy(
+                snapshot.host_configurations)
+
+        # Shares access token with process, if not already more recent
+        if snapshot.access_token is not None:
+            self._get_access_token().update_state(snapshot.access_token)
+
     @property
-    @_utl.memoizedmethod
     def access_token(self):
         """
         Check user Accelize credential and returns its access token.
 
+        The token is shared between all configurations and processes of
+        current user (Cached in "ACCESS_TOKENS" file) until its expiry, and is
+        refreshed in background before its expiry.
+
         Returns:
             str: Access token.
 
@@ -273,6 +354,20 @@ class Configuration(_Mapping):
             apyfal.exceptions.ClientAuthenticationException:
                 User credential are not valid.
         """
+        return self._get_access_token().get()
+
+    @_utl.memoizedmethod
+    def _get_access_token(self):
+        """
+        Returns access token of user Accelize credential.
+
+        Returns:
+            _AccessToken: Access token.
+
+        Raises:
+            apyfal.exceptions.ClientAuthenticationException:
+                No user credential.
+        """
         # Checks Client ID and secret ID presence
         client_id = self['accelize']['client_id']
         secret_id = self['accelize']['secret_id']
@@ -280,18 +375,14 @@ class Configuration(_Mapping):
             raise _exc.ClientAuthenticationException(
                 gen_msg='no_credentials')
 
-        # Check access and get token from server
-        response = _utl.http_session().post(
-            METERING_SERVER + '/o/token/',
-            data={"grant_type": "client_credentials"},
-            auth=(client_id, secret_id), timeout=self._REQUEST_TIMEOUT)
-
-        if response.status_code != 200:
-            raise _exc.ClientAuthenticationException(
-                'Unable to authenticate client ID starting by "%s"'
-                % client_id[:10], exc=response.text)
-
-        return _json.loads(response.text)['access_token']
+        # Shares token between configurations with same credentials
+        with _ACCESS_TOKENS_LOCK:
+            try:
+                return _ACCESS_TOKENS[(client_id, secret_id)]
+            except KeyError:
+                access_token = _ACCESS_TOKENS[(client_id, secret_id)] = \
+                    _AccessToken(client_id, secret_id, self._REQUEST_TIMEOUT)
+                return access_token
 
     def get_host_requirements(self, host_type, accelerator):
         """
@@ -329,19 +420,102 @@ class Configuration(_Mapping):
         """
         Get available hosts configurations.
 
+        Configurations are cached in "HOST_CONFIGURATIONS" file for
+        "host_configurations_ttl" seconds ("accelize" section), then are
+        revalidated with Accelize server. If Accelize server is unavailable
+        (Or access token can't be retrieved), expired cached configurations
+        are used.
+
+        If "host_configurations_file" is specified ("accelize" section),
+        configurations are read from this file instead of Accelize server.
+
         Returns:
             dict: Dictionary of possibles configurations
         """
-        response = _utl.http_session().get(
-            METERING_SERVER + '/auth/getlastcspconfiguration/',
-            headers={"Authorization": "Bearer %s" % self.access_token,
-                     "Content-Type": "application/json",
-                     "Accept": "application/vnd.accelize.v1+json"},
-            timeout=self._REQUEST_TIMEOUT)
+        section = self['accelize']
+
+        # Offline mode: Reads configurations from file
+        configurations_file = section['host_configurations_file']
+        if configurations_file:
+            from apyfal.storage import open as srg_open
+            with srg_open(configurations_file, 'rt') as file:
+                return _json.load(file)
+
+        # Gets configurations from cache
+        key = _sha256(
+            (section['client_id'] or '').encode()).hexdigest()
+        cache = self._read_host_configurations()
+        cached = cache.get(key) or dict()
+        ttl = section.get_literal('host_configurations_ttl')
+        if ttl is None:
+            ttl = self._HOST_CONFIGURATIONS_TTL
+        if _time() - cached.get('time', 0) < ttl:
+            return cached['configurations']
+
+        # Gets configurations from server, only if modified
+        try:
+            headers = {"Authorization": "Bearer %s" % self.access_token,
+                       "Content-Type": "application/json",
+                       "Accept": "application/vnd.accelize.v1+json"}
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+            response = _utl.http_session().get(
+                METERING_SERVER + '/auth/getlastcspconfiguration/',
+                headers=headers, timeout=self._REQUEST_TIMEOUT)
+            response.raise_for_status()
+
+        except (_RequestException,
+                _exc.ClientAuthenticationException) as exception:
+            if not cached:
+                raise
+            _utl.get_logger().warning(
+                'Using expired cached host configurations: %s', exception)
+            return cached['configurations']
+
+        if response.status_code != 304:
+            cached = {'configurations': _json.loads(response.text),
+                      'etag': response.headers.get('ETag'),
+                      'last_modified': response.headers.get('Last-Modified')}
+
+        # Updates cache
+        cached['time'] = _time()
+        cache[key] = cached
+        self._write_host_configurations(cache)
+
+        return cached['configurations']
+
+    @staticmethod
+    def _read_host_configurations():
+        """
+        Reads host configurations cache file.
 
-        response.raise_for_status()
+        Returns:
+            dict: Cached host configurations.
+        """
+        try:
+            with open(HOST_CONFIGURATIONS, 'rt') as file:
+                return _json.load(file)
+        except (IOError, OSError, ValueError):
+            return dict()
 
-        return _json.loads(response.text)
+    @staticmethod
+    def _write_host_configurations(cache):
+        """
+        Writes host configurations cache file atomically.
+
+        Args:
+            cache (dict): Cached host configurations.
+        """
+        try:
+            _utl.makedirs(_os_path.dirname(HOST_CONFIGURATIONS),
+                          exist_ok=True)
+            with _utl.atomic_write(HOST_CONFIGURATIONS) as file:
+                _json.dump(cache, file)
+        except (IOError, OSError):
+            return
 
     def write(self, fileobject):
         """
@@ -491,3 +665,272 @@ class Configuration(_Mapping):
             '"%s%s" is deprecated in "accelerator.conf"' %
             (section, ':%s' % parameter if parameter else ''),
             DeprecationWarning)
+
+
+class ConfigurationSnapshot(_Mapping):
+    """
+    Immutable and picklable configuration snapshot.
+
+    This is a mapping of configuration sections names to sections parameters
+    copies. Use "apyfal.configuration.Configuration.snapshot" to create it,
+    and pass it as configuration to Apyfal classes.
+
+    Args:
+        sections (dict): Configuration sections parameters.
+        access_token (tuple): Access token state.
+        host_configurations (dict): Host configurations.
+    """
+
+    def __init__(self, sections, access_token=None, host_configurations=None):
+        _Mapping.__init__(self)
+        self._sections = _deepcopy(sections)
+        self._access_token = access_token
+        self._host_configurations = _deepcopy(host_configurations)
+
+    def __getitem__(self, section):
+        return dict(self._sections[section])
+
+    def __iter__(self):
+        return self._sections.__iter__()
+
+    def __len__(self):
+        return self._sections.__len__()
+
+    def __str__(self):
+        return self._sections.__str__()
+
+    def __repr__(self):
+        return '%s(%s)' % (object.__repr__(self), self.__str__())
+
+    @property
+    def access_token(self):
+        """
+        Access token state.
+
+        Returns:
+            tuple or None: token, expiry time, refresh time.
+        """
+        return self._access_token
+
+    @property
+    def host_configurations(self):
+        """
+        Host configurations.
+
+        Returns:
+            dict or None: Host configurations.
+        """
+        return self._host_configurations
+
+
+class _AccessToken(object):
+    """
+    Accelize access token.
+
+    The token is cached in "ACCESS_TOKENS" file with its expiry time. This
+    file is locked while token is requested to avoid redundant requests from
+    concurrent processes.
+
+    Args:
+        client_id (str): Accelize client ID.
+        secret_id (str): Accelize secret ID.
+        timeout (int): Request timeout in seconds.
+    """
+
+    # Token is considered expired this number of seconds before its expiry
+    _EXPIRY_MARGIN = 60
+
+    # Token is refreshed in background when this part of its lifetime remains
+    _REFRESH_RATIO = 0.2
+
+    # Token lifetime in seconds if not specified by server
+    _DEFAULT_EXPIRES_IN = 600
+
+    # Lock between threads of current process on cache file
+    _FILE_LOCK = _Lock()
+
+    def __init__(self, client_id, secret_id, timeout):
+        self._client_id = client_id
+        self._secret_id = secret_id
+        self._timeout = timeout
+
+        # Cache file key: Secret ID is not stored
+        self._key = _sha256(
+            ('%s:%s' % (client_id, secret_id)).encode()).hexdigest()
+
+        self._lock = _Lock()
+        self._token = None
+        self._expiry = 0
+        self._refresh = 0
+        self._refresh_thread = None
+
+    def get(self):
+        """
+        Returns access token.
+
+        Returns:
+            str: Access token.
+
+        Raises:
+            apyfal.exceptions.ClientAuthenticationException:
+                User credential are not valid.
+        """
+        with self._lock:
+            now = _time()
+            if now < self._expiry:
+
+                # Refreshes token in background before its expiry
+                if now >= self._refresh and self._refresh_thread is None:
+                    self._refresh_thread = _Thread(
+                        target=self._background_refresh)
+                    self._refresh_thread.daemon = True
+                    self._refresh_thread.start()
+
+                return self._token
+
+        return self._update()
+
+    @property
+    def state(self):
+        """
+        Token state.
+
+        Returns:
+            tuple or None: token, expiry time, refresh time. None if no token.
+        """
+        with self._lock:
+            if self._token is None:
+                return None
+            return self._token, self._expiry, self._refresh
+
+    def update_state(self, state):
+        """
+        Updates token state if more recent than current one.
+
+        Args:
+            state (tuple): token, expiry time, refresh time.
+        """
+        token, expiry, refresh_time = state
+        with self._lock:
+            if expiry > self._expiry:
+                self._token = token
+                self._expiry = expiry
+                self._refresh = refresh_time
+
+    def _background_refresh(self):
+        """
+        Refreshes token.
+
+        Only for use in thread.
+        """
+        try:
+            self._update(refresh=True)
+        except Exception as exception:
+            # Current token remains valid until its expiry: Retries on next get
+            _utl.get_logger().debug(
+                'Unable to refresh access token: %s', exception)
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def _update(self, refresh=False):
+        """
+        Gets token from cache file, or from server if not cached, expired or
+        requiring refresh.
+
+        Args:
+            refresh (bool): If True, refreshes the current token.
+
+        Returns:
+            str: Access token.
+        """
+        with self._lock_file():
+            tokens = self._read_tokens()
+            try:
+                token, expiry, refresh_time = tokens[self._key]
+            except (KeyError, ValueError):
+                token, expiry, refresh_time = None, 0, 0
+
+            now = _time()
+            if now >= expiry or (refresh and expiry <= self._expiry):
+                # Token missing or expired, or not already refreshed by
+                # another process: Gets a new token
+                token, expires_in = self._request()
+                expiry = now + expires_in - self._EXPIRY_MARGIN
+                refresh_time = now + expires_in * (1 - self._REFRESH_RATIO)
+
+                tokens = {key: value for key, value in tokens.items()
+                          if value[1] > now}
+                tokens[self._key] = [token, expiry, refresh_time]
+                self._write_tokens(tokens)
+
+        with self._lock:
+            self._token = token
+            self._expiry = expiry
+            self._refresh = refresh_time
+        return token
+
+    def _request(self):
+        """
+        Requests a new token to Accelize server.
+
+        Returns:
+            tuple: token (str), lifetime in seconds (int).
+
+        Raises:
+            apyfal.exceptions.ClientAuthenticationException:
+                User credential are not valid.
+        """
+        response = _utl.http_session().post(
+            METERING_SERVER + '/o/token/',
+            data={"grant_type": "client_credentials"},
+            auth=(self._client_id, self._secret_id), timeout=self._timeout)
+
+        if response.status_code != 200:
+            raise _exc.ClientAuthenticationException(
+                'Unable to authenticate client ID starting by "%s"'
+                % self._client_id[:10], exc=response.text)
+
+        result = _json.loads(response.text)
+        return result['access_token'], int(
+            result.get('expires_in') or self._DEFAULT_EXPIRES_IN)
+
+    @classmethod
+    @_contextmanager
+    def _lock_file(cls):
+        """
+        Locks cache file for current process and other processes.
+        """
+        with cls._FILE_LOCK:
+            with _utl.file_lock(ACCESS_TOKENS):
+                yield
+
+    @staticmethod
+    def _read_tokens():
+        """
+        Reads cache file.
+
+        Returns:
+            dict: Tokens.
+        """
+        try:
+            with open(ACCESS_TOKENS, 'rt') as file:
+                return _json.load(file)
+        except (IOError, OSError, ValueError):
+            return dict()
+
+    @staticmethod
+    def _write_tokens(tokens):
+        """
+        Writes cache file. File is only readable by current user.
+
+        Args:
+            tokens (dict): Tokens.
+        """
+        try:
+            with _os.fdopen(_os.open(
+                    ACCESS_TOKENS, _os.O_WRONLY | _os.O_CREAT | _os.O_TRUNC,
+                    0o600), 'wt') as file:
+                _json.dump(tokens, file)
+        except (IOError, OSError):
+            return
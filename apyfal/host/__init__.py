@@ -78,6 +78,7 @@ class Host(_utl.ABC):
         self._config_section = 'host.%s' % self.NAME if self.NAME else 'host'
         self._host_name = None
         self._host_name_match = None
+        self._host_name_filter = None
 
         # Read configuration from file
         self._config = _cfg.create_configuration(config)
@@ -398,6 +399,10 @@ class Host(_utl.ABC):
         """
         Iterates over accelerator hosts of current type.
 
+        Hosts can be filtered provider side with "_host_name_filter" host
+        name pattern ("*" wildcard), but must be validated with
+        "_is_accelerator_host".
+
         Returns:
             generator of dict: dicts contains attributes values of the host.
         """
@@ -449,6 +454,12 @@ class Host(_utl.ABC):
         self._host_name_match = _re.compile(
             '%saccelize_\w*_\d{12}' % host_name_prefix).match
 
+        # Host name filter with wildcards for provider side filtering, only
+        # approximated if prefix is a regular expression
+        self._host_name_filter = (
+            '%saccelize_*' % host_name_prefix
+            if _re.match(r'^[\w-]*$', host_name_prefix) else '*accelize_*')
+
         # Prepares repr base information
         repr_base = "<%s.%s" % (self.__class__.__module__,
                                 self.__class__.__name__) + ' %s>'
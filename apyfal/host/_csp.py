@@ -2,11 +2,20 @@
 """Cloud Service Providers"""
 
 from abc import abstractmethod as _abstractmethod
+from atexit import register as _atexit_register
 from contextlib import contextmanager as _contextmanager
+from copy import copy as _copy, deepcopy as _deepcopy
 from concurrent.futures import (ThreadPoolExecutor as _ThreadPoolExecutor,
-                                as_completed as _as_completed)
+                                as_completed as _as_completed,
+                                Future as _Future, wait as _wait,
+                                TimeoutError as _FutureTimeoutError,
+                                CancelledError as _CancelledError)
+from hashlib import sha256 as _sha256
+import json as _json
 import os.path as _os_path
-from time import sleep as _sleep
+from random import uniform as _uniform
+from threading import Event as _Event, Lock as _Lock, Thread as _Thread
+from time import sleep as _sleep, time as _time
 try:
     # Python 2
     from StringIO import StringIO as _StringIO
@@ -21,6 +30,23 @@ import apyfal._utilities as _utl
 import apyfal.storage as _srg
 from apyfal._utilities import get_logger as _get_logger
 
+# Verified initialization resources by account, then by initialization:
+# [time, result, attributes values]
+_INIT_CACHE = {}
+_INIT_CACHE_LOCK = _Lock()
+_INIT_CACHE_LOADED = []
+
+# Warm pool instances claim tried by this process and instances in refill by
+# key
+_WARM_POOL_LOCK = _Lock()
+_WARM_POOL_CLAIMED = set()
+_WARM_POOL_REFILLING = {}
+
+# Hosts launching warm pool instances, with event set once instance launched.
+# Their instances are terminated if process exits before they are paused.
+_WARM_POOL_STARTING = {}
+_WARM_POOL_EXITING = []
+
 
 class CSPHost(_Host):
     """This is base abstract class for all CSP classes.
@@ -47,6 +73,10 @@ class CSPHost(_Host):
             use. If not specified, create a new instance.
         use_private_ip (bool): If True, on new instances,
             uses private IP instead of public IP as default host IP.
+        warm_pool_size (int): Number of paused instances to keep ready with
+            same configuration (If supported by the host). If set, new hosts
+            starts one of these instances instead of creating a new one, and
+            the pool is refilled in background.
         stop_mode (str or int): Define the "stop" method behavior.
             Default to 'term' if new instance, or 'keep' if already existing
             instance. See "stop_mode" property for more information and possible
@@ -112,6 +142,40 @@ class CSPHost(_Host):
     # Initialization methods
     _INIT_METHODS = ['_init_security_group', '_init_key_pair']
 
+    # Attributes read and set by initialization methods that can be cached.
+    # Security group is not cached because it authorizes current host IP.
+    _INIT_CACHE_ATTRIBUTES = {'_init_key_pair': ('_key_pair',)}
+
+    # Attributes set by initialization methods, copied to all hosts
+    # initialized together (See "_start_many")
+    _INIT_ATTRIBUTES = ('_key_pair', '_security_group')
+
+    # Default time in seconds to keep initialization methods results
+    _INIT_CACHE_TTL = 3600
+
+    # True if warm pool is supported (See "_iter_warm_instances")
+    _WARM_POOL = False
+
+    # Tag of warm pool instances
+    _WARM_POOL_TAG = 'ApyfalWarmPool'
+
+    # Maximum time in seconds to wait warm pool instances launch on exit
+    _WARM_POOL_EXIT_TIMEOUT = 30.0
+
+    # Minimum interval in seconds between boot probes
+    _PROBE_INTERVAL = 0.1
+
+    # True if host IP is available without extra request while instance is
+    # provisioning. Allows probing boot during provisioning.
+    _PROBE_ON_PROVISIONING = False
+
+    # Maximum number of instances by "_get_instances" request.
+    # 0 if "_get_instances" is not supported.
+    _INSTANCES_BATCH_SIZE = 0
+
+    # Number of instances by request when iterating over hosts
+    _ITER_HOSTS_PAGE_SIZE = 100
+
     # Value to show in repr
     # Python 2 don't .copy() on list
     _REPR = list(_Host._REPR)
@@ -121,7 +185,7 @@ class CSPHost(_Host):
                  instance_type=None, key_pair=None, security_group=None,
                  instance_id=None, init_config=None, init_script=None,
                  ssl_cert_crt=None, ssl_cert_key=None, ssl_cert_generate=None,
-                 use_private_ip=None,
+                 use_private_ip=None, warm_pool_size=None,
                  **kwargs):
         _Host.__init__(self, **kwargs)
 
@@ -132,6 +196,10 @@ class CSPHost(_Host):
         self._instance_type = None
         self._instance_type_name = None
         self._warn_keep_once = False
+        self._instance_started = False
+        self._warm_pool_member = None
+        self._boot_probe = None
+        self._boot_probe_deadline = [0.0]
         section = self._config[self._config_section]
 
         # CSP
@@ -144,6 +212,8 @@ class CSPHost(_Host):
         self._instance_id = instance_id or section['instance_id']
         self._use_private_ip = (
             use_private_ip or section.get_literal('use_private_ip') or False)
+        self._warm_pool_size = (
+            warm_pool_size or section.get_literal('warm_pool_size') or 0)
 
         # Security
         self._key_pair = (
@@ -324,6 +394,46 @@ class CSPHost(_Host):
             object: Instance
         """
 
+    def _get_instances(self, instances_ids):
+        """
+        Returns many instances with a single request.
+
+        Not supported by default: Returns no instances. Hosts that support it
+        must set "_INSTANCES_BATCH_SIZE".
+
+        Args:
+            instances_ids (list of str): Instances IDs.
+
+        Returns:
+            dict: Instances by instances IDs. Instances not found are not
+                returned.
+        """
+        return dict()
+
+    def _poll_status(self):
+        """
+        Returns current status of current instance.
+
+        Like "_status", but if supported by host (See "_get_instances"), the
+        instance is retrieved by a poller shared with all hosts of the same
+        provider, region and credentials, that batches their requests.
+
+        Returns:
+            str: Status
+        """
+        if not self._INSTANCES_BATCH_SIZE or self._instance_id is None:
+            return self._status()
+
+        # Instance not found may be not yet visible: Retries directly
+        self._instance = _InstancesPoller.get(
+            self).get_instance(self) or self._get_instance()
+
+        if self._instance is None:
+            raise _exc.HostRuntimeException(
+                gen_msg=('no_instance_id', self._instance_id))
+
+        return self._get_status()
+
     @_abstractmethod
     def _init_key_pair(self):
         """
@@ -361,32 +471,43 @@ class CSPHost(_Host):
         # Starts instance only if not already started
         if self._host_ip is None:
 
-            # Get parameters from accelerator
-            self._set_accelerator_requirements(
-                accelerator=accelerator, accel_parameters=accel_parameters,
-                image_id=image_id, instance_type=instance_type)
+            # Instance already started with other hosts (See "_start_many")
+            if self._instance_started:
+                self._instance_started = False
 
-            # Checks CSP credential
-            self._check_credential()
+            else:
+                # Get parameters from accelerator
+                self._set_accelerator_requirements(
+                    accelerator=accelerator, accel_parameters=accel_parameters,
+                    image_id=image_id, instance_type=instance_type)
 
-            # Creates and starts instance if not exists
-            if self.instance_id is None:
-                _get_logger().info(
-                    "Configuring host on %s instance...", self._host_type)
+                # Checks CSP credential
+                self._check_credential()
 
-                with self._stop_silently_on_exception():
-                    self._create_instance()
+                # Claims a paused instance from warm pool if available,
+                # claimed instance is already started
+                claimed = (self.instance_id is None and
+                           self._warm_pool_size and self._WARM_POOL and
+                           self._claim_warm_instance())
 
-                with self._stop_silently_on_exception():
-                    self._instance, self._instance_id = \
-                        self._start_new_instance()
+                # Creates and starts instance if not exists
+                if self.instance_id is None:
+                    _get_logger().info(
+                        "Configuring host on %s instance...", self._host_type)
 
-                _get_logger().debug(_utl.gen_msg(
-                    'created_named', 'instance', self._instance_id))
+                    with self._stop_silently_on_exception():
+                        self._create_instance()
 
-            # If exists, starts it directly
-            else:
-                self._start_existing_instance(self._status())
+                    with self._stop_silently_on_exception():
+                        self._instance, self._instance_id = \
+                            self._start_new_instance()
+
+                    _get_logger().debug(_utl.gen_msg(
+                        'created_named', 'instance', self._instance_id))
+
+                # If exists, starts it directly
+                elif not claimed:
+                    self._start_existing_instance(self._status())
 
             # Waiting for instance provisioning
             with self._stop_silently_on_exception():
@@ -407,6 +528,78 @@ class CSPHost(_Host):
             raise _exc.HostRuntimeException(
                 gen_msg=('unable_reach_port', self.host_ip, 80))
 
+    @staticmethod
+    def _start_many(hosts, accelerator=None, accel_parameters=None,
+                    stop_mode=None, image_id=None, instance_type=None):
+        """
+        Creates and starts instances of many identically configured hosts.
+
+        Credentials checks and instance initialization (Key pair, security
+        group, role, ...) are done once for all hosts and instances are
+        launched together. Hosts instances are then ready to be waited with
+        "start".
+
+        Args:
+            hosts (list of CSPHost): Hosts.
+            accelerator (str): Name of the accelerator.
+            accel_parameters (dict): Can override parameters from accelerator
+                client.
+            stop_mode (str or int): See "stop_mode" property for more
+                information.
+            image_id (str): Force the use of specified image ID.
+            instance_type (str): Force the use of specified instance type.
+        """
+        # Only hosts without existing instance
+        hosts = [host for host in hosts if host._host_ip is None and
+                 host.instance_id is None and not host._instance_started]
+        if len(hosts) < 2 or (hosts[0]._warm_pool_size and
+                              hosts[0]._WARM_POOL):
+            # Hosts claims instances from warm pool on start
+            return
+        leader = hosts[0]
+
+        for host in hosts:
+            host.stop_mode = stop_mode
+            host._set_accelerator_requirements(
+                accelerator=accelerator, accel_parameters=accel_parameters,
+                image_id=image_id, instance_type=instance_type)
+
+        # Initializes once for all hosts
+        leader._check_credential()
+
+        _get_logger().info("Configuring hosts on %d %s instances...",
+                           len(hosts), leader._host_type)
+
+        with leader._stop_silently_on_exception():
+            leader._create_instance()
+
+        for host in hosts[1:]:
+            for name in leader._INIT_ATTRIBUTES:
+                setattr(host, name, getattr(leader, name))
+
+        # Launches all instances, terminates started instances on failure
+        try:
+            leader._start_new_instances(hosts)
+
+        except _exc.HostException as exception:
+            leader._add_help_to_exception_message(exception)
+            leader._clear_init_cache()
+            for host in hosts:
+                if host._instance_id is None:
+                    continue
+                try:
+                    host._terminate_instance()
+                except _exc.HostException:
+                    pass
+                host._instance = None
+                host._instance_id = None
+            raise
+
+        for host in hosts:
+            host._instance_started = True
+            _get_logger().debug(_utl.gen_msg(
+                'created_named', 'instance', host._instance_id))
+
     def _create_instance(self):
         """
         Initializes and creates instance.
@@ -416,12 +609,107 @@ class CSPHost(_Host):
         with _ThreadPoolExecutor(
                 max_workers=len(self._INIT_METHODS)) as executor:
             for method in self._INIT_METHODS:
-                futures.append(executor.submit(getattr(self, method)))
+                futures.append(executor.submit(self._init_cached, method))
 
         # Wait completion
         for future in _as_completed(futures):
             future.result()
 
+    def _init_cached(self, method):
+        """
+        Runs an initialization method, or restores its results if it was
+        already successfully run with same parameters in this account and
+        region (Cached in memory and in "HOST_INIT_CACHE" file).
+
+        Args:
+            method (str): Initialization method name.
+
+        Returns:
+            object: Initialization method result.
+        """
+        attributes = self._INIT_CACHE_ATTRIBUTES.get(method)
+        ttl = self._config[self._config_section].get_literal('init_cache_ttl')
+        if ttl is None:
+            ttl = self._INIT_CACHE_TTL
+        if not attributes or not ttl:
+            return getattr(self, method)()
+
+        # Restores result from cache
+        account = self._init_cache_account()
+        key = _sha256(_json.dumps([method] + [
+            getattr(self, name) for name in attributes]).encode()).hexdigest()
+        with _INIT_CACHE_LOCK:
+            if not _INIT_CACHE_LOADED:
+                _INIT_CACHE.update(self._read_init_cache())
+                _INIT_CACHE_LOADED.append(True)
+            try:
+                cached_time, result, values = _INIT_CACHE[account][key]
+            except (KeyError, ValueError):
+                cached_time = 0
+
+        if _time() - cached_time < ttl:
+            for name, value in zip(attributes, values):
+                setattr(self, name, value)
+            return result
+
+        # Runs initialization and caches result
+        result = getattr(self, method)()
+        with _INIT_CACHE_LOCK:
+            _INIT_CACHE.setdefault(account, dict())[key] = [
+                _time(), result, [getattr(self, name) for name in attributes]]
+            self._write_init_cache(_INIT_CACHE)
+        return result
+
+    def _clear_init_cache(self):
+        """
+        Clears cached initialization methods results of this account and
+        region.
+        """
+        with _INIT_CACHE_LOCK:
+            if _INIT_CACHE.pop(self._init_cache_account(), None) is not None:
+                self._write_init_cache(_INIT_CACHE)
+
+    def _init_cache_account(self):
+        """
+        Returns initialization cache key for this account and region.
+
+        Returns:
+            str: key.
+        """
+        return _sha256(_json.dumps([
+            self._host_type, self._region,
+            self._client_id]).encode()).hexdigest()
+
+    @staticmethod
+    def _read_init_cache():
+        """
+        Reads initialization cache file.
+
+        Returns:
+            dict: Cached initialization methods results.
+        """
+        try:
+            with open(_cfg.HOST_INIT_CACHE, 'rt') as file:
+                return _json.load(file)
+        except (IOError, OSError, ValueError):
+            return dict()
+
+    @staticmethod
+    def _write_init_cache(cache):
+        """
+        Writes initialization cache file.
+
+        Args:
+            cache (dict): Cached initialization methods results.
+        """
+        try:
+            _utl.makedirs(_os_path.dirname(_cfg.HOST_INIT_CACHE),
+                          exist_ok=True)
+            with open(_cfg.HOST_INIT_CACHE, 'wt') as file:
+                _json.dump(cache, file)
+        except (IOError, OSError):
+            return
+
     @_abstractmethod
     def _start_new_instance(self):
         """
@@ -432,6 +720,242 @@ class CSPHost(_Host):
             str: Instance ID
         """
 
+    def _start_new_instances(self, hosts):
+        """
+        Starts new instances of many identically configured hosts.
+
+        By default, instances are started in parallel with one request
+        per host. Override this method if the CSP can start many
+        instances with a single request.
+
+        "_instance" and "_instance_id" of each host are set once its instance
+        is started.
+
+        Args:
+            hosts (list of CSPHost): Hosts, including this host.
+        """
+        def start_new_instance(host):
+            """
+            Starts instance of a host.
+
+            Args:
+                host (CSPHost): Host.
+            """
+            host._instance, host._instance_id = host._start_new_instance()
+
+        with _ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+            futures = [executor.submit(start_new_instance, host)
+                       for host in hosts]
+
+        for future in futures:
+            future.result()
+
+    def _claim_warm_instance(self):
+        """
+        Claims a paused instance from the warm pool, then refills the
+        warm pool in background.
+
+        The instance is claimed by starting it with "_start_warm_instance"
+        that is atomic on CSP side, so an instance is claimed only once
+        between processes. Instances are tried only once by this process.
+
+        Returns:
+            bool: True if an instance was claimed and started.
+        """
+        key = self._warm_pool_key()
+        available = list(self._iter_warm_instances(key))
+        while available:
+            instance_id = available.pop()
+            with _WARM_POOL_LOCK:
+                if instance_id in _WARM_POOL_CLAIMED:
+                    continue
+                _WARM_POOL_CLAIMED.add(instance_id)
+
+            if self._start_warm_instance(instance_id):
+                self._instance_id = instance_id
+                break
+
+        with _WARM_POOL_LOCK:
+            available = [instance_id for instance_id in available
+                         if instance_id not in _WARM_POOL_CLAIMED]
+            missing = (self._warm_pool_size - len(available) -
+                       _WARM_POOL_REFILLING.get(key, 0))
+            if missing > 0:
+                _WARM_POOL_REFILLING[key] = (
+                    _WARM_POOL_REFILLING.get(key, 0) + missing)
+
+        if self._instance_id is not None:
+            # Removes the instance from the warm pool
+            self._unmark_warm_instance(self._instance_id)
+            _get_logger().debug(
+                "Instance '%s' claimed from warm pool", self._instance_id)
+
+        if missing > 0:
+            # Instances are refilled with copies of this host
+            hosts = []
+            for _ in range(missing):
+                host = _copy(self)
+                host._config = _cfg.Configuration(self._config.snapshot())
+                host._config_env = _deepcopy(self._config_env)
+                host._boot_probe = None
+                host._boot_probe_deadline = [0.0]
+                host._cache = dict()
+                host._host_name = None
+                host._instance = None
+                host._instance_id = None
+                host._warm_pool_size = 0
+                host._warm_pool_member = key
+                hosts.append(host)
+
+            # Stops refill on exit, registered once
+            with _WARM_POOL_LOCK:
+                if not _WARM_POOL_EXITING:
+                    _WARM_POOL_EXITING.append(False)
+                    _atexit_register(self._stop_warm_pool_refill)
+
+            self._refill_warm_pool(key, hosts)
+
+        return self._instance_id is not None
+
+    @classmethod
+    def _refill_warm_pool(cls, key, hosts):
+        """
+        Adds instances to the warm pool in background.
+
+        Daemon threads are used (And not "concurrent.futures" workers that
+        are joined on exit), so exit is never delayed by refill.
+
+        Args:
+            key (str): Warm pool key.
+            hosts (list of CSPHost): Hosts to use to start instances.
+        """
+        for host in hosts:
+            thread = _Thread(target=cls._add_warm_instance, args=(key, host))
+            thread.daemon = True
+            thread.start()
+
+    @staticmethod
+    def _add_warm_instance(key, host):
+        """
+        Starts a new instance, and pauses it in the warm pool once
+        provisioned.
+
+        Args:
+            key (str): Warm pool key.
+            host (CSPHost): Host to use to start instance.
+        """
+        launched = _Event()
+        try:
+            with host._stop_silently_on_exception():
+                host._create_instance()
+
+                # Launches instance, only if process is not exiting
+                with _WARM_POOL_LOCK:
+                    if any(_WARM_POOL_EXITING):
+                        return
+                    _WARM_POOL_STARTING[host] = launched
+                try:
+                    host._instance, host._instance_id = \
+                        host._start_new_instance()
+                finally:
+                    launched.set()
+
+                host._wait_instance_ready()
+                host._wait_instance_boot()
+            instance_id = host._instance_id
+            host.stop('stop')
+            _get_logger().debug(
+                "Instance '%s' added to warm pool", instance_id)
+
+        except _exc.HostException as exception:
+            _get_logger().warning(
+                'Unable to refill warm pool: %s', exception)
+
+        finally:
+            with _WARM_POOL_LOCK:
+                _WARM_POOL_REFILLING[key] -= 1
+                _WARM_POOL_STARTING.pop(host, None)
+
+    @classmethod
+    def _stop_warm_pool_refill(cls):
+        """
+        Terminates instances that are not yet paused in the warm pool, so
+        they are not left running when process exits.
+
+        Waits for instances being launched, up to
+        "_WARM_POOL_EXIT_TIMEOUT". Called on process exit.
+        """
+        with _WARM_POOL_LOCK:
+            _WARM_POOL_EXITING[:] = [True]
+            starting = list(_WARM_POOL_STARTING.items())
+
+        deadline = _time() + cls._WARM_POOL_EXIT_TIMEOUT
+        for host, launched in starting:
+            launched.wait(max(deadline - _time(), 0.0))
+            if host._instance_id is None:
+                continue
+            try:
+                host._terminate_instance()
+            except _exc.HostException:
+                continue
+            _get_logger().debug(
+                "Instance '%s' refilling warm pool terminated on exit",
+                host._instance_id)
+
+    def _warm_pool_key(self):
+        """
+        Returns warm pool key of this host configuration.
+
+        Returns:
+            str: key.
+        """
+        return _sha256(b'\0'.join((
+            str(self._accelerator).encode(), str(self._image_id).encode(),
+            str(self._instance_type).encode(),
+            self._user_data))).hexdigest()
+
+    def _iter_warm_instances(self, key):
+        """
+        Iterates over paused instances of the warm pool.
+
+        Args:
+            key (str): Warm pool key.
+
+        Not supported by default: Yields nothing. Hosts that support it must
+        set "_WARM_POOL".
+
+        Returns:
+            generator of str: Instances IDs.
+        """
+        return iter(())
+
+    def _start_warm_instance(self, instance_id):
+        """
+        Starts a paused instance of the warm pool.
+
+        This must be atomic on CSP side: If many processes try to start the
+        same instance, only one must succeed.
+
+        Not supported by default: Does nothing.
+
+        Args:
+            instance_id (str): Instance ID.
+
+        Returns:
+            bool: True if instance started by this call.
+        """
+        return False
+
+    def _unmark_warm_instance(self, instance_id):
+        """
+        Removes warm pool tag from an instance.
+
+        Not supported by default: Does nothing.
+
+        Args:
+            instance_id (str): Instance ID.
+        """
+
     @_abstractmethod
     def _start_existing_instance(self, status):
         """
@@ -444,14 +968,25 @@ class CSPHost(_Host):
     def _wait_instance_ready(self):
         """
         Waits until instance is ready.
+
+        If supported, the host boot is probed in background as soon as its IP
+        is known. An instance that has booted is ready. Once the instance is
+        running, the boot probe timeout is restarted.
+
+        Raises:
+            apyfal.exceptions.HostRuntimeException:
+                Provisioning error or timeout, or boot probe cancelled by
+                "stop".
         """
         warned = False
         # Waiting for the instance provisioning
-        with _utl.Timeout(self.TIMEOUT, sleep=self._TIMEOUT_SLEEP) as timeout:
+        with _utl.Timeout(self.TIMEOUT, sleep=0.0) as timeout:
             while True:
                 # Get instance status
-                status = self._status()
+                status = self._poll_status()
                 if status == self.STATUS_RUNNING:
+                    # Boot has its own timeout from now
+                    self._boot_probe_deadline[0] = _time() + self.TIMEOUT
                     return
                 elif status == self.STATUS_ERROR:
                     raise _exc.HostRuntimeException(
@@ -465,24 +1000,100 @@ class CSPHost(_Host):
                     warned = True
                     _get_logger().info("Waiting instance provisioning...")
 
+                # Waits next status check, or until host has booted
+                probe = (self._start_boot_probe() if
+                         self._PROBE_ON_PROVISIONING else None)
+                if probe is None:
+                    _sleep(self._TIMEOUT_SLEEP)
+                    continue
+
+                try:
+                    if (_wait([probe], timeout=self._TIMEOUT_SLEEP).done and
+                            probe.result()):
+                        return
+                except _CancelledError:
+                    raise _exc.HostRuntimeException(
+                        gen_msg=('unable_to', "boot"))
+
     def _wait_instance_boot(self):
         """
         Waits until instance has booted and webservice is OK
 
         Raises:
             apyfal.exceptions.HostRuntimeException:
-                Timeout while booting.
+                Timeout while booting, or boot probe cancelled by "stop".
         """
-        if not self.ALLOW_PORTS or _utl.check_port(self.host_ip, 80):
-            # Avoid to show message if already booted or not
+        probe = self._start_boot_probe()
+        if probe is None:
             return
 
-        _get_logger().info("Waiting instance boot...")
-        _sleep(self._TIMEOUT_SLEEP)
-        if not _utl.check_port(self.host_ip, 80, timeout=self.TIMEOUT,
-                               sleep=self._TIMEOUT_SLEEP):
+        if not probe.done():
+            # Avoid to show message if already booted
+            _get_logger().info("Waiting instance boot...")
+
+        try:
+            booted = probe.result()
+        except _CancelledError:
+            raise _exc.HostRuntimeException(gen_msg=('unable_to', "boot"))
+
+        if not booted:
+            self._boot_probe = None
             raise _exc.HostRuntimeException(gen_msg=('timeout', "boot"))
 
+    def _start_boot_probe(self):
+        """
+        Starts to probe host boot in background if not already started.
+
+        Returns:
+            concurrent.futures.Future or None: Future with True as result
+                once booted, or False on timeout. None if host can't be
+                probed yet (Unknown IP) or if host has no port to probe.
+        """
+        if self._boot_probe is None and self.ALLOW_PORTS:
+            try:
+                host_ip = self.host_ip
+            except _exc.HostException:
+                host_ip = None
+            if not host_ip:
+                return None
+
+            self._boot_probe = _Future()
+            self._boot_probe_deadline = [_time() + self.TIMEOUT]
+            thread = _Thread(target=self._probe_boot, args=(
+                self._boot_probe, host_ip, self._boot_probe_deadline,
+                self._PROBE_INTERVAL, self._TIMEOUT_SLEEP))
+            thread.daemon = True
+            thread.start()
+
+        return self._boot_probe
+
+    @staticmethod
+    def _probe_boot(future, host_ip, deadline, interval, max_interval):
+        """
+        Probes host until its webservice port is open.
+
+        Probes interval starts short and increases up to "max_interval".
+
+        Args:
+            future (concurrent.futures.Future): Future to set with result.
+                Probing is aborted if this future is cancelled.
+            host_ip (str): Host IP.
+            deadline (list of float): Single item list containing the
+                probing deadline time. Can be updated while probing.
+            interval (float): Initial interval in seconds between probes.
+            max_interval (float): Maximum interval in seconds between probes.
+        """
+        booted = _utl.check_port(host_ip, 80)
+        while not booted and not future.cancelled():
+            _sleep(interval)
+            interval = min(interval * 2.0, max_interval)
+            booted = _utl.check_port(host_ip, 80)
+            if _time() >= deadline[0]:
+                break
+
+        if future.set_running_or_notify_cancel():
+            future.set_result(booted)
+
     def stop(self, stop_mode=None):
         """
         Stop instance accordingly with the current stop_mode.
@@ -508,6 +1119,11 @@ class CSPHost(_Host):
                     "Instance '%s' is still running" % self.instance_id)
             return
 
+        # Aborts boot probing if any
+        if self._boot_probe is not None:
+            self._boot_probe.cancel()
+            self._boot_probe = None
+
         # Checks if instance to stop
         try:
             # Force instance update
@@ -558,6 +1174,9 @@ class CSPHost(_Host):
             # Augment exception
             self._add_help_to_exception_message(exception)
 
+            # Initialization resources may be invalid
+            self._clear_init_cache()
+
             # Force stop instance, ignore error if any
             try:
                 self._terminate_instance()
@@ -806,3 +1425,158 @@ class CSPHost(_Host):
             raise _exc.HostConfigurationException(
                 "Need at least 'client_id', 'instance_id' or 'host_ip' "
                 "argument. See documentation for more information.")
+
+
+class _InstancesPoller(object):
+    """
+    Polls instances of many hosts with batched requests.
+
+    Hosts waiting for their instance are woken up when the next request
+    completes. Requests are sent at most once per "interval" seconds, and are
+    retried with exponential backoff and jitter on failure.
+
+    Args:
+        interval (float): Minimum delay between requests in seconds.
+    """
+
+    # Pollers by provider, region and credentials
+    _POLLERS = {}
+    _POLLERS_LOCK = _Lock()
+
+    # Maximum number of retries on request failure
+    _RETRIES = 4
+
+    # Maximum delay between retries in seconds
+    _MAX_BACKOFF = 30.0
+
+    def __init__(self, interval):
+        self._interval = interval
+        self._lock = _Lock()
+        self._waiters = {}
+        self._polling = {}
+        self._running = False
+
+    @classmethod
+    def get(cls, host):
+        """
+        Returns poller of host provider, region and credentials.
+
+        Args:
+            host (apyfal.host._csp.CSPHost): Host.
+
+        Returns:
+            _InstancesPoller: Poller.
+        """
+        key = (host._host_type, host._region, host._client_id)
+        with cls._POLLERS_LOCK:
+            try:
+                return cls._POLLERS[key]
+            except KeyError:
+                poller = cls._POLLERS[key] = cls(host._TIMEOUT_SLEEP)
+                return poller
+
+    def get_instance(self, host):
+        """
+        Waits for the next request and returns instance of host.
+
+        Args:
+            host (apyfal.host._csp.CSPHost): Host.
+
+        Returns:
+            object: Instance. None if not found or if no request completed
+                before host timeout.
+        """
+        future = _Future()
+        with self._lock:
+            self._waiters.setdefault(
+                host._instance_id, (host, []))[1].append(future)
+
+            if not self._running:
+                self._running = True
+                thread = _Thread(target=self._run)
+                thread.daemon = True
+                thread.start()
+
+        try:
+            return future.result(timeout=host.TIMEOUT)
+        except _FutureTimeoutError:
+            return None
+
+    def _run(self):
+        """
+        Performs requests while hosts are waiting.
+
+        Only for use in thread.
+        """
+        try:
+            self._poll()
+
+        except BaseException as exception:
+            # Unexpected failure: Wakes up all waiting hosts, a new thread is
+            # started on next wait
+            with self._lock:
+                self._running = False
+                waiters = list(self._polling.values())
+                waiters += self._waiters.values()
+                self._waiters = dict()
+            for _, futures in waiters:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exception)
+
+    def _poll(self):
+        """
+        Performs requests until no host is waiting.
+        """
+        retries = 0
+        next_request = 0.0
+        while True:
+            delay = next_request - _time()
+            if delay > 0:
+                _sleep(delay)
+
+            with self._lock:
+                waiters = self._polling = self._waiters
+                self._waiters = dict()
+                if not waiters:
+                    self._running = False
+                    return
+
+            # Requests with any host, all share the same credentials
+            host = next(iter(waiters.values()))[0]
+            instances_ids = list(waiters)
+            batch_size = host._INSTANCES_BATCH_SIZE
+            next_request = _time() + self._interval
+            try:
+                instances = dict()
+                for index in range(0, len(instances_ids), batch_size):
+                    instances.update(host._get_instances(
+                        instances_ids[index:index + batch_size]))
+
+            except Exception as exception:
+                # Retries with backoff
+                if retries < self._RETRIES:
+                    retries += 1
+                    backoff = min(self._interval * 2 ** retries,
+                                  self._MAX_BACKOFF)
+                    next_request = _time() + _uniform(backoff / 2, backoff)
+                    _get_logger().debug(
+                        'Retrying instances status request: %s', exception)
+                    with self._lock:
+                        for instance_id, waiter in waiters.items():
+                            self._waiters.setdefault(
+                                instance_id, (waiter[0], []))[1].extend(
+                                waiter[1])
+                    continue
+
+                retries = 0
+                for _, futures in waiters.values():
+                    for future in futures:
+                        future.set_exception(exception)
+                continue
+
+            retries = 0
+            for instance_id, (_, futures) in waiters.items():
+                instance = instances.get(instance_id)
+                for future in futures:
+                    future.set_result(instance)
@@ -148,6 +148,17 @@ class AlibabaCSP(_CSPHost):
     _INFO_NAMES = _CSPHost._INFO_NAMES.copy()
     _INFO_NAMES.update(['_role', '_policy'])
 
+    _INIT_CACHE_ATTRIBUTES = _CSPHost._INIT_CACHE_ATTRIBUTES.copy()
+    _INIT_CACHE_ATTRIBUTES.update({
+        '_init_role': ('_role',),
+        '_init_policy': ('_policy',),
+        '_attach_role_policy': ('_policy', '_role')})
+
+    _INIT_ATTRIBUTES = _CSPHost._INIT_ATTRIBUTES + (
+        '_security_group_id', '_role', '_policy')
+
+    _INSTANCES_BATCH_SIZE = 100
+
     def __init__(self, role=None, policy=None, acs_client_kwargs=None,
                  acs_create_instance_kwargs=None, **kwargs):
         _CSPHost.__init__(self, **kwargs)
@@ -180,7 +191,7 @@ class AlibabaCSP(_CSPHost):
                       region_id=self._region)
         kwargs.update(self._acs_client_kwargs)
         try:
-            return _AcsClient(**kwargs)
+            return _utl.shared_client(_AcsClient, **kwargs)
         except _acs_exceptions.ClientException as exception:
             raise _exc.HostAuthenticationException(exc=exception)
 
@@ -365,8 +376,8 @@ class AlibabaCSP(_CSPHost):
             str: Status
         """
         try:
-            return self._get_instance()['Status']
-        except KeyError:
+            return self._instance['Status']
+        except (KeyError, TypeError):
             raise _exc.HostRuntimeException(
                 gen_msg=('no_instance_id', self._instance_id))
 
@@ -385,6 +396,23 @@ class AlibabaCSP(_CSPHost):
             raise _exc.HostRuntimeException(
                 gen_msg=('no_instance_id', self._instance_id))
 
+    def _get_instances(self, instances_ids):
+        """
+        Returns many instances with a single request.
+
+        Args:
+            instances_ids (list of str): Instances IDs.
+
+        Returns:
+            dict: Instances descriptions by instances IDs. Instances not found
+                are not returned.
+        """
+        response = self._request(
+            'DescribeInstances', InstanceIds=instances_ids,
+            PageSize=self._INSTANCES_BATCH_SIZE)
+        return {instance['InstanceId']: instance
+                for instance in response['Instances']['Instance']}
+
     def _init_key_pair(self):
         """
         Initializes key pair.
@@ -506,15 +534,16 @@ class AlibabaCSP(_CSPHost):
         futures = []
         with _ThreadPoolExecutor(max_workers=5) as executor:
             # Run configuration in parallel
-            policy = executor.submit(self._init_policy)
-            role = executor.submit(self._init_role)
-            for method in (self._init_key_pair, self._init_security_group):
-                futures.append(executor.submit(method))
+            policy = executor.submit(self._init_cached, '_init_policy')
+            role = executor.submit(self._init_cached, '_init_role')
+            for method in ('_init_key_pair', '_init_security_group'):
+                futures.append(executor.submit(self._init_cached, method))
 
             # Wait that role and policy are completed to attach them
             for future in _as_completed((policy, role)):
                 future.result()
-            futures.append(executor.submit(self._attach_role_policy))
+            futures.append(executor.submit(
+                self._init_cached, '_attach_role_policy'))
 
         # Wait completion
         for future in _as_completed(futures):
@@ -595,22 +624,35 @@ class AlibabaCSP(_CSPHost):
         Returns:
             generator of dict: dicts contains attributes values of the host.
         """
-        for instance in self._request(
-                'DescribeInstances', Status=self.STATUS_RUNNING)[
-                'Instances']['Instance']:
-
-            host_name = instance['InstanceName']
-
-            # Yields only matching accelerator instances
-            if self._is_accelerator_host(host_name):
-                yield dict(
-                    instance_id=instance['InstanceId'],
-                    instance_type=instance['InstanceType'],
-                    private_ip=instance[
-                        'VpcAttributes']['PrivateIpAddress']['IpAddress'][0],
-                    public_ip=instance['PublicIpAddress']['IpAddress'][0],
-                    host_name=host_name,
-                    security_group=instance[
-                        'SecurityGroupIds']['SecurityGroupId'][0],
-                    image_id=instance['ImageId'],
-                    key_pair=instance['KeyPairName'])
+        # Filters by name and pages are done by Alibaba
+        page = 1
+        while True:
+            response = self._request(
+                'DescribeInstances', Status=self.STATUS_RUNNING,
+                InstanceName=self._host_name_filter,
+                PageSize=self._ITER_HOSTS_PAGE_SIZE, PageNumber=page)
+            instances = response['Instances']['Instance']
+
+            for instance in instances:
+                host_name = instance['InstanceName']
+
+                # Yields only matching accelerator instances
+                if self._is_accelerator_host(host_name):
+                    yield dict(
+                        instance_id=instance['InstanceId'],
+                        instance_type=instance['InstanceType'],
+                        private_ip=instance['VpcAttributes'][
+                            'PrivateIpAddress']['IpAddress'][0],
+                        public_ip=instance['PublicIpAddress']['IpAddress'][0],
+                        host_name=host_name,
+                        security_group=instance[
+                            'SecurityGroupIds']['SecurityGroupId'][0],
+                        image_id=instance['ImageId'],
+                        key_pair=instance['KeyPairName'])
+
+            # Next page
+            if (not instances or
+                    page * self._ITER_HOSTS_PAGE_SIZE >= response.get(
+                        'TotalCount', 0)):
+                return
+            page += 1
@@ -108,6 +108,10 @@ class AWSHost(_CSPHost):
             to use. If not specified, create a new instance.
         use_private_ip (bool): If True, on new instances,
             uses private IP instead of public IP as default host IP.
+        warm_pool_size (int): Number of stopped instances to keep ready with
+            same configuration. If set, new hosts starts one of these
+            instances instead of creating a new one, and the pool is refilled
+            in background.
         role (str): AWS IAM role. Generated to allow instance to load AGFI
             (FPGA bitstream) and access to S3. Default to 'AccelizeRole'.
         policy (str): AWS IAM policy. Generated to allow instance to load AGFI
@@ -198,6 +202,26 @@ class AWSHost(_CSPHost):
     _INFO_NAMES = _CSPHost._INFO_NAMES.copy()
     _INFO_NAMES.update(['_role', '_policy'])
 
+    _WARM_POOL = True
+
+    _PROBE_ON_PROVISIONING = True
+
+    _ITER_HOSTS_PAGE_SIZE = 1000
+
+    _INIT_CACHE_ATTRIBUTES = _CSPHost._INIT_CACHE_ATTRIBUTES.copy()
+    _INIT_CACHE_ATTRIBUTES.update({
+        '_init_policy': ('_policy', '_policy_arn'),
+        '_init_role': ('_role',),
+        '_init_instance_profile': ('_instance_profile_name',),
+        '_attach_role_policy': ('_policy_arn', '_role'),
+        '_attach_instance_profile_role': ('_instance_profile_name', '_role')})
+
+    _INIT_ATTRIBUTES = _CSPHost._INIT_ATTRIBUTES + (
+        '_role', '_policy', '_policy_arn', '_instance_profile_name',
+        '_block_devices')
+
+    _INSTANCES_BATCH_SIZE = 100
+
     def __init__(self, role=None, policy=None,
                  delete_volumes_on_termination=None, spot_instance=None,
                  spot_block_duration=None,  boto3_session_kwargs=None,
@@ -244,7 +268,7 @@ class AWSHost(_CSPHost):
             aws_access_key_id=self._client_id,
             aws_secret_access_key=self._secret_id, region_name=self._region)
         kwargs.update(self._boto3_session_kwargs)
-        return _boto3.session.Session(**kwargs)
+        return _utl.shared_client(_boto3.session.Session, **kwargs)
 
     @property
     @_utl.memoizedmethod
@@ -255,7 +279,8 @@ class AWSHost(_CSPHost):
         Returns:
             boto3.session.Session.client: client
         """
-        return self._session.client('ec2', **self._boto3_client_kwargs)
+        return _utl.shared_client(
+            self._session.client, 'ec2', **self._boto3_client_kwargs)
 
     @property
     @_utl.memoizedmethod
@@ -266,7 +291,7 @@ class AWSHost(_CSPHost):
         Returns:
             boto3.session.Session.resource: resource
         """
-        return self._session.resource('ec2')
+        return _utl.new_client(self._session.resource, 'ec2')
 
     @property
     @_utl.memoizedmethod
@@ -277,7 +302,8 @@ class AWSHost(_CSPHost):
         Returns:
             boto3.session.Session.client: client
         """
-        return self._session.client('iam', **self._boto3_client_kwargs)
+        return _utl.shared_client(
+            self._session.client, 'iam', **self._boto3_client_kwargs)
 
     @property
     @_utl.memoizedmethod
@@ -288,7 +314,7 @@ class AWSHost(_CSPHost):
         Returns:
             boto3.session.Session.resource: resource
         """
-        return self._session.resource('iam')
+        return _utl.new_client(self._session.resource, 'iam')
 
     def _check_credential(self):
         """
@@ -534,6 +560,74 @@ class AWSHost(_CSPHost):
         with _exception_handler(gen_msg=('no_instance_id', self._instance_id)):
             return self._ec2_resource.Instance(self._instance_id)
 
+    def _get_instances(self, instances_ids):
+        """
+        Returns many instances with a single request.
+
+        Args:
+            instances_ids (list of str): Instances IDs.
+
+        Returns:
+            dict: Instances by instances IDs. Instances not found are not
+                returned.
+        """
+        # Called from the poller thread: Uses its own resource because
+        # boto3 resources are not thread safe
+        ec2_resource = _utl.new_client(self._session.resource, 'ec2')
+
+        # Filters don't fail on instances not found, "InstanceIds" does
+        with _exception_handler():
+            return {instance.id: instance for instance in
+                    ec2_resource.instances.filter(Filters=[{
+                        'Name': 'instance-id', 'Values': instances_ids}])}
+
+    def _iter_warm_instances(self, key):
+        """
+        Iterates over paused instances of the warm pool.
+
+        Args:
+            key (str): Warm pool key.
+
+        Returns:
+            generator of str: Instances IDs.
+        """
+        with _exception_handler():
+            for instance in self._ec2_resource.instances.filter(Filters=[
+                    {'Name': 'tag:%s' % self._WARM_POOL_TAG, 'Values': [key]},
+                    {'Name': 'instance-state-name',
+                     'Values': [self.STATUS_STOPPED]}]):
+                yield instance.id
+
+    def _start_warm_instance(self, instance_id):
+        """
+        Starts a paused instance of the warm pool.
+
+        EC2 instance states transitions are atomic: Only the request that
+        started the instance from the "stopped" state claims it.
+
+        Args:
+            instance_id (str): Instance ID.
+
+        Returns:
+            bool: True if instance started by this call.
+        """
+        with _exception_handler(filter_error_codes='IncorrectInstanceState'):
+            return self._ec2_client.start_instances(
+                InstanceIds=[instance_id])['StartingInstances'][0][
+                'PreviousState']['Name'] == self.STATUS_STOPPED
+        return False
+
+    def _unmark_warm_instance(self, instance_id):
+        """
+        Removes warm pool tag from an instance.
+
+        Args:
+            instance_id (str): Instance ID.
+        """
+        with _exception_handler():
+            self._ec2_client.delete_tags(
+                Resources=[instance_id], Tags=[{'Key': self._WARM_POOL_TAG}])
+
     def _get_public_ip(self):
         """
         Read current instance public IP from CSP instance.
@@ -580,20 +674,22 @@ class AWSHost(_CSPHost):
         futures = []
         with _ThreadPoolExecutor(max_workers=6) as executor:
             # Run configuration in parallel
-            policy = executor.submit(self._init_policy)
-            role = executor.submit(self._init_role)
-            instance_profile = executor.submit(self._init_instance_profile)
-            for method in (self._init_key_pair, self._init_security_group,
-                           self._init_block_device_mappings):
-                futures.append(executor.submit(method))
+            policy = executor.submit(self._init_cached, '_init_policy')
+            role = executor.submit(self._init_cached, '_init_role')
+            instance_profile = executor.submit(
+                self._init_cached, '_init_instance_profile')
+            for method in ('_init_key_pair', '_init_security_group',
+                           '_init_block_device_mappings'):
+                futures.append(executor.submit(self._init_cached, method))
 
             # Wait that role, instance_profile and policy are completed
             # to attach them
             for future in _as_completed((policy, instance_profile)):
                 role.result()
                 futures.append(executor.submit(
-                    self._attach_role_policy if future.result() == 'policy' else
-                    self._attach_instance_profile_role))
+                    self._init_cached,
+                    '_attach_role_policy' if future.result() == 'policy' else
+                    '_attach_instance_profile_role'))
 
         # Wait completion
         for future in _as_completed(futures):
@@ -607,6 +703,50 @@ class AWSHost(_CSPHost):
             object: Instance
             str: Instance ID
         """
+        instance = self._create_instances(1)[0]
+        return instance, instance.id
+
+    def _start_new_instances(self, hosts):
+        """
+        Start new instances of many identically configured hosts with a
+        single request.
+
+        Instances are then tagged with the name of their host.
+
+        Args:
+            hosts (list of AWSHost): Hosts, including this host.
+        """
+        # Hosts with different initialization scripts are started separately
+        user_data = self._user_data
+        if any(host._user_data != user_data for host in hosts[1:]):
+            return _CSPHost._start_new_instances(self, hosts)
+
+        for host, instance in zip(hosts, self._create_instances(len(hosts))):
+            host._instance = instance
+            host._instance_id = instance.id
+
+        # Names hosts, with one request by name
+        names = dict()
+        for host in hosts:
+            names.setdefault(host._get_host_name(), []).append(
+                host._instance_id)
+
+        with _exception_handler():
+            for name, instances_ids in names.items():
+                self._ec2_client.create_tags(
+                    Resources=instances_ids,
+                    Tags=[{'Key': 'Name', 'Value': name}])
+
+    def _create_instances(self, count):
+        """
+        Create many new instances with a single request.
+
+        Args:
+            count (int): Number of instances to create.
+
+        Returns:
+            list: Instances.
+        """
         kwargs = dict(
                 ImageId=self._image_id, InstanceType=self._instance_type,
                 KeyName=self._key_pair, SecurityGroups=[self._security_group],
@@ -617,7 +757,11 @@ class AWSHost(_CSPHost):
                      'Value': _utl.gen_msg('accelize_generated')},
                     {'Key': 'Name', 'Value': self._get_host_name()},
                     {'Key': 'Apyfal', 'Value': self._get_tag()}]}],
-                MinCount=1, MaxCount=1, UserData=self._user_data)
+                MinCount=count, MaxCount=count, UserData=self._user_data)
+
+        if self._warm_pool_member:
+            kwargs['TagSpecifications'][0]['Tags'].append(
+                {'Key': self._WARM_POOL_TAG, 'Value': self._warm_pool_member})
 
         if self._block_devices:
             kwargs['BlockDeviceMappings'] = self._block_devices
@@ -630,11 +774,9 @@ class AWSHost(_CSPHost):
 
         _utl.recursive_update(kwargs, self._boto3_create_instances_kwargs)
 
-        # Create instance
+        # Create instances
         with _exception_handler():
-            instance = self._ec2_resource.create_instances(**kwargs)[0]
-
-        return instance, instance.id
+            return self._ec2_resource.create_instances(**kwargs)
 
     def _start_existing_instance(self, status):
         """
@@ -689,10 +831,14 @@ class AWSHost(_CSPHost):
         Returns:
             generator of dict: dicts contains attributes values of the host.
         """
+        # Filters by name and pages are done by AWS
+        instances = self._ec2_resource.instances.filter(Filters=[
+            {'Name': 'instance-state-name', 'Values': ['running']},
+            {'Name': 'tag:Name', 'Values': [self._host_name_filter]}]
+        ).page_size(self._ITER_HOSTS_PAGE_SIZE)
+
         with _exception_handler():
-            for instance in self._ec2_resource.instances.filter(
-                    Filters=[{'Name': 'instance-state-name',
-                              'Values': ['running']}]):
+            for instance in instances:
                 host_name = [instance.tags[index]['Value']
                              for index in range(len(instance.tags))
                              if instance.tags[index]['Key'] == 'Name'][0]
@@ -139,6 +139,12 @@ class OpenStackHost(_CSPHost):
     _INIT_METHODS = list(_CSPHost._INIT_METHODS)
     _INIT_METHODS.append('_init_image')
 
+    _INIT_CACHE_ATTRIBUTES = _CSPHost._INIT_CACHE_ATTRIBUTES.copy()
+    _INIT_CACHE_ATTRIBUTES['_init_image'] = ('_image_id', '_image_name')
+
+    _INIT_ATTRIBUTES = _CSPHost._INIT_ATTRIBUTES + (
+        '_image_id', '_image_name', '_instance_type', '_instance_type_name')
+
     def __init__(self, project_id=None, auth_url=None,
                  nova_client_kwargs=None, nova_client_create_server_kwargs=None,
                  neutron_client_kwargs=None, **kwargs):
@@ -179,7 +185,7 @@ class OpenStackHost(_CSPHost):
             project_id=self._project_id, auth_url=self._auth_url,
             region_name=self._region)
         kwargs.update(self._nova_client_kwargs)
-        return _NovaClient(**kwargs)
+        return _utl.shared_client(_NovaClient, **kwargs)
 
     @property
     @_utl.memoizedmethod
@@ -193,7 +199,7 @@ class OpenStackHost(_CSPHost):
         kwargs = dict(session=self._nova_client.client.session,
                       region_name=self._region)
         kwargs.update(self._neutron_client_kwargs)
-        return _NeutronClient(**kwargs)
+        return _utl.shared_client(_NeutronClient, **kwargs)
 
     def _check_credential(self):
         """
@@ -439,9 +445,19 @@ class OpenStackHost(_CSPHost):
         Returns:
             generator of dict: dicts contains attributes values of the host.
         """
-        with _exception_handler():
-            for instance in self._nova_client.servers.list(
-                    search_opts={'status': self.STATUS_RUNNING}):
+        # Filters by name and pages are done by OpenStack, names are
+        # filtered using regular expressions
+        name = self._host_name_filter.rstrip('*')
+        name = name.lstrip('*') if name.startswith('*') else '^' + name
+        marker = None
+
+        while True:
+            with _exception_handler():
+                instances = self._nova_client.servers.list(
+                    search_opts={'status': self.STATUS_RUNNING, 'name': name},
+                    limit=self._ITER_HOSTS_PAGE_SIZE, marker=marker)
+
+            for instance in instances:
                 host_name = instance.name
 
                 # Yields only matching accelerator instances
@@ -457,3 +473,8 @@ class OpenStackHost(_CSPHost):
                         security_group=instance.security_groups[0]['name'],
                         image_id=instance.image['id'],
                         key_pair=instance.key_name)
+
+            # Next page
+            if len(instances) < self._ITER_HOSTS_PAGE_SIZE:
+                return
+            marker = instances[-1].id
@@ -12,8 +12,8 @@ Mount storage:
     on first call. It is possible to manually mount new storage
     with "mount" function.
 
-The Apyfal configuration file is used to automatically mount all known
-storage on start up.
+The Apyfal configuration file is used to automatically mount known
+storage on first use of their URL scheme.
 
 Storage URL format:
     All operations works with URL with format "scheme://path"
@@ -34,13 +34,42 @@ from concurrent.futures import (
     ThreadPoolExecutor as _ThreadPoolExecutor, as_completed as _as_completed)
 from contextlib import contextmanager as _contextmanager
 from copy import deepcopy as _deepcopy
+from fnmatch import fnmatch as _fnmatch
+from glob import glob as _glob, has_magic as _has_magic
+from io import (
+    open as _io_open, BufferedReader as _BufferedReader,
+    RawIOBase as _RawIOBase, TextIOWrapper as _TextIOWrapper)
+import os as _os
+import os.path as _os_path
+from re import compile as _compile
+from shutil import copyfileobj as _copyfileobj, copymode as _copymode
 from sys import version_info as _py
+from threading import Lock as _Lock
 
 import pycosio as _pycosio
 
+try:
+    from fcntl import ioctl as _ioctl
+except ImportError:
+    # Not available on this platform
+    pass
+
 import apyfal.configuration as _cfg
 import apyfal._utilities as _utl
 import apyfal.exceptions as _exc
+from apyfal.storage._checksum import is_identical as _is_identical_content
+
+# Default copy part size in MB
+_COPY_PART_SIZE = 8
+
+# Default number of parallel workers for operations on many files
+_WORKERS_COUNT = 8
+
+# Linux "FICLONE" ioctl request (Reflink)
+_FICLONE = 0x40049409
+
+# Byte range URL fragment
+_BYTE_RANGE = _compile(r'#bytes=([0-9]*)-([0-9]*)$')
 
 
 @_contextmanager
@@ -63,22 +92,485 @@ def open(url, mode="rb", encoding=None, errors=None, newline=None):
     Returns:
         file-like object: Opened object handle
     """
-    with _pycosio.open(url, mode=mode, encoding=encoding, errors=errors,
-                       newline=newline) as stream:
-        yield stream
-
-
-def copy(source, destination):
+    url, byte_range = split_range(url)
+    parse_url(url)
+
+    if byte_range is None:
+        with _pycosio.open(url, mode=mode, encoding=encoding, errors=errors,
+                           newline=newline) as stream:
+            yield stream
+        return
+
+    # Byte range: Reads only this range of file
+    if 'r' not in mode or '+' in mode:
+        raise _exc.StorageConfigurationException(
+            'Byte range is only supported in read mode.')
+
+    with _pycosio.open(url, 'rb') as stream:
+        stream = _RangeReader(stream, *byte_range)
+        if 'b' in mode:
+            yield stream
+        else:
+            yield _TextIOWrapper(_BufferedReader(stream), encoding=encoding,
+                                 errors=errors, newline=newline)
+
+
+def copy(source, destination, part_size=None, max_workers=None,
+         skip_identical=None):
     """
     Copy a file from source to destination.
 
+    If source and destination are on the same storage, the copy is done
+    server side. Else, source is read by ranges and destination is written by
+    parts using parallel workers.
+
+    If source URL has a byte range (See "split_range"), only this range is
+    read and copied.
+
     Args:
         source (path-like object or file-like object): Source URL.
             Can be apyfal.storage URL, paths, file-like object.
         destination (path-like object or file-like object): Destination URL.
             Can be apyfal.storage URL, paths, file-like object.
+        part_size (int): Size of parts in MB. Default to "copy_part_size"
+            value of "storage" configuration section, or 8MB.
+        max_workers (int): Maximum number of parallel workers by file.
+            Default to "copy_max_workers" value of "storage" configuration
+            section, or storage default.
+        skip_identical (bool): If True, does not copy if destination
+            already exists with identical content (Compared by size and
+            checksum or ETag). Default to "skip_identical" value of "storage"
+            configuration section, or False.
+    """
+    source, source_range = split_range(source)
+    source_scheme = parse_url(source)[0]
+    destination_scheme = parse_url(destination)[0]
+    section = _auto_mount.config['storage']
+
+    # Whole file copy
+    if source_range is None:
+
+        # Skips copy if destination content is identical
+        if skip_identical is None:
+            skip_identical = section.get_literal('skip_identical')
+        if (skip_identical and 'stream' not in (
+                source_scheme, destination_scheme) and
+                _is_identical(source, destination)):
+            _utl.get_logger().debug(
+                "Skipped copy of '%s' to identical '%s'", source, destination)
+            return
+
+        # Local files: Copy using kernel
+        if source_scheme == destination_scheme == 'file':
+            _copy_local(parse_url(source)[1], parse_url(destination)[1])
+            return
+
+        # Same storage: Copy without transfer data on client
+        if source_scheme == destination_scheme != 'stream':
+            _pycosio.copy(source, destination)
+            return
+
+    # Different storage: Copy by parts
+    part_size = int((part_size or section.get_literal('copy_part_size') or
+                     _COPY_PART_SIZE) * 2 ** 20)
+    max_workers = max_workers or section.get_literal('copy_max_workers')
+
+    with _open_part_stream(
+            source, 'rb', part_size, max_workers) as source_stream:
+        if source_range is not None:
+            source_stream = _RangeReader(source_stream, *source_range)
+
+        with _open_part_stream(destination, 'wb', part_size,
+                               max_workers) as destination_stream:
+            _copyfileobj(source_stream, destination_stream, part_size)
+
+
+@_contextmanager
+def _open_part_stream(url, mode, part_size, max_workers):
+    """
+    Open a copy source or destination.
+
+    Storage objects are read by ranges or written by parts using parallel
+    workers. Local files and file-like objects are used directly.
+
+    Args:
+        url (path-like object or file-like object): URL.
+        mode (str): "rb" or "wb".
+        part_size (int): Size of parts in bytes.
+        max_workers (int): Maximum number of parallel workers.
+
+    Returns:
+        file-like object: Opened object handle
+    """
+    scheme, path = parse_url(url)
+
+    # File-like object: Not closed after copy
+    if scheme == 'stream':
+        yield url
+
+    elif scheme == 'file':
+        with _io_open(path, mode) as stream:
+            yield stream
+
+    else:
+        with _pycosio.open(url, mode, buffer_size=part_size,
+                           max_workers=max_workers) as stream:
+            yield stream
+
+
+def copy_many(sources, destinations, max_workers=None):
     """
-    _pycosio.copy(source, destination)
+    Copy many files concurrently.
+
+    Args:
+        sources (str or iterable of path-like object): Source URLs.
+            Can be apyfal.storage URL or paths. If str, is a glob pattern
+            (See "glob").
+        destinations (str or iterable of path-like object): Destination URLs.
+            If str, is a directory URL ending with "/" or an URL containing
+            "{name}" that is replaced by sources file names.
+        max_workers (int): Maximum number of files copied in parallel.
+            Default to 8.
+
+    Returns:
+        list of str: Destination URLs.
+    """
+    if isinstance(sources, str):
+        sources = glob(sources)
+    else:
+        sources = [_utl.fsdecode(source) for source in sources]
+    destinations = _get_destinations(sources, destinations)
+
+    if not sources:
+        return destinations
+
+    def copy_file(source, destination):
+        """
+        Copy a file and ensures local destination directory exists.
+
+        Args:
+            source (str): Source URL.
+            destination (str): Destination URL.
+        """
+        scheme, path = parse_url(destination)
+        if scheme == 'file':
+            _utl.makedirs(_os_path.dirname(_os_path.abspath(path)),
+                          exist_ok=True)
+        copy(source, destination)
+
+    with _ThreadPoolExecutor(
+            max_workers=min(max_workers or _WORKERS_COUNT,
+                            len(sources))) as executor:
+        for future in _as_completed([
+                executor.submit(copy_file, source, destination)
+                for source, destination in zip(sources, destinations)]):
+            future.result()
+
+    return destinations
+
+
+def listdir(url):
+    """
+    Return names of entries in a directory.
+
+    On cloud storage, directory is an objects prefix.
+
+    Args:
+        url (path-like object): Directory URL.
+
+    Returns:
+        list of str: Entries names.
+    """
+    parse_url(url)
+    return _pycosio.listdir(url)
+
+
+def glob(pattern, max_workers=None):
+    """
+    Return URLs of files matching a pattern.
+
+    Pattern support "*", "?" and "[]" wildcards in any path component, for
+    instance: "s3://bucket/prefix/*.gz". Directories are listed concurrently.
+
+    Args:
+        pattern (path-like object): URL pattern.
+        max_workers (int): Maximum number of directories listed in parallel.
+            Default to 8.
+
+    Returns:
+        list of str: Sorted URLs.
+    """
+    pattern = _utl.fsdecode(pattern)
+    scheme, path = parse_url(pattern, host=False)
+
+    # Local files
+    if scheme == 'file':
+        return sorted(_glob(path))
+
+    # Host files can't be listed from client
+    elif scheme == 'host' and _has_magic(pattern):
+        raise _exc.StorageConfigurationException(
+            "Host files can't be listed: %s" % pattern)
+
+    # Other storage: Lists directories matching each path component
+    parts = pattern.split('/')
+    index = 0
+    for index, part in enumerate(parts):
+        if _has_magic(part):
+            break
+    else:
+        return [pattern]
+
+    urls = ['/'.join(parts[:index])]
+    parts = parts[index:]
+    with _ThreadPoolExecutor(
+            max_workers=max_workers or _WORKERS_COUNT) as executor:
+        for index, part in enumerate(parts):
+            is_last = index == len(parts) - 1
+
+            # Not a wildcard
+            if not _has_magic(part):
+                urls = ['%s/%s' % (url, part) for url in urls]
+                continue
+
+            urls = [url for matches in executor.map(
+                lambda url: _scandir_match(url, part, not is_last), urls)
+                for url in matches]
+
+    return sorted(urls)
+
+
+def _scandir_match(url, pattern, directories):
+    """
+    Return entries of a directory matching a pattern.
+
+    Args:
+        url (str): Directory URL.
+        pattern (str): Entries names pattern.
+        directories (bool): If True, returns directories, else return files.
+
+    Returns:
+        list of str: URLs.
+    """
+    return ['%s/%s' % (url, entry.name.rstrip('/'))
+            for entry in _pycosio.scandir(url + '/')
+            if entry.is_dir() == directories and
+            _fnmatch(entry.name.rstrip('/'), pattern)]
+
+
+def _copy_local(source, destination):
+    """
+    Copy a local file like "shutil.copy": If destination is a directory, the
+    file is copied in it and permission bits are copied.
+
+    Uses, in this order and if supported by platform and file system:
+    reflink (copy-on-write clone), "os.copy_file_range", "os.sendfile".
+    Falls back to buffered copy.
+
+    Args:
+        source (str): Source path.
+        destination (str): Destination path.
+    """
+    if _os_path.isdir(destination):
+        destination = _os_path.join(destination, _os_path.basename(source))
+
+    with _io_open(source, 'rb') as source_file:
+        with _io_open(destination, 'wb') as destination_file:
+            _copy_file_content(source_file, destination_file)
+
+    _copymode(source, destination)
+
+
+def _copy_file_content(source_file, destination_file):
+    """
+    Copy content of a local file to another one.
+
+    Args:
+        source_file (io.FileIO): Source file.
+        destination_file (io.FileIO): Destination file.
+    """
+    source_fd = source_file.fileno()
+    destination_fd = destination_file.fileno()
+
+    # Reflink: Shares data blocks until modified
+    try:
+        _ioctl(destination_fd, _FICLONE, source_fd)
+        return
+    except (NameError, IOError, OSError):
+        pass
+
+    # Copy in kernel space
+    size = _os.fstat(source_fd).st_size
+    for kernel_copy in (_copy_file_range, _sendfile):
+        try:
+            kernel_copy(source_fd, destination_fd, size)
+            return
+        except (AttributeError, IOError, OSError):
+            # Not supported: Restarts from beginning
+            source_file.seek(0)
+            destination_file.seek(0)
+            destination_file.truncate()
+
+    # Copy in user space
+    _copyfileobj(source_file, destination_file, 2 ** 20)
+
+
+def _copy_file_range(source_fd, destination_fd, size):
+    """
+    Copy file content with "os.copy_file_range".
+
+    Args:
+        source_fd (int): Source file descriptor.
+        destination_fd (int): Destination file descriptor.
+        size (int): Size to copy.
+    """
+    copy_file_range = _os.copy_file_range
+    while size > 0:
+        copied = copy_file_range(source_fd, destination_fd, size)
+        if not copied:
+            break
+        size -= copied
+
+
+def _sendfile(source_fd, destination_fd, size):
+    """
+    Copy file content with "os.sendfile".
+
+    Args:
+        source_fd (int): Source file descriptor.
+        destination_fd (int): Destination file descriptor.
+        size (int): Size to copy.
+    """
+    sendfile = _os.sendfile
+    offset = 0
+    while offset < size:
+        sent = sendfile(destination_fd, source_fd, offset, size - offset)
+        if not sent:
+            break
+        offset += sent
+
+
+def _is_identical(source, destination):
+    """
+    Checks if source and destination have identical content.
+
+    Args:
+        source (path-like object): Source URL.
+        destination (path-like object): Destination URL.
+
+    Returns:
+        bool: True if identical.
+    """
+    try:
+        destination_stat = stat(destination)
+    except (IOError, OSError):
+        # Destination does not exist
+        return False
+
+    source = _utl.fsdecode(source)
+    destination = _utl.fsdecode(destination)
+    try:
+        return _is_identical_content(
+            source, destination, stat(source), destination_stat)
+    except (IOError, OSError):
+        return False
+
+
+def _get_destinations(sources, destinations):
+    """
+    Return destinations URLs.
+
+    Args:
+        sources (list of str): Sources URLs.
+        destinations (str or iterable of path-like object): Destination URLs.
+            If str, is a directory URL ending with "/" or an URL containing
+            "{name}" that is replaced by sources file names.
+
+    Returns:
+        list of str: Destinations URLs.
+    """
+    if not isinstance(destinations, str):
+        destinations = [_utl.fsdecode(destination)
+                        for destination in destinations]
+        if len(destinations) != len(sources):
+            raise _exc.StorageConfigurationException(
+                'Sources and destinations must contain the same count of'
+                ' files.')
+        return destinations
+
+    if destinations.endswith('/'):
+        destinations += '{name}'
+    elif '{name}' not in destinations:
+        raise _exc.StorageConfigurationException(
+            'Destination must be a directory ending with "/" or contain'
+            ' "{name}".')
+
+    return [destinations.replace(
+        '{name}', _utl.fsdecode(source).rstrip('/').rsplit('/', 1)[-1])
+        for source in sources]
+
+
+def remove(url):
+    """
+    Remove a file.
+
+    Args:
+        url (path-like object): URL of file to remove.
+    """
+    parse_url(url)
+    _pycosio.remove(url)
+
+
+def stat(url):
+    """
+    Get the status of a file.
+
+    With cloud storage, result also contains object specific headers as
+    "st_"-prefixed attributes (For instance "st_etag").
+
+    Args:
+        url (path-like object): URL of file.
+
+    Byte range in URL is ignored, the whole file status is returned.
+
+    Returns:
+        os.stat_result: Stat result object.
+    """
+    url = split_range(url)[0]
+    parse_url(url)
+    return _pycosio.stat(url)
+
+
+def split_range(url):
+    """
+    Split byte range from URL.
+
+    A byte range is specified with a "#bytes=start-end" fragment at the end
+    of URL. Like with HTTP "Range" header, "start" and "end" are positions of
+    first and last bytes (Included). "start" or "end" can be omitted to read
+    from beginning or until end of file.
+
+    For instance: "s3://bucket/key#bytes=0-1048575".
+
+    Args:
+        url (path-like object or file-like object): URL.
+
+    Returns:
+        tuple: URL without byte range, byte range as (start, end) tuple
+            with "end" excluded and None if until end of file, or None if URL
+            has no byte range.
+    """
+    if hasattr(url, 'read'):
+        return url, None
+
+    decoded_url = _utl.fsdecode(url)
+    match = _BYTE_RANGE.search(decoded_url)
+    if match is None:
+        return url, None
+
+    start, end = match.groups()
+    return decoded_url[:match.start()], (
+        int(start or 0), int(end) + 1 if end else None)
 
 
 def mount(storage_type, **kwargs):
@@ -89,7 +581,11 @@ def mount(storage_type, **kwargs):
         kwargs: Storage keywords argument
             (see targeted storage class for more information)
     """
-    _Storage(storage_type=storage_type, **kwargs).mount()
+    storage = _Storage(storage_type=storage_type, **kwargs)
+    storage.mount()
+
+    # Manually mounted storage overrides storage from configuration
+    _auto_mount.discard(storage.STORAGE_NAME)
 
 
 def parse_url(url, host=True):
@@ -97,6 +593,9 @@ def parse_url(url, host=True):
 
     If URL has no scheme, "file" scheme is inferred.
 
+    Storage defined in configuration and related to URL are mounted on first
+    call.
+
     If URL is a file-like object, returns "stream" as storage_type.
 
     Args:
@@ -125,10 +624,106 @@ def parse_url(url, host=True):
     if scheme == 'host':
         return 'file' if host else scheme, path
 
+    # Mounts related storage if not already mounted
+    _auto_mount(scheme)
+
     # Returns result
     return scheme, path
 
 
+class _RangeReader(_RawIOBase):
+    """
+    Read-only binary file object limited to a byte range of another file
+    object.
+
+    Only the range is read from the underlying file object: With cloud
+    storage, ranged requests are used.
+
+    Args:
+        file (file-like object): Seekable binary file object.
+        start (int): Position of range first byte.
+        end (int): Position of range end (Excluded). If None, until end of
+            file.
+    """
+
+    def __init__(self, file, start, end=None):
+        _RawIOBase.__init__(self)
+        self._file = file
+        if end is None:
+            file.seek(0, 2)
+            end = file.tell()
+        self._start = start
+        self._size = max(end - start, 0)
+        self._position = 0
+        file.seek(start)
+
+    def readable(self):
+        """
+        Return True if the stream can be read from.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def seekable(self):
+        """
+        Return True if the stream supports random access.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def tell(self):
+        """
+        Return the current stream position in the range.
+
+        Returns:
+            int: Position.
+        """
+        return self._position
+
+    def seek(self, offset, whence=0):
+        """
+        Change the stream position in the range.
+
+        Args:
+            offset (int): Offset relative to position indicated by whence.
+            whence (int): 0 for range start, 1 for current position, 2 for
+                range end.
+
+        Returns:
+            int: New position.
+        """
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self._size
+        self._position = min(max(offset, 0), self._size)
+        self._file.seek(self._start + self._position)
+        return self._position
+
+    def readinto(self, b):
+        """
+        Read bytes into a pre-allocated, writable bytes-like object.
+
+        Args:
+            b (bytes-like object): Buffer.
+
+        Returns:
+            int: Number of bytes read.
+        """
+        size = min(len(b), self._size - self._position)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        read = len(data)
+        b[:read] = data
+        self._position += read
+        return read
+
+
 class _Storage(object):
     # Python 2: requires new style class (inherit fro object) to use __new__
     """Base storage class
@@ -234,48 +829,133 @@ class _Storage(object):
             storage_parameters=storage_parameters, unsecure=self._unsecure)
 
 
-# Automatically mounts known storage from configuration
-def _auto_mount():
-    """mounts from configuration"""
-    # Get configuration
-    config = _cfg.Configuration()
-
-    # Finds possibles storage
-    to_mount = set()
-    name = config['host']['host_type']
-    if name:
-        to_mount.add(name)
-    for section in config:
-        if section.startswith('host.') or section.startswith('storage.'):
-            name = section.split('.', 1)[1]
-            if name:
-                to_mount.add(name)
-
-    if to_mount:
-        # Tries to mount storage
-        if _py[0] == 2:
-            # On Python 2: Seem to have a deadlock on import if use of
-            # ThreadPoolExecutor
-            for storage_type in to_mount:
-                try:
-                    mount(storage_type=storage_type, config=config)
-                except (ImportError, _exc.AcceleratorException):
-                    continue
-            return
+class _AutoMount(object):
+    """
+    Mounts storage defined in configuration on first use of their scheme.
+
+    Configuration is read only once, on first call.
+
+    Args:
+        config (apyfal.configuration.Configuration, path-like object or file-like object):
+            If not set, will search it in current working directory, in current
+            user "home" folder. If none found, will use default configuration
+            values.
+    """
+
+    def __init__(self, config=None):
+        self._config = config
+        self._to_mount = None
+        self._lock = _Lock()
+
+    @property
+    def config(self):
+        """
+        Configuration.
+
+        Returns:
+            apyfal.configuration.Configuration: Configuration
+        """
+        # Not a Configuration instance: Reads it
+        if not isinstance(self._config, _cfg.Configuration):
+            self._config = _cfg.create_configuration(self._config)
+        return self._config
 
-        futures = []
-        with _ThreadPoolExecutor(max_workers=len(to_mount)) as executor:
-            for storage_type in to_mount:
-                try:
-                    storage = _Storage(storage_type=storage_type, config=config)
-                except (ImportError, _exc.AcceleratorException):
-                    continue
-                futures.append(executor.submit(storage.mount))
+    def __call__(self, scheme):
+        """
+        Mounts storage related to scheme if not already mounted.
 
-            # Waits completion
-            for future in _as_completed(futures):
-                future.result()
+        Args:
+            scheme (str): URL scheme.
+        """
+        # Nothing to mount or local file
+        if self._to_mount == dict() or scheme in _LOCAL_SCHEMES:
+            return
 
+        with self._lock:
+            if self._to_mount is None:
+                self._to_mount = self._from_configuration()
+
+            # HTTP URL may target any storage
+            if scheme in ('http', 'https'):
+                storage_types = list(self._to_mount)
+            else:
+                storage_types = [
+                    storage_type for storage_type, storage in
+                    self._to_mount.items() if scheme in (
+                        storage_type, storage.STORAGE_NAME.lower(),
+                        (storage.EXTRA_ROOT or '').split('://', 1)[0].lower())]
+
+            if not storage_types:
+                return
+
+            # Mounts storage
+            if len(storage_types) == 1 or _py[0] == 2:
+                # On Python 2: Seem to have a deadlock if use of
+                # ThreadPoolExecutor while importing
+                for storage_type in storage_types:
+                    self._to_mount[storage_type].mount()
+                    del self._to_mount[storage_type]
+                return
+
+            with _ThreadPoolExecutor(
+                    max_workers=len(storage_types)) as executor:
+                futures = {executor.submit(
+                    self._to_mount[storage_type].mount): storage_type
+                    for storage_type in storage_types}
+
+                # Waits completion
+                for future in _as_completed(futures):
+                    future.result()
+                    del self._to_mount[futures[future]]
+
+    def discard(self, storage_name):
+        """
+        Cancels automatic mount of a storage.
 
-_auto_mount()
-del _auto_mount
+        Args:
+            storage_name (str): Storage name.
+        """
+        with self._lock:
+            if not self._to_mount:
+                return
+            for storage_type, storage in list(self._to_mount.items()):
+                if storage.STORAGE_NAME == storage_name:
+                    del self._to_mount[storage_type]
+
+    def _from_configuration(self):
+        """
+        Finds storage to mount from configuration.
+
+        Returns:
+            dict: storage_type: _Storage instance.
+        """
+        # Get configuration
+        config = self.config
+
+        # Finds possibles storage
+        to_mount = set()
+        name = config['host']['host_type']
+        if name:
+            to_mount.add(name)
+        for section in config:
+            if section.startswith('host.') or section.startswith('storage.'):
+                name = section.split('.', 1)[1]
+                if name:
+                    to_mount.add(name)
+
+        # Instantiates storage without mounting them
+        storage = dict()
+        for storage_type in to_mount:
+            try:
+                storage[storage_type.lower()] = _Storage(
+                    storage_type=storage_type, config=config)
+            except (ImportError, _exc.AcceleratorException):
+                continue
+        return storage
+
+
+# Schemes not related to a storage to mount
+_LOCAL_SCHEMES = ('file', 'host', 'stream')
+
+# Automatically mounts known storage from configuration on first use
+_auto_mount = _AutoMount()
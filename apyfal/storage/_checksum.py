@@ -0,0 +1,219 @@
+# coding=utf-8
+"""Files content comparison
+
+Local files MD5 checksums are cached in an index file to avoid computing them
+again while files are not modified. New checksums are appended to the index
+file that is rewritten only when compacted. The index file is locked between
+processes while written.
+"""
+from hashlib import md5 as _md5
+import json as _json
+from os import stat as _stat
+import os.path as _os_path
+from re import compile as _compile
+from threading import Lock as _Lock
+
+import apyfal.configuration as _cfg
+import apyfal._utilities as _utl
+
+# Local files checksums index: path: [size, modification time, MD5]
+_INDEX = {}
+_INDEX_LOCK = _Lock()
+_INDEX_LOADED = []
+
+# Number of lines in index file: One JSON entry
+# "[path, size, modification time, MD5]" by line
+_INDEX_LINES = [0]
+
+# Maximum number of entries in index
+_INDEX_SIZE = 10000
+
+# Read buffer size
+_BUFFER_SIZE = 1048576
+
+# ETag that is a MD5 checksum (Not multipart ETag)
+_MD5_ETAG = _compile(r'^[0-9a-f]{32}$')
+
+
+def is_identical(source, destination, source_stat, destination_stat):
+    """
+    Checks if source and destination have identical content.
+
+    Contents are compared using size, then MD5 checksum (Computed for local
+    files, from ETag for cloud objects), or ETag for objects on same storage.
+
+    Args:
+        source (str): Source URL.
+        destination (str): Destination URL.
+        source_stat (os.stat_result): Source stat result.
+        destination_stat (os.stat_result): Destination stat result.
+
+    Returns:
+        bool: True if identical, False if different or can't be compared.
+    """
+    if source_stat.st_size != destination_stat.st_size:
+        return False
+
+    source_checksum = _get_checksum(source, source_stat)
+    return source_checksum is not None and (
+        source_checksum == _get_checksum(destination, destination_stat))
+
+
+def _get_checksum(url, stat):
+    """
+    Returns file checksum.
+
+    Args:
+        url (str): URL.
+        stat (os.stat_result): Stat result.
+
+    Returns:
+        tuple or None: Checksum, None if not available.
+    """
+    # Needs to lazy import to avoid importing issues
+    from apyfal.storage import parse_url
+
+    scheme, path = parse_url(url, host=False)
+
+    # Local file
+    if scheme == 'file':
+        return 'md5', _local_md5(_os_path.abspath(path), stat)
+
+    # Cloud object
+    etag = getattr(stat, 'st_etag', None)
+    if etag is None:
+        return None
+    etag = etag.strip('"').lower()
+    if _MD5_ETAG.match(etag):
+        return 'md5', etag
+    return 'etag', url.split('://', 1)[0], etag
+
+
+def local_md5(path):
+    """
+    Returns MD5 checksum of a local file.
+
+    The checksum is cached while the file is not modified.
+
+    Args:
+        path (str): Path.
+
+    Returns:
+        str: MD5 checksum.
+    """
+    path = _os_path.abspath(path)
+    return _local_md5(path, _stat(path))
+
+
+def _local_md5(path, stat):
+    """
+    Returns MD5 checksum of a local file.
+
+    Args:
+        path (str): Absolute path.
+        stat (os.stat_result): Stat result.
+
+    Returns:
+        str: MD5 checksum.
+    """
+    signature = [stat.st_size, stat.st_mtime]
+    with _INDEX_LOCK:
+        if not _INDEX_LOADED:
+            _INDEX.update(_read_index())
+            _INDEX_LOADED.append(True)
+        try:
+            size, mtime, checksum = _INDEX[path]
+            if [size, mtime] == signature:
+                return checksum
+        except (KeyError, ValueError):
+            pass
+
+    checksum = _md5()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_BUFFER_SIZE), b''):
+            checksum.update(chunk)
+    checksum = checksum.hexdigest()
+
+    with _INDEX_LOCK:
+        cleared = len(_INDEX) >= _INDEX_SIZE
+        if cleared:
+            _INDEX.clear()
+        _INDEX[path] = entry = signature + [checksum]
+
+        # Rewrites index file if cleared or if it contains too many outdated
+        # entries, else appends entry
+        if cleared or _INDEX_LINES[0] >= 2 * _INDEX_SIZE:
+            _write_index(_INDEX)
+        else:
+            _append_index(path, entry)
+    return checksum
+
+
+def _read_index():
+    """
+    Reads index file.
+
+    Returns:
+        dict: Index.
+    """
+    index = dict()
+    _INDEX_LINES[0] = 0
+    try:
+        with open(_cfg.CHECKSUMS_INDEX, 'rt') as file:
+            for line in file:
+                _INDEX_LINES[0] += 1
+                try:
+                    path, size, mtime, checksum = _json.loads(line)
+                except (TypeError, ValueError):
+                    # Partially written line
+                    continue
+                index[path] = [size, mtime, checksum]
+    except (IOError, OSError):
+        pass
+    return index
+
+
+def _append_index(path, entry):
+    """
+    Appends an entry to index file.
+
+    Args:
+        path (str): Absolute path.
+        entry (list): Index entry.
+    """
+    try:
+        _utl.makedirs(_os_path.dirname(_cfg.CHECKSUMS_INDEX), exist_ok=True)
+        with _utl.file_lock(_cfg.CHECKSUMS_INDEX):
+            with open(_cfg.CHECKSUMS_INDEX, 'at') as file:
+                file.write(_json.dumps([path] + entry) + '\n')
+    except (IOError, OSError):
+        return
+    _INDEX_LINES[0] += 1
+
+
+def _write_index(index):
+    """
+    Writes index file.
+
+    Entries appended by other processes since the index was loaded are
+    merged before writing, if the index is not full.
+
+    Args:
+        index (dict): Index. Updated with merged entries.
+    """
+    try:
+        _utl.makedirs(_os_path.dirname(_cfg.CHECKSUMS_INDEX), exist_ok=True)
+        with _utl.file_lock(_cfg.CHECKSUMS_INDEX):
+            merged = _read_index()
+            merged.update(index)
+            if len(merged) <= _INDEX_SIZE:
+                index.update(merged)
+
+            # Replaces the file to not expose a partially written index
+            with _utl.atomic_write(_cfg.CHECKSUMS_INDEX) as file:
+                file.write(''.join(
+                    _json.dumps([path] + entry) + '\n'
+                    for path, entry in index.items()))
+    except (IOError, OSError):
+        return
+    _INDEX_LINES[0] = len(index)
@@ -104,9 +104,144 @@ def test_acceleratorclient_get_parameters(tmpdir):
     assert client.function(key0=0, key1=1) == excepted_parameters
 
 
+def test_acceleratorclient_get_process_parameters(tmpdir):
+    """Tests AcceleratorClient._get_process_parameters"""
+    from threading import Lock
+    from apyfal.client import AcceleratorClient
+
+    # Mocks Client
+    get_parameters_count = []
+
+    class DummyClient(AcceleratorClient):
+        """Dummy Client"""
+
+        def __init__(self, *_, **__):
+            """Do nothing"""
+            self._stopped = False
+            self._cache = {}
+            self._parameters_templates_lock = Lock()
+            self._process_parameters = {'app': {'specific': {}, 'key0': 0}}
+
+        def __del__(self):
+            """Do nothing"""
+
+        def _start(self, *_):
+            """Do nothing"""
+
+        def _process(self, *_):
+            """Do nothing"""
+
+        def _stop(self, *_):
+            """Do nothing"""
+
+        @staticmethod
+        def _get_parameters(*args, **kwargs):
+            """Counts calls"""
+            get_parameters_count.append(1)
+            return AcceleratorClient._get_parameters(*args, **kwargs)
+
+    client = DummyClient()
+
+    # Test: Same result as "_get_parameters", merged only once
+    expected = {'app': {'specific': {'key1': 1}, 'key0': 0}}
+    assert client._get_process_parameters({'key1': 1}) == expected
+    result = client._get_process_parameters({'key1': 1})
+    assert result == expected
+    assert len(get_parameters_count) == 1
+
+    # Test: Returns independent copies
+    result['app']['specific']['key1'] = 2
+    assert client._get_process_parameters({'key1': 1}) == expected
+
+    # Test: JSON file read only once, except if file changed
+    json_file = tmpdir.join('parameters.json')
+    json_file.write(json.dumps({'app': {'key0': 1}}))
+    del get_parameters_count[:]
+    for _ in range(2):
+        assert client._get_process_parameters(
+            {'parameters': str(json_file)})['app']['key0'] == 1
+    assert len(get_parameters_count) == 1
+
+    json_file.write(json.dumps({'app': {'key0': 10}}))
+    json_file.setmtime(json_file.mtime() + 10)
+    assert client._get_process_parameters(
+        {'parameters': str(json_file)})['app']['key0'] == 10
+
+    # Test: Storage JSON file revalidated with its ETag
+    from collections import namedtuple
+    import apyfal.storage as srg
+    srg_stat = srg.stat
+    etag = ['etag1']
+
+    def stat(url):
+        """Mocked stat"""
+        stat_result = srg_stat(url.split('://', 1)[1])
+        return namedtuple('Stat', 'st_size, st_etag')(
+            stat_result.st_size, etag[0])
+
+    srg.stat = stat
+    try:
+        url = 'file2://%s' % json_file
+        assert client._parameters_template_key(
+            {'parameters': url}).endswith('etag1')
+
+        # Test: ETag checked again only after its TTL
+        etag[0] = 'etag2'
+        assert client._parameters_template_key(
+            {'parameters': url}).endswith('etag1')
+        client._PARAMETERS_ETAG_TTL = 0.0
+        assert client._parameters_template_key(
+            {'parameters': url}).endswith('etag2')
+
+        # Test: Not cached without ETag
+        etag[0] = None
+        with pytest.raises(ValueError):
+            client._parameters_template_key({'parameters': url})
+    finally:
+        srg.stat = srg_stat
+
+    # Test: Types of parameters are kept, and not mixed in cache
+    for specific in ({'key1': (1, 2), 'key2': {1: 'a'}},
+                     {'key1': [1, 2], 'key2': {'1': 'a'}},
+                     {'key1': (1, 2), 'key2': {1: 'a'}}):
+        result = client._get_process_parameters(dict(specific))
+        assert result['app']['specific'] == specific
+        assert type(result['app']['specific']['key1']) is type(
+            specific['key1'])
+        assert list(result['app']['specific']['key2']) == list(
+            specific['key2'])
+
+    # Test: Not cached if result changed by JSON
+    del get_parameters_count[:]
+    client._process_parameters['app']['key0'] = (0,)
+    for _ in range(2):
+        assert client._get_process_parameters(
+            {'key1': 'tuple'})['app']['key0'] == (0,)
+    assert len(get_parameters_count) == 2
+    client._process_parameters['app']['key0'] = 0
+
+    # Test: Not serializable parameters are not cached
+    del get_parameters_count[:]
+    for _ in range(2):
+        assert client._get_process_parameters(
+            {'key1': object})['app']['specific']['key1'] is object
+    assert len(get_parameters_count) == 2
+
+    # Test: Cache size is limited, oldest entry evicted
+    client._cache.clear()
+    for index in range(client._PARAMETERS_TEMPLATES_SIZE + 1):
+        client._get_process_parameters({'key1': index})
+    templates = client._cache['parameters_templates']
+    assert len(templates) == client._PARAMETERS_TEMPLATES_SIZE
+    assert json.dumps({'key1': 0}, sort_keys=True) not in templates
+    assert json.dumps({'key1': 1}, sort_keys=True) in templates
+
+
 def test_data_file(tmpdir):
     """Tests AcceleratorClient._data_file"""
     from apyfal.client import AcceleratorClient
+    from apyfal.client._tmp_space import TmpSpace
+    from apyfal.configuration import ACCELERATOR_TMP_ROOT
     from apyfal.exceptions import (
         ClientConfigurationException, ClientSecurityException)
 
@@ -132,6 +267,7 @@ def test_data_file(tmpdir):
             """Do nothing"""
             self._stopped = False
             self._cache = {'tmp_dir': str(tmpdir)}
+            self._tmp_space = TmpSpace(ACCELERATOR_TMP_ROOT)
             self._authorized_host_dirs = [str(authorized_dir)]
 
         def __del__(self):
@@ -182,6 +318,40 @@ def test_data_file(tmpdir):
         assert file.read() == content
     client._PARAMETER_IO_FORMAT[parameter_name] = 'file'
 
+    # Test: Input file with byte range
+    range_path = src_path + '#bytes=2-6'
+    with client._data_file(
+            range_path, parameters, parameter_name, 'rb') as path:
+        assert path != src_path
+        with open(path, 'rb') as file:
+            assert file.read() == content[2:7]
+
+    # Test: Input stream with byte range
+    client._PARAMETER_IO_FORMAT[parameter_name] = 'stream'
+    with client._data_file(
+            range_path, parameters, parameter_name, 'rb') as file:
+        assert file.read() == content[2:7]
+    client._PARAMETER_IO_FORMAT[parameter_name] = 'file'
+
+    # Test: Output with byte range
+    with pytest.raises(ClientConfigurationException):
+        with client._data_file(
+                dst_path + '#bytes=2-6', parameters, parameter_name, 'wb'):
+            pass
+
+    # Test: Byte range from "src_range" parameter
+    range_parameters = {'app': {'specific': {'src_range': [2, 6]}}}
+    assert client._get_src_range(
+        src_path, range_parameters) == range_path
+    assert not range_parameters['app']['specific']
+    assert client._get_src_range(src_path, range_parameters) == src_path
+    range_parameters['app']['specific']['src_range'] = (None, 6)
+    assert client._get_src_range(
+        range_path, range_parameters) == src_path + '#bytes=-6'
+    range_parameters['app']['specific']['src_range'] = (2, 6)
+    with pytest.raises(ClientConfigurationException):
+        client._get_src_range(None, range_parameters)
+
     # Test: Input stream
     with open(src_path, 'rb') as file:
         with client._data_file(file, parameters, parameter_name, 'rb') as path:
@@ -246,6 +416,23 @@ def test_data_file(tmpdir):
             None, parameters, parameter_name, 'rb') as path:
         assert path is None
 
+    # Prefetch: Only inputs fetched by client as file
+    client.REMOTE = False
+    client._PARAMETER_IO_FORMAT = {'src': 'file'}
+    assert client._prefetch(None) is None
+    assert client._prefetch(src_path) is None
+    assert client._prefetch(src_path + '#bytes=2-6') is not None
+    with open(src_path, 'rb') as file:
+        assert client._prefetch(file) is None
+    assert client._prefetch('dummy://src') is not None
+
+    client._PARAMETER_IO_FORMAT = {'src': 'stream'}
+    assert client._prefetch('dummy://src') is None
+
+    client._PARAMETER_IO_FORMAT = {'src': 'file'}
+    client.REMOTE = True
+    assert client._prefetch('dummy://src') is None
+
 
 def test_tmp_dir():
     """Tests AcceleratorClient._tmp_dir"""
@@ -85,6 +85,48 @@ def test_restclient_url():
     assert accelerator._url == url
 
 
+def test_restclient_preconnect():
+    """Tests RESTClient._preconnect"""
+    from threading import Event
+    from apyfal.client.rest import RESTClient
+
+    url = 'http://127.0.0.1'
+    requested = Event()
+    raises = []
+
+    # Mocks requests session
+    class Session(requests.Session):
+        """Fake requests.Session"""
+
+        @staticmethod
+        def head(request_url, **_):
+            """Checks input arguments and marks as called"""
+            assert request_url == url
+            requested.set()
+            if raises:
+                raise requests.ConnectionError
+
+    # Mock some client parts
+    class Client(RESTClient):
+        """Dummy AcceleratorClient"""
+
+        def __del__(self):
+            """Does nothing"""
+
+    client = Client('Dummy', host_ip=url)
+    client._cache['_session'] = Session()
+
+    # Test: Connection opened in background
+    client._preconnect()
+    assert requested.wait(5)
+
+    # Test: Error ignored
+    requested.clear()
+    raises.append(True)
+    client._preconnect()
+    assert requested.wait(5)
+
+
 def test_restclient_start(tmpdir):
     """Tests RESTClient.start"""
     import apyfal
@@ -0,0 +1,120 @@
+# coding=utf-8
+"""apyfal.client._result_cache tests"""
+import json
+
+
+def test_result_cache(tmpdir):
+    """Tests ResultCache"""
+    from apyfal.client._result_cache import ResultCache
+    import apyfal.configuration as cfg
+
+    # Mocks checksums index
+    checksums_index = cfg.CHECKSUMS_INDEX
+    cfg.CHECKSUMS_INDEX = str(tmpdir.join('checksums.json'))
+
+    # Tests
+    try:
+        cache_dir = tmpdir.join('cache')
+        src = tmpdir.join('src')
+        src.write('src_content')
+        dst = tmpdir.join('dst')
+        dst.write('dst_content')
+        parameters = {'app': {'specific': {'key': 'value'}}}
+        result = {'result': 'value'}
+
+        cache = ResultCache(str(cache_dir), max_size=1)
+        assert cache_dir.check(dir=True)
+        assert str(cache_dir) in repr(cache)
+
+        # Test: Not cacheable operations
+        assert cache.get_key('accelerator', parameters, None) is None
+        assert cache.get_key('accelerator', parameters, src.open('rb')) is None
+        assert cache.get_key(
+            'accelerator', parameters, 'host://%s' % src, host=False) is None
+        assert cache.get_key('accelerator', {
+            'app': {'specific': {'key': object}}}, str(src)) is None
+
+        # Test: Key depends on accelerator, parameters and input content
+        key = cache.get_key('accelerator', parameters, str(src))
+        assert key == cache.get_key('accelerator', parameters, str(src))
+        assert key != cache.get_key('other', parameters, str(src))
+        assert key != cache.get_key('accelerator', {}, str(src))
+        src_copy = tmpdir.join('src_copy')
+        src.copy(src_copy)
+        assert key == cache.get_key('accelerator', parameters, str(src_copy))
+
+        # Test: Key depends on input byte range
+        range_key = cache.get_key(
+            'accelerator', parameters, str(src) + '#bytes=0-1')
+        assert range_key is not None
+        assert range_key not in (key, cache.get_key(
+            'accelerator', parameters, str(src) + '#bytes=0-2'))
+
+        # Test: Miss, then hit
+        assert cache.get(key, str(tmpdir.join('out'))) == (False, None)
+        cache.put(key, result, str(dst))
+        out = tmpdir.join('sub_dir').join('out')
+        assert cache.get(key, str(out)) == (True, result)
+        assert out.read() == 'dst_content'
+        assert cache.get(key) == (True, result)
+
+        # Test: Result without output data can't be used with output
+        key_no_dst = cache.get_key('no_dst', parameters, str(src))
+        cache.put(key_no_dst, result)
+        assert cache.get(key_no_dst) == (True, result)
+        assert cache.get(key_no_dst, str(out)) == (False, None)
+
+        # Test: Index shared with other instances
+        assert ResultCache(str(cache_dir)).get(key) == (True, result)
+        assert key in json.loads(cache_dir.join('index.json').read())
+
+        # Test: Access time persisted by batch on hit
+        access_time = json.loads(cache_dir.join('index.json').read())[key][2]
+        other_cache = ResultCache(str(cache_dir))
+        assert other_cache.get(key) == (True, result)
+        assert json.loads(
+            cache_dir.join('index.json').read())[key][2] == access_time
+        other_cache._ACCESS_WRITE_INTERVAL = 0.0
+        assert other_cache.get(key) == (True, result)
+        assert json.loads(
+            cache_dir.join('index.json').read())[key][2] > access_time
+        assert not other_cache._accessed
+
+        # Test: Index replaced atomically
+        assert sorted(path.basename for path in cache_dir.listdir(
+            lambda path: 'index' in path.basename)) == [
+            'index.json', 'index.json.lock']
+
+        # Test: Entries evicted by another process are not restored
+        evicted_key = cache.get_key('evicted', parameters, str(src))
+        cache.put(evicted_key, result)
+        other_cache._update_index()
+        index = json.loads(cache_dir.join('index.json').read())
+        del index[evicted_key]
+        cache_dir.join('index.json').write(json.dumps(index))
+        cache.put(cache.get_key('other', parameters, str(src)), result)
+        assert evicted_key not in json.loads(
+            cache_dir.join('index.json').read())
+
+        # Test: Local input checksum cached while input not modified
+        from apyfal.storage import _checksum
+        assert _checksum._INDEX[str(src)][2] in cache._input_digest(
+            str(src), True)
+
+        # Test: Least recently used entries evicted
+        big_dst = tmpdir.join('big_dst')
+        big_dst.write('0' * 2 ** 20)
+        cache.get(key)
+        big_key = cache.get_key('big', parameters, str(src))
+        cache.put(big_key, result, str(big_dst))
+        assert cache.get(key_no_dst) == (False, None)
+        assert not cache_dir.join(key_no_dst + '.json').check()
+        assert cache.get(big_key) == (True, result)
+
+        # Test: Entry removed externally
+        cache_dir.join(big_key + '.json').remove()
+        assert cache.get(big_key) == (False, None)
+
+    # Restore mocked values
+    finally:
+        cfg.CHECKSUMS_INDEX = checksums_index
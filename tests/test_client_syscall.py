@@ -3,6 +3,7 @@
 
 from contextlib import contextmanager
 from copy import deepcopy
+from io import BytesIO
 import json
 import os
 from threading import Lock
@@ -27,6 +28,8 @@ def test_call(tmpdir):
 
     dummy_stdout = 'dummy_stdout'
     dummy_stderr = 'dummy_stderr'
+    dummy_lines = ['line%d' % index for index in range(
+        syscall._OUTPUT_TAIL_LINES)]
     dummy_file_content = 'dummy_file'.encode()
     dummy_file = tmpdir.join('file')
     dummy_file.write(dummy_file_content)
@@ -39,17 +42,17 @@ def test_call(tmpdir):
 
         returncode = 0
 
-        @staticmethod
-        def __init__(args, *_, **__):
+        def __init__(self, args, *_, **__):
             """Check parameters"""
             assert args == dummy_args
             if raises_oserror:
                 raise OSError(dummy_oserror)
+            self.stdout = BytesIO('\n'.join(
+                [dummy_stdout, dummy_stderr] + dummy_lines).encode())
 
-        @staticmethod
-        def communicate():
+        def wait(self):
             """Returns fake result"""
-            return dummy_stdout, dummy_stderr
+            return self.returncode
 
     subprocess_popen = subprocess.Popen
     subprocess.Popen = DummyPopen
@@ -60,21 +63,21 @@ def test_call(tmpdir):
         # Everything OK
         syscall._call(dummy_args)
 
-        # Bad Error code
+        # Bad Error code, only output tail is kept
         DummyPopen.returncode = 1
         with pytest.raises(ClientRuntimeException) as exception:
             syscall._call(dummy_args, check_file=str(dummy_file))
-            assert ' '.join(dummy_args) in str(exception)
-            assert dummy_stdout in str(exception)
-            assert dummy_stderr in str(exception)
-            assert dummy_file_content in str(exception)
+        assert ' '.join(dummy_args) in str(exception.value)
+        assert dummy_stdout not in str(exception.value)
+        assert dummy_lines[-1] in str(exception.value)
+        assert dummy_file_content.decode() in str(exception.value)
 
         # Raise OSError
         raises_oserror = True
         with pytest.raises(ClientRuntimeException) as exception:
             syscall._call(dummy_args)
-            assert ' '.join(dummy_args) in str(exception)
-            assert dummy_oserror in str(exception)
+        assert ' '.join(dummy_args) in str(exception.value)
+        assert dummy_oserror in str(exception.value)
 
     # Restore Popen
     finally:
@@ -326,6 +329,10 @@ def test_syscall_init_metering(tmpdir):
     metering_tmp.ensure()
     cfg.METERING_TMP = str(metering_tmp)
 
+    cfg_metering_state = cfg.METERING_STATE
+    metering_state = tmpdir.join('state')
+    cfg.METERING_STATE = str(metering_state)
+
     syscall_call = syscall._call
     syscall._call = dummy_call
 
@@ -427,6 +434,42 @@ def test_syscall_init_metering(tmpdir):
         client._init_metering(dict())
         assert metering_client_config.check()
         assert fpga_image in metering_client_config.read()
+        assert metering_state.check()
+
+        # Already configured by another process: No file read, no call
+        def raise_call(*_, **__):
+            """Fails if called"""
+            pytest.fail('Metering services should not be restarted')
+
+        syscall._call = raise_call
+        client = DummyClient()
+        client._read_configuration_files = raise_call
+        client._init_metering(dict())
+        assert client._metering_env == dict()
+
+        # Configuration files changed by another process: Files are read
+        metering_client_config.write('fpgaimage=%s' % new_fpga_image)
+        client = DummyClient()
+        client._read_configuration_files = raise_call
+        with pytest.raises(pytest.fail.Exception):
+            client._init_metering(dict())
+
+        # Same environment applied, but with other value types
+        syscall._call = dummy_call
+        client = DummyClient()
+        client._init_metering({'arg': 1}, reload=True)
+        syscall._call = raise_call
+        client = DummyClient()
+        client._init_metering({'arg': 1, 'other': None})
+        assert client._metering_env['arg'] == 1
+
+        # State cleared on stop
+        syscall._call = dummy_call
+        client._run_executable = lambda **_: dict()
+        assert metering_state.check()
+        client._stop()
+        assert not metering_state.check()
+        assert client._metering_env is None
 
     # Restore
     finally:
@@ -434,6 +477,7 @@ def test_syscall_init_metering(tmpdir):
         cfg.METERING_CREDENTIALS = cfg_metering_credentials
         cfg.METERING_CLIENT_CONFIG = cfg_metering_client_config
         cfg.METERING_TMP = cfg_metering_tmp
+        cfg.METERING_STATE = cfg_metering_state
 
 
 def test_syscall_client_start_process_stop():
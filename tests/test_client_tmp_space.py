@@ -0,0 +1,222 @@
+# coding=utf-8
+"""apyfal.client._tmp_space tests"""
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import pytest
+
+
+def test_tmp_space(tmpdir):
+    """Tests TmpSpace"""
+    from apyfal.client._tmp_space import TmpSpace, _RESERVED
+
+    ram_dir = str(tmpdir.join('ram'))
+    disk_dir = tmpdir.join('disk')
+    mb = 2 ** 20
+
+    # Mocks free space
+    free_space = {ram_dir: 10 * mb, str(disk_dir): 100 * mb}
+
+    class DummyTmpSpace(TmpSpace):
+        """Dummy TmpSpace"""
+
+        @staticmethod
+        def _free_space(directory):
+            """Returns mocked free space"""
+            return free_space[directory]
+
+    # Test: Disk directory created
+    tmp_space = DummyTmpSpace(ram_dir, None, str(disk_dir), 50)
+    assert disk_dir.check(dir=True)
+    disk_dir = str(disk_dir)
+
+    # Test: Small file in RAM, accounted
+    with tmp_space.reserve(4 * mb) as directory:
+        assert directory == ram_dir
+        assert _RESERVED[ram_dir] == 4 * mb
+
+        # Test: No more space in RAM, file on disk
+        with tmp_space.reserve(8 * mb) as directory:
+            assert directory == disk_dir
+            assert _RESERVED[disk_dir] == 8 * mb
+
+    # Test: Space released
+    assert _RESERVED[ram_dir] == 0
+    assert _RESERVED[disk_dir] == 0
+
+    # Test: Space reserved until explicitly released
+    reservation = tmp_space.acquire(4 * mb)
+    assert _RESERVED[reservation.directory] == 4 * mb
+    reservation.release()
+    assert _RESERVED[reservation.directory] == 0
+
+    # Test: Unknown size on disk, accounted once settled
+    reservation = tmp_space.acquire(None, 4 * mb)
+    assert reservation.directory == disk_dir
+    assert _RESERVED[disk_dir] == 0
+    reservation.settle(6 * mb)
+    assert _RESERVED[disk_dir] == 6 * mb
+    reservation.release()
+    assert _RESERVED[disk_dir] == 0
+
+    # Test: Unknown size on disk, not accounted
+    with tmp_space.reserve() as directory:
+        assert directory == disk_dir
+        assert _RESERVED[disk_dir] == 0
+
+    # Test: RAM maximum size
+    tmp_space = DummyTmpSpace(ram_dir, 2, disk_dir, 50)
+    with tmp_space.reserve(4 * mb) as directory:
+        assert directory == disk_dir
+
+    # Test: Waits until space is released
+    executor = ThreadPoolExecutor(max_workers=2)
+    order = []
+
+    def reserve(size, duration):
+        """Reserves space"""
+        with tmp_space.reserve(size * mb) as directory:
+            order.append(size)
+            sleep(duration)
+        return directory
+
+    first = executor.submit(reserve, 40, 0.1)
+    sleep(0.05)
+    second = executor.submit(reserve, 30, 0.0)
+    assert first.result() == second.result() == disk_dir
+    assert order == [40, 30]
+    assert _RESERVED[disk_dir] == 0
+
+    # Test: Too large file, don't wait
+    with tmp_space.reserve(200 * mb) as directory:
+        assert directory == disk_dir
+
+    # Test: Only RAM directory
+    tmp_space = DummyTmpSpace(ram_dir)
+    with tmp_space.reserve(200 * mb) as directory:
+        assert directory == ram_dir
+    with tmp_space.reserve() as directory:
+        assert directory == ram_dir
+    assert _RESERVED[ram_dir] == 0
+
+    # Test: Unknown size in RAM, estimate reserved then settled
+    reservation = tmp_space.acquire(None, 2 * mb)
+    assert reservation.directory == ram_dir
+    assert _RESERVED[ram_dir] == 2 * mb
+    reservation.settle(3 * mb)
+    assert _RESERVED[ram_dir] == 3 * mb
+    reservation.release()
+    assert _RESERVED[ram_dir] == 0
+
+    # Test: Real free space
+    assert TmpSpace._free_space(str(tmpdir)) > 0
+
+
+def test_tmp_space_shared_file(tmpdir):
+    """Tests TmpSpace.shared_file"""
+    from threading import Event
+    from apyfal.client._tmp_space import TmpSpace, _RESERVED, _SHARED, _CACHED
+
+    ram_dir = str(tmpdir)
+    tmp_space = TmpSpace(ram_dir, cache_max_size=0)
+    content = b'content'
+    fetched = []
+    release = Event()
+
+    def fetch(path):
+        """Writes file"""
+        release.wait()
+        fetched.append(path)
+        with open(path, 'wb') as file:
+            file.write(content)
+
+    def read(key):
+        """Reads shared file"""
+        with tmp_space.shared_file(key, len(content), fetch) as path:
+            with open(path, 'rb') as file:
+                return path, file.read()
+
+    # Test: Concurrent users fetch file once
+    executor = ThreadPoolExecutor(max_workers=4)
+    futures = [executor.submit(read, ('url', 'etag')) for _ in range(4)]
+    sleep(0.05)
+    release.set()
+    results = [future.result() for future in futures]
+    assert len(fetched) == 1
+    assert results == [(fetched[0], content)] * 4
+
+    # Test: File removed and space released after last user
+    assert not tmpdir.join(fetched[0]).check()
+    assert not _SHARED
+    assert _RESERVED[ram_dir] == 0
+
+    # Test: Different key fetched again
+    read(('url', 'etag2'))
+    assert len(fetched) == 2
+
+    # Test: Unknown size accounted once fetched
+    with tmp_space.shared_file(('url', 'no_size'), None, fetch):
+        assert _RESERVED[ram_dir] == len(content)
+    assert _RESERVED[ram_dir] == 0
+
+    # Test: Exception shared with users
+    release.clear()
+
+    def fetch_error(path):
+        """Fails to write file"""
+        release.wait()
+        with open(path, 'wb') as file:
+            file.write(content)
+        raise IOError
+
+    def read_error():
+        """Reads shared file"""
+        with tmp_space.shared_file('key', None, fetch_error):
+            pass
+
+    futures = [executor.submit(read_error) for _ in range(2)]
+    sleep(0.05)
+    release.set()
+    for future in futures:
+        with pytest.raises(IOError):
+            future.result()
+    assert not _SHARED
+    assert not tmpdir.listdir()
+
+    # Test: File kept after use and reused by next users
+    release.set()
+    del fetched[:]
+    tmp_space = TmpSpace(
+        ram_dir, ram_max_size=len(content) * 3 / 2 ** 20,
+        cache_max_size=len(content) * 2 / 2 ** 20)
+    path = read(('url', 'etag'))[0]
+    assert tmpdir.join(path.rsplit('/', 1)[-1]).check()
+    assert list(_CACHED) == [('url', 'etag')]
+    assert _RESERVED[ram_dir] == len(content)
+    assert read(('url', 'etag')) == (path, content)
+    assert len(fetched) == 1
+
+    # Test: Least recently used files evicted when exceeding cache size
+    read(('url', 'etag2'))
+    read(('url', 'etag'))
+    read(('url', 'etag3'))
+    assert list(_CACHED) == [('url', 'etag'), ('url', 'etag3')]
+    assert len(fetched) == 3
+    assert _RESERVED[ram_dir] == len(content) * 2
+
+    # Test: Files evicted when temporary space is required
+    with tmp_space.reserve(len(content) * 2):
+        assert list(_CACHED) == [('url', 'etag3')]
+    assert _RESERVED[ram_dir] == len(content)
+
+    # Test: File not kept if not cacheable
+    with tmp_space.shared_file('key', len(content), fetch, cache=False):
+        pass
+    assert 'key' not in _SHARED
+
+    # Clears kept files
+    tmp_space = TmpSpace(ram_dir, cache_max_size=0)
+    read(('url', 'etag4'))
+    assert not _SHARED
+    assert not _CACHED
+    assert _RESERVED[ram_dir] == 0
@@ -0,0 +1,139 @@
+# coding=utf-8
+"""apyfal.client._write_behind tests"""
+from threading import Event, Thread
+
+
+def test_write_behind(tmpdir):
+    """Tests WriteBehind"""
+    import apyfal.client._write_behind as write_behind_module
+    from apyfal.client._write_behind import WriteBehind, wait_upload
+    import apyfal.configuration as cfg
+
+    content = b'content'
+    dst = tmpdir.join('dst')
+    dst_path = str(dst)
+
+    def local_file(name='local'):
+        """Creates local file"""
+        local = tmpdir.join(name)
+        local.write_binary(content)
+        return str(local)
+
+    # Mocks apyfal.storage.copy
+    release = Event()
+    failures = []
+    copied = []
+
+    class DummyStorage(object):
+        """Dummy apyfal.storage"""
+
+        @staticmethod
+        def copy(source, destination):
+            """Copy file or fails"""
+            release.wait()
+            if failures:
+                raise failures.pop()
+            with open(source, 'rb') as src_file:
+                with open(destination, 'wb') as dst_file:
+                    dst_file.write(src_file.read())
+            copied.append(destination)
+
+    class DummyWriteBehind(WriteBehind):
+        """Dummy WriteBehind"""
+        _RETRY_DELAY = 0.0
+
+    srg = write_behind_module._srg
+    write_behind_module._srg = DummyStorage
+    failed_uploads = cfg.FAILED_UPLOADS
+    cfg.FAILED_UPLOADS = str(tmpdir.join('failed'))
+
+    # Tests
+    try:
+        errors = []
+        released = []
+        write_behind = DummyWriteBehind(retries=1, max_pending=2)
+        write_behind.add_error_callback(
+            lambda url, exception, path: errors.append((url, exception, path)))
+
+        # Test: Upload in background and wait for URL
+        local = local_file()
+        future = write_behind.submit(
+            local, dst_path, lambda: released.append(local))
+        assert not future.done()
+        assert write_behind_module._PENDING[dst_path] is future
+        assert not released
+        release.set()
+        wait_upload(dst_path)
+        assert future.done()
+        assert dst.read_binary() == content
+        assert not tmpdir.join('local').check()
+        assert dst_path not in write_behind_module._PENDING
+        assert released == [local]
+
+        # Test: Nothing to wait
+        wait_upload(dst_path)
+        wait_upload(None)
+
+        # Test: Retries on failure
+        failures.append(IOError())
+        write_behind.submit(local_file(), dst_path)
+        write_behind.flush()
+        assert not failures
+        assert not errors
+        assert not write_behind._futures
+
+        # Test: Failure after retries, file kept
+        failures.extend((IOError('error'), IOError('error')))
+        del released[:]
+        future = write_behind.submit(
+            local_file(), dst_path, lambda: released.append(True))
+        write_behind.flush()
+        assert isinstance(future.exception(), IOError)
+        kept = errors[0][2]
+        assert errors == [(dst_path, future.exception(), kept)]
+        assert not tmpdir.join('local').check()
+        assert kept.startswith(cfg.FAILED_UPLOADS)
+        assert kept.endswith('_dst')
+        with open(kept, 'rb') as kept_file:
+            assert kept_file.read() == content
+        assert released == [True]
+
+        # Test: Number of pending uploads is bounded
+        release.clear()
+        futures = [write_behind.submit(local_file(name), dst_path)
+                   for name in ('local1', 'local2')]
+        submitted = Event()
+
+        def submit():
+            """Submits upload"""
+            futures.append(write_behind.submit(local_file('local3'), dst_path))
+            submitted.set()
+
+        thread = Thread(target=submit)
+        thread.start()
+        assert not submitted.wait(0.1)
+        release.set()
+        thread.join()
+        write_behind.flush()
+        for future in futures:
+            assert future.exception() is None
+
+        # Test: Uploads to same URL are ordered
+        release.clear()
+        del copied[:]
+        futures = [write_behind.submit(local_file(name), dst_path)
+                   for name in ('local1', 'local2')]
+        release.set()
+        write_behind.flush()
+        assert copied == [dst_path] * 2
+        for future in futures:
+            assert future.exception() is None
+
+        # Test: Shutdown
+        write_behind.shutdown()
+        assert not write_behind._futures
+
+    # Restores mocked module
+    finally:
+        write_behind_module._srg = srg
+        cfg.FAILED_UPLOADS = failed_uploads
@@ -280,10 +280,100 @@ def test_configuration_access_token_real_no_cred():
         assert config.access_token
 
 
-def test_configuration_get_host_requirements():
+def test_access_token_cache(tmpdir):
+    """Tests Configuration.access_token cache"""
+    from time import time
+    import apyfal.configuration as cfg
+
+    # Mocks token requests
+    requested = []
+
+    class DummyAccessToken(cfg._AccessToken):
+        """Dummy _AccessToken"""
+        expires_in = 3600
+
+        def _request(self):
+            """Returns a new token"""
+            requested.append(self._client_id)
+            return 'token%d' % len(requested), self.expires_in
+
+    access_tokens = cfg.ACCESS_TOKENS
+    cfg.ACCESS_TOKENS = str(tmpdir.join('home').join('access_tokens.json'))
+
+    # Tests
+    try:
+        # Test: Requests token and caches it in file
+        access_token = DummyAccessToken('client_id', 'secret_id', 1)
+        assert access_token.get() == 'token1'
+        assert access_token.get() == 'token1'
+        assert requested == ['client_id']
+        with open(cfg.ACCESS_TOKENS, 'rt') as file:
+            content = file.read()
+        assert 'token1' in content
+        assert 'secret_id' not in content
+        assert os.stat(cfg.ACCESS_TOKENS).st_mode & 0o777 == 0o600
+
+        # Test: Other process gets token from file
+        assert DummyAccessToken('client_id', 'secret_id', 1).get() == 'token1'
+        assert len(requested) == 1
+
+        # Test: Other credentials
+        assert DummyAccessToken('client_id2', 'secret_id', 1).get() == 'token2'
+        assert len(requested) == 2
+
+        # Test: Expired token
+        access_token._expiry = 0
+        with open(cfg.ACCESS_TOKENS, 'rt') as file:
+            tokens = json.load(file)
+        tokens[access_token._key][1] = 0
+        with open(cfg.ACCESS_TOKENS, 'wt') as file:
+            json.dump(tokens, file)
+        assert access_token.get() == 'token3'
+        assert len(requested) == 3
+
+        # Test: Refreshes in background before expiry
+        access_token._refresh = time()
+        assert access_token.get() == 'token3'
+        thread = access_token._refresh_thread
+        if thread is not None:
+            thread.join()
+        assert len(requested) == 4
+        assert access_token.get() == 'token4'
+        assert access_token._refresh > time()
+
+        # Test: Refreshed by other process, not requested again
+        other = DummyAccessToken('client_id', 'secret_id', 1)
+        other._token = 'token3'
+        other._refresh = time()
+        other._expiry = access_token._expiry - 1
+        assert other.get() == 'token3'
+        thread = other._refresh_thread
+        if thread is not None:
+            thread.join()
+        assert other.get() == 'token4'
+        assert len(requested) == 4
+
+        # Test: Configuration shares token between instances
+        config = cfg.Configuration()
+        config['accelize']['client_id'] = 'client_id'
+        config['accelize']['secret_id'] = 'secret_id'
+        other_config = cfg.Configuration()
+        other_config['accelize']['client_id'] = 'client_id'
+        other_config['accelize']['secret_id'] = 'secret_id'
+        assert (config._get_access_token() is
+                other_config._get_access_token())
+
+    # Restores values
+    finally:
+        cfg.ACCESS_TOKENS = access_tokens
+        cfg._ACCESS_TOKENS.pop(('client_id', 'secret_id'), None)
+
+
+def test_configuration_get_host_requirements(tmpdir):
     """Tests Configuration.get_host_requirements
 
     without Accelize server"""
+    import apyfal.configuration as cfg
     from apyfal.configuration import METERING_SERVER, Configuration
     from apyfal.exceptions import ClientConfigurationException
 
@@ -305,6 +395,8 @@ def test_configuration_get_host_requirements():
     # Mocks requests in utilities
     class Response:
         """Fake requests.Response"""
+        status_code = 200
+        headers = {}
         text = json.dumps({host_type: {accelerator: config}})
 
         @staticmethod
@@ -327,6 +419,8 @@ def test_configuration_get_host_requirements():
     # Monkey patch requests in utilities
     requests_session = requests.Session
     requests.Session = DummySession
+    host_configurations = cfg.HOST_CONFIGURATIONS
+    cfg.HOST_CONFIGURATIONS = str(tmpdir.join('host_configurations.json'))
 
     # Tests
     try:
@@ -351,6 +445,179 @@ def test_configuration_get_host_requirements():
     # Restore requests
     finally:
         requests.Session = requests_session
+        cfg.HOST_CONFIGURATIONS = host_configurations
+
+
+def test_configuration_snapshot():
+    """Tests Configuration.snapshot"""
+    import pickle
+    from time import time
+    import apyfal.configuration as cfg
+
+    host_configurations = {'host_type': {'accelerator': {'region': {}}}}
+    credentials = ('snapshot_client_id', 'snapshot_secret_id')
+
+    config = cfg.Configuration()
+    config['accelize']['client_id'] = credentials[0]
+    config['accelize']['secret_id'] = credentials[1]
+    config['host.host_type']['region'] = 'region'
+
+    # Test: Snapshot without token and host configurations
+    snapshot = config.snapshot()
+    assert snapshot['accelize']['client_id'] == credentials[0]
+    assert snapshot.access_token is None
+    assert snapshot.host_configurations is None
+
+    # Simulates cached token and host configurations
+    config._cache['get_host_configurations'] = host_configurations
+    access_token = config._get_access_token()
+    expiry = time() + 3600
+    access_token.update_state(('token', expiry, expiry))
+
+    # Tests
+    try:
+        snapshot = config.snapshot()
+
+        # Test: Snapshot is immutable
+        snapshot['host.host_type']['region'] = 'other_region'
+        config['host.host_type']['region'] = 'other_region'
+        assert snapshot['host.host_type']['region'] == 'region'
+        host_configurations['host_type']['other_accelerator'] = {}
+        assert 'other_accelerator' not in snapshot.host_configurations[
+            'host_type']
+        with pytest.raises(TypeError):
+            snapshot['section'] = {}
+
+        # Test: Picklable
+        snapshot = pickle.loads(pickle.dumps(snapshot))
+        assert dict(snapshot) == {
+            name: dict(section) for name, section in snapshot.items()}
+        assert snapshot.access_token == ('token', expiry, expiry)
+
+        # Test: Configuration from snapshot, in a new process
+        del cfg._ACCESS_TOKENS[credentials]
+        new_config = cfg.create_configuration(snapshot)
+        assert isinstance(new_config, cfg.Configuration)
+        assert new_config['host.host_type']['region'] == 'region'
+        assert new_config['host.host_type']['client_id'] is None
+        assert new_config.get_host_configurations() == {
+            'host_type': {'accelerator': {'region': {}}}}
+        assert new_config.access_token == 'token'
+
+        # Test: Configuration from snapshot is mutable
+        new_config['host']['region'] = 'new_region'
+        new_config.get_host_configurations()['host_type'] = None
+        assert 'host' not in snapshot
+        assert snapshot.host_configurations['host_type']
+
+        # Test: Snapshot don't replace more recent token
+        new_access_token = new_config._get_access_token()
+        new_access_token.update_state(('new_token', expiry + 1, expiry + 1))
+        assert cfg.Configuration(snapshot).access_token == 'new_token'
+
+    # Restores values
+    finally:
+        cfg._ACCESS_TOKENS.pop(credentials, None)
+
+
+def test_configuration_host_configurations_cache(tmpdir):
+    """Tests Configuration.get_host_configurations cache"""
+    import apyfal.configuration as cfg
+
+    from apyfal.exceptions import ClientAuthenticationException
+
+    configurations = {'host_type': {'accelerator': {'region': {}}}}
+    requests_headers = []
+    token_error = []
+
+    # Mocks Accelize server
+    class Response:
+        """Fake requests.Response"""
+        status_code = 200
+        headers = {'ETag': '"etag"'}
+        text = json.dumps(configurations)
+        error = None
+
+        def raise_for_status(self):
+            """Raises error if any"""
+            if self.error:
+                raise self.error
+
+    class DummySession(requests.Session):
+        """Fake requests.Session"""
+
+        @staticmethod
+        def get(url, headers, **_):
+            """Returns fake response"""
+            requests_headers.append(headers)
+            return Response()
+
+    class DummyConfiguration(cfg.Configuration):
+        """Dummy Configuration"""
+
+        @property
+        def access_token(self):
+            """Don't check credential"""
+            if token_error:
+                raise token_error[0]
+            return 'dummy_token'
+
+    requests_session = requests.Session
+    requests.Session = DummySession
+    host_configurations = cfg.HOST_CONFIGURATIONS
+    cfg.HOST_CONFIGURATIONS = str(tmpdir.join('host_configurations.json'))
+
+    # Tests
+    try:
+        # Test: Gets from server and caches
+        assert DummyConfiguration().get_host_configurations() == configurations
+        assert len(requests_headers) == 1
+        assert 'If-None-Match' not in requests_headers[0]
+
+        # Test: Gets from cache
+        assert DummyConfiguration().get_host_configurations() == configurations
+        assert len(requests_headers) == 1
+
+        # Test: Expired, revalidated with server
+        config = DummyConfiguration()
+        config['accelize']['host_configurations_ttl'] = '0'
+        Response.status_code = 304
+        Response.text = ''
+        assert config.get_host_configurations() == configurations
+        assert requests_headers[-1]['If-None-Match'] == '"etag"'
+
+        # Test: Expired, server unavailable
+        config = DummyConfiguration()
+        config['accelize']['host_configurations_ttl'] = '0'
+        Response.error = requests.ConnectionError()
+        assert config.get_host_configurations() == configurations
+        assert not tmpdir.listdir(lambda path: path.basename.startswith('.'))
+
+        # Test: Expired, access token can't be retrieved
+        for error in (requests.ConnectionError(),
+                      ClientAuthenticationException()):
+            token_error[:] = [error]
+            config = DummyConfiguration()
+            config['accelize']['host_configurations_ttl'] = '0'
+            assert config.get_host_configurations() == configurations
+        del token_error[:]
+
+        # Test: Server unavailable and no cache
+        tmpdir.join('host_configurations.json').remove()
+        with pytest.raises(requests.ConnectionError):
+            DummyConfiguration().get_host_configurations()
+
+        # Test: Offline mode
+        offline_file = tmpdir.join('offline.json')
+        offline_file.write(json.dumps(configurations))
+        config = DummyConfiguration()
+        config['accelize']['host_configurations_file'] = str(offline_file)
+        assert config.get_host_configurations() == configurations
+
+    # Restore requests
+    finally:
+        requests.Session = requests_session
+        cfg.HOST_CONFIGURATIONS = host_configurations
 
 
 @pytest.mark.need_accelize
@@ -82,16 +82,19 @@ def test_host_init():
 
     list(host.iter_hosts(host_name_prefix=True))
     assert host._host_name_match is not None
+    assert host._host_name_filter == 'prefix_accelize_*'
     assert not host._is_accelerator_host('accelize_pytest_000000000000')
     assert not host._is_accelerator_host('other_accelize_pytest_000000000000')
     assert host._is_accelerator_host('prefix_accelize_pytest_000000000000')
 
     list(host.iter_hosts(host_name_prefix=False))
+    assert host._host_name_filter == '*accelize_*'
     assert host._is_accelerator_host('accelize_pytest_000000000000')
     assert host._is_accelerator_host('other_accelize_pytest_000000000000')
     assert host._is_accelerator_host('prefix_accelize_pytest_000000000000')
 
     list(host.iter_hosts(host_name_prefix='other'))
+    assert host._host_name_filter == 'other_accelize_*'
     assert not host._is_accelerator_host('accelize_pytest_000000000000')
     assert host._is_accelerator_host('other_accelize_pytest_000000000000')
     assert not host._is_accelerator_host('prefix_accelize_pytest_000000000000')
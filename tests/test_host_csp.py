@@ -77,6 +77,7 @@ def get_dummy_csp_class():
         """Base dummy class"""
         NAME = 'Dummy'
         _TIMEOUT_SLEEP = 0.0
+        _INIT_CACHE_TTL = 0
 
         def _get_public_ip(self):
             """Dummy method"""
@@ -268,6 +269,138 @@ def test_csphost_status():
     assert csp._instance == instance
 
 
+def test_csphost_poll_status():
+    """Tests Host._poll_status"""
+    from concurrent.futures import ThreadPoolExecutor
+    from apyfal.exceptions import HostRuntimeException
+    from apyfal.host._csp import _InstancesPoller
+
+    # Mock CSP class
+    requests = []
+    failures = []
+    instances = {'id%d' % index: {'status': 'running'} for index in range(5)}
+
+    class DummyClass(get_dummy_csp_class()):
+        """Dummy CSP"""
+        _INSTANCES_BATCH_SIZE = 2
+        _TIMEOUT_SLEEP = 0.05
+
+        def __init__(self, instance_id, region='region'):
+            self._instance_id = instance_id
+            self._instance = None
+            self._host_type = 'dummy'
+            self._region = region
+            self._client_id = 'client_id'
+
+        def __del__(self):
+            """Do nothing"""
+
+        def _get_status(self):
+            """Returns fake result"""
+            return self._instance['status']
+
+        def _get_instance(self):
+            """Return fake result"""
+            requests.append([self._instance_id])
+            return instances.get(self._instance_id)
+
+        def _get_instances(self, instances_ids):
+            """Return fake result"""
+            if failures:
+                raise failures.pop()
+            requests.append(instances_ids)
+            return {instance_id: instances[instance_id]
+                    for instance_id in instances_ids
+                    if instance_id in instances}
+
+    class DummyPoller(_InstancesPoller):
+        """Dummy poller"""
+        _MAX_BACKOFF = 0.1
+
+    pollers = _InstancesPoller._POLLERS.copy()
+    _InstancesPoller._POLLERS.clear()
+
+    # Tests
+    try:
+        _InstancesPoller._POLLERS[('dummy', 'region', 'client_id')] = \
+            DummyPoller(DummyClass._TIMEOUT_SLEEP)
+        hosts = [DummyClass(instance_id) for instance_id in instances]
+        executor = ThreadPoolExecutor(max_workers=len(hosts))
+
+        def poll_status():
+            """Polls status of all hosts in parallel"""
+            return list(executor.map(
+                lambda host: host._poll_status(), hosts))
+
+        # Test: Batched requests
+        time.sleep(0.1)
+        assert poll_status() == ['running'] * len(hosts)
+        assert all(len(ids) <= 2 for ids in requests)
+        assert len(requests) < len(hosts)
+        assert sorted(sum(requests, [])) == sorted(instances)
+        for host in hosts:
+            assert host._instance is instances[host._instance_id]
+
+        # Test: Retries on failure
+        del requests[:]
+        failures.append(ValueError())
+        assert poll_status() == ['running'] * len(hosts)
+        assert not failures
+
+        # Test: Fails after retries
+        failures.extend(
+            [HostRuntimeException()] * (DummyPoller._RETRIES + 1))
+        with pytest.raises(HostRuntimeException):
+            poll_status()
+        assert not failures
+
+        # Test: Unexpected failure, waiting hosts are woken up
+        class Interrupt(BaseException):
+            """Unexpected failure"""
+
+        failures.append(Interrupt())
+        with pytest.raises(Interrupt):
+            poll_status()
+        assert poll_status() == ['running'] * len(hosts)
+
+        # Test: Instance not found, fall back on single request
+        del requests[:]
+        host = DummyClass('not_exists')
+        with pytest.raises(HostRuntimeException):
+            host._poll_status()
+        assert requests[-1] == ['not_exists']
+
+        # Test: Poller by region
+        assert (_InstancesPoller.get(DummyClass('id', 'region2')) is not
+                _InstancesPoller.get(hosts[0]))
+        assert (_InstancesPoller.get(DummyClass('id2')) is
+                _InstancesPoller.get(hosts[0]))
+
+        # Test: Poller thread not responding, fall back on single request
+        del requests[:]
+        poller = _InstancesPoller.get(hosts[0])
+        poller._running = True
+        hosts[0].TIMEOUT = 0.05
+        try:
+            assert hosts[0]._poll_status() == 'running'
+            assert requests == [[hosts[0]._instance_id]]
+        finally:
+            poller._running = False
+            poller._waiters.clear()
+            del hosts[0].TIMEOUT
+
+        # Test: Batch not supported
+        DummyClass._INSTANCES_BATCH_SIZE = 0
+        del requests[:]
+        assert hosts[0]._poll_status() == 'running'
+        assert requests == [[hosts[0]._instance_id]]
+
+    # Restores pollers
+    finally:
+        _InstancesPoller._POLLERS.clear()
+        _InstancesPoller._POLLERS.update(pollers)
+
+
 def test_csphost_start():
     """Tests Host.start"""
     from apyfal.exceptions import HostException
@@ -525,6 +658,545 @@ def test_csphost_start():
         utl.check_url = utl_check_port
 
 
+def test_csphost_start_many():
+    """Tests Host._start_many"""
+    from apyfal.exceptions import HostException
+    import apyfal._utilities as utl
+
+    # Mock variables
+    status = 'dummy_status'
+    dummy_ip = '127.0.0.1'
+    dummy_kwargs = {
+        'region': 'dummy_region',
+        'client_id': 'dummy_client_id'}
+    calls = {'credential': 0, 'key_pair': 0, 'launch': 0, 'terminated': [],
+             'requirements': []}
+    raises_on_launch = [False]
+
+    # Mock CSP class
+    class DummyClass(get_dummy_csp_class()):
+        """Dummy CSP"""
+        STATUS_RUNNING = status
+        TIMEOUT = 0.0
+
+        @staticmethod
+        def _set_accelerator_requirements(**kwargs):
+            """Tested separately, stores arguments"""
+            calls['requirements'].append(kwargs)
+
+        def _check_credential(self):
+            """Counts calls"""
+            calls['credential'] += 1
+
+        def _init_key_pair(self):
+            """Counts calls and updates key pair"""
+            calls['key_pair'] += 1
+            self._key_pair = 'initialized_key_pair'
+
+        def _init_security_group(self):
+            """Updates security group"""
+            self._security_group = 'initialized_security_group'
+
+        def _start_new_instance(self):
+            """Counts calls, simulate exception and returns fake result"""
+            assert self._security_group == 'initialized_security_group'
+            calls['launch'] += 1
+            if raises_on_launch[0] and calls['launch'] == 2:
+                raise HostException('Error on start')
+            instance_id = 'id_%d' % calls['launch']
+            return 'instance_%s' % instance_id, instance_id
+
+        def _terminate_instance(self):
+            """Marks as terminated"""
+            calls['terminated'].append(self._instance_id)
+
+        def _get_status(self):
+            """Returns fake result"""
+            return status
+
+        def _get_instance(self):
+            """Returns fake result"""
+            return 'instance_%s' % self._instance_id
+
+        def _start_existing_instance(self, state):
+            """Should not be called"""
+            raise AssertionError
+
+        @staticmethod
+        def _get_public_ip():
+            """Returns fake result"""
+            return dummy_ip
+
+    utl_check_port = utl.check_port
+    utl.check_port = lambda *_, **__: True
+
+    # Tests
+    try:
+        # Test: Initializes once and launches all instances
+        hosts = [DummyClass(**dummy_kwargs) for _ in range(3)]
+        hosts.append(DummyClass(instance_id='existing', **dummy_kwargs))
+        accel_parameters = {'env': {'key': 'value'}}
+        DummyClass._start_many(hosts, accelerator='accelerator',
+                               accel_parameters=accel_parameters,
+                               stop_mode='keep', instance_type='type')
+        assert calls['requirements'] == [dict(
+            accelerator='accelerator', accel_parameters=accel_parameters,
+            image_id=None, instance_type='type')] * 3
+        assert calls['credential'] == 1
+        assert calls['key_pair'] == 1
+        assert calls['launch'] == 3
+        assert sorted(host.instance_id for host in hosts[:3]) == [
+            'id_1', 'id_2', 'id_3']
+        assert hosts[3].instance_id == 'existing'
+        for host in hosts[:3]:
+            assert host._instance == 'instance_%s' % host.instance_id
+            assert host.key_pair == 'initialized_key_pair'
+            assert host._security_group == 'initialized_security_group'
+            assert host.stop_mode == 'keep'
+
+        # Test: Hosts start only waits instances
+        for host in hosts[:3]:
+            host.start()
+            assert host.url == 'http://%s' % dummy_ip
+            assert not host._instance_started
+        assert calls['credential'] == 1
+        assert calls['launch'] == 3
+
+        # Test: Nothing to do with less than 2 hosts to start
+        DummyClass._start_many(hosts)
+        DummyClass._start_many([DummyClass(**dummy_kwargs)])
+        assert calls['launch'] == 3
+
+        # Test: Terminates launched instances on failure
+        calls['launch'] = 0
+        raises_on_launch[0] = True
+        hosts = [DummyClass(**dummy_kwargs) for _ in range(3)]
+        with pytest.raises(HostException):
+            DummyClass._start_many(hosts)
+        assert sorted(calls['terminated']) == ['id_1', 'id_3']
+        for host in hosts:
+            assert host.instance_id is None
+            assert not host._instance_started
+
+    # Restore mocked functions
+    finally:
+        utl.check_port = utl_check_port
+
+
+def test_csphost_init_cache(tmpdir):
+    """Tests Host._init_cached"""
+    from apyfal.exceptions import HostException
+    import apyfal.configuration as cfg
+    import apyfal.host._csp as csp_module
+
+    # Mock CSP class
+    calls = []
+
+    class DummyClass(get_dummy_csp_class()):
+        """Dummy CSP"""
+        _INIT_CACHE_TTL = 60
+
+        def _init_key_pair(self):
+            """Counts calls and updates key pair"""
+            calls.append(self._key_pair)
+            self._key_pair = self._key_pair.upper()
+            return 'key_pair'
+
+        def _init_security_group(self):
+            """Raises exception"""
+            raise HostException
+
+    # Mock cache
+    cache_file = str(tmpdir.join('host_init_cache.json'))
+    host_init_cache = cfg.HOST_INIT_CACHE
+    cfg.HOST_INIT_CACHE = cache_file
+    csp_module._INIT_CACHE.clear()
+    del csp_module._INIT_CACHE_LOADED[:]
+
+    # Tests
+    try:
+        kwargs = dict(region='region', client_id='client_id', key_pair='key')
+
+        # Test: Runs and caches result
+        csp = DummyClass(**kwargs)
+        assert csp._init_cached('_init_key_pair') == 'key_pair'
+        assert csp.key_pair == 'KEY'
+        assert calls == ['key']
+        assert tmpdir.join('host_init_cache.json').check(file=1)
+
+        # Test: Restores result from cache on another host
+        csp = DummyClass(**kwargs)
+        assert csp._init_cached('_init_key_pair') == 'key_pair'
+        assert csp.key_pair == 'KEY'
+        assert calls == ['key']
+
+        # Test: Restores result from cache file on another process
+        csp_module._INIT_CACHE.clear()
+        del csp_module._INIT_CACHE_LOADED[:]
+        csp = DummyClass(**kwargs)
+        assert csp._init_cached('_init_key_pair') == 'key_pair'
+        assert csp.key_pair == 'KEY'
+        assert calls == ['key']
+
+        # Test: Not cached with other parameters, account or region
+        for changes in ({'key_pair': 'other_key'}, {'client_id': 'other'},
+                        {'region': 'other'}):
+            host_kwargs = kwargs.copy()
+            host_kwargs.update(changes)
+            DummyClass(**host_kwargs)._init_cached('_init_key_pair')
+        assert calls == ['key', 'other_key', 'key', 'key']
+
+        # Test: Methods without cache attributes are not cached
+        with pytest.raises(HostException):
+            csp._init_cached('_init_security_group')
+
+        # Test: Expired result
+        DummyClass._INIT_CACHE_TTL = 0.1
+        time.sleep(0.1)
+        DummyClass(**kwargs)._init_cached('_init_key_pair')
+        assert calls[-1] == 'key'
+        assert len(calls) == 5
+        DummyClass._INIT_CACHE_TTL = 60
+
+        # Test: Cache cleared on failure
+        csp = DummyClass(**kwargs)
+        with pytest.raises(HostException):
+            with csp._stop_silently_on_exception():
+                csp._init_cached('_init_security_group')
+        DummyClass(**kwargs)._init_cached('_init_key_pair')
+        assert len(calls) == 6
+
+        # Test: Cache disabled
+        DummyClass._INIT_CACHE_TTL = 0
+        DummyClass(**kwargs)._init_cached('_init_key_pair')
+        assert len(calls) == 7
+
+    # Restore mocked values
+    finally:
+        cfg.HOST_INIT_CACHE = host_init_cache
+        csp_module._INIT_CACHE.clear()
+        del csp_module._INIT_CACHE_LOADED[:]
+
+
+def test_csphost_warm_pool():
+    """Tests Host warm pool"""
+    from threading import Lock
+    import apyfal.host._csp as csp_module
+    import apyfal._utilities as utl
+
+    # Mock variables
+    status = 'dummy_status'
+    dummy_ip = '127.0.0.1'
+    warm_pool = []
+    unmarked = []
+    started = []
+    paused = []
+    launched = []
+    terminated = []
+    foreign = []
+    refill_hosts = []
+    lock = Lock()
+
+    # Mock CSP class
+    class DummyClass(get_dummy_csp_class()):
+        """Dummy CSP"""
+        STATUS_RUNNING = status
+        TIMEOUT = 0.0
+        _WARM_POOL = True
+
+        @staticmethod
+        def _set_accelerator_requirements(*_, **__):
+            """Tested separately"""
+
+        @property
+        def _user_data(self):
+            """Returns fake result"""
+            return b'user_data'
+
+        def _iter_warm_instances(self, key):
+            """Returns warm pool instances"""
+            assert key == self._warm_pool_key()
+            return iter(list(warm_pool))
+
+        def _unmark_warm_instance(self, instance_id):
+            """Removes instance from warm pool"""
+            unmarked.append(instance_id)
+            warm_pool.remove(instance_id)
+
+        def _start_existing_instance(self, state):
+            """Not expected with warm pool"""
+            raise AssertionError('Warm instance started twice')
+
+        @staticmethod
+        def _start_warm_instance(instance_id):
+            """Marks as started, if not claimed by another process"""
+            if instance_id in foreign:
+                return False
+            started.append(instance_id)
+            return True
+
+        def _start_new_instance(self):
+            """Returns fake result, and marks warm pool tag"""
+            with lock:
+                instance_id = 'new_%d' % len(launched)
+                launched.append(self._warm_pool_member)
+                if self._warm_pool_member:
+                    refill_hosts.append(self)
+            return 'instance', instance_id
+
+        def _get_status(self):
+            """Returns fake result"""
+            return status
+
+        def _get_instance(self):
+            """Returns fake result"""
+            return 'instance'
+
+        def _pause_instance(self):
+            """Adds instance to warm pool"""
+            with lock:
+                paused.append(self._instance_id)
+                warm_pool.append(self._instance_id)
+
+        def _terminate_instance(self):
+            """Marks as terminated"""
+            terminated.append(self._instance_id)
+
+        @staticmethod
+        def _get_public_ip():
+            """Returns fake result"""
+            return dummy_ip
+
+    utl_check_port = utl.check_port
+    utl.check_port = lambda *_, **__: True
+
+    def wait_refill(count):
+        """Waits background refill"""
+        with utl.Timeout(5, sleep=0.01) as timeout:
+            while len(paused) < count or csp_module._WARM_POOL_REFILLING.get(
+                    host._warm_pool_key()):
+                assert not timeout.reached()
+
+    # Tests
+    try:
+        kwargs = dict(region='region', client_id='client_id',
+                      warm_pool_size=2)
+
+        # Test: Empty pool, create instance and refill pool
+        host = DummyClass(**kwargs)
+        key = host._warm_pool_key()
+        host.start()
+        assert host.instance_id.startswith('new_')
+        host._instance_id = None
+        wait_refill(2)
+        assert sorted(warm_pool) == sorted(paused)
+        assert len(warm_pool) == 2
+        assert launched.count(None) == 1
+        assert launched.count(key) == 2
+        for refill_host in refill_hosts:
+            assert refill_host._config is not host._config
+            assert refill_host._config_env is not host._config_env
+            assert (refill_host._boot_probe_deadline is not
+                    host._boot_probe_deadline)
+
+        # Test: Claims instance from warm pool, then refills pool
+        host = DummyClass(**kwargs)
+        host.start()
+        claimed = host.instance_id
+        assert unmarked == [claimed]
+        assert started == [claimed]
+        assert claimed in paused
+        assert claimed not in warm_pool
+        assert host.url == 'http://%s' % dummy_ip
+        assert host.stop_mode == 'term'
+        host._instance_id = None
+        wait_refill(3)
+        assert launched.count(None) == 1
+        assert launched.count(key) == 3
+        assert len(warm_pool) == 2
+
+        # Test: Skips instance claimed by another process
+        foreign.append(warm_pool[-1])
+        host = DummyClass(**kwargs)
+        host.start()
+        assert host.instance_id not in foreign
+        assert host.instance_id in started
+        assert foreign[0] not in started
+        host._instance_id = None
+        wait_refill(5)
+        assert launched.count(key) == 5
+
+        # Test: Warm pool disabled
+        host = DummyClass(region='region', client_id='client_id')
+        host.start()
+        assert host.instance_id == 'new_6'
+        assert len(warm_pool) == 3
+        assert started[0] == claimed
+        host._instance_id = None
+
+        # Test: Instances not yet paused terminated on exit
+        from threading import Event
+        starting = DummyClass(**kwargs)
+        starting._instance_id = 'starting'
+        launching = Event()
+        launching.set()
+        csp_module._WARM_POOL_STARTING[starting] = launching
+        DummyClass._stop_warm_pool_refill()
+        assert terminated == ['starting']
+        starting._instance_id = None
+
+        # Test: Wait of launches on exit is bounded
+        DummyClass._WARM_POOL_EXIT_TIMEOUT = 0.0
+        csp_module._WARM_POOL_STARTING.clear()
+        csp_module._WARM_POOL_STARTING[DummyClass(**kwargs)] = Event()
+        DummyClass._stop_warm_pool_refill()
+        assert terminated == ['starting']
+
+        # Test: No refill after exit
+        del launched[:]
+        csp_module._WARM_POOL_REFILLING[key] += 1
+        DummyClass._add_warm_instance(key, DummyClass(**kwargs))
+        assert not csp_module._WARM_POOL_REFILLING[key]
+        assert not launched
+
+    # Restore mocked functions
+    finally:
+        utl.check_port = utl_check_port
+        csp_module._WARM_POOL_CLAIMED.clear()
+        csp_module._WARM_POOL_STARTING.clear()
+        csp_module._WARM_POOL_EXITING[:] = [False]
+
+
+def test_csphost_boot_probe():
+    """Tests Host boot probe"""
+    from apyfal.exceptions import HostRuntimeException
+    import apyfal._utilities as utl
+
+    # Mock variables
+    dummy_ip = '127.0.0.1'
+    probes = []
+    booted = [False]
+    statuses = []
+    status = ['pending']
+
+    # Mock CSP class
+    class DummyClass(get_dummy_csp_class()):
+        """Dummy CSP"""
+        STATUS_RUNNING = 'running'
+        TIMEOUT = 2.0
+        _TIMEOUT_SLEEP = 0.05
+        _PROBE_INTERVAL = 0.001
+        _PROBE_ON_PROVISIONING = True
+
+        def __init__(self):
+            """Do not initialize"""
+            self._host_ip = None
+            self._boot_probe = None
+            self._boot_probe_deadline = [0.0]
+            self._use_private_ip = False
+            self._instance = 'instance'
+            self._instance_id = 'instance_id'
+
+        def __del__(self):
+            """Do nothing"""
+
+        def _poll_status(self):
+            """Returns fake result"""
+            statuses.append(status[0])
+            return status[0]
+
+        @staticmethod
+        def _get_public_ip():
+            """Returns fake result"""
+            return dummy_ip
+
+    def dummy_check_port(address, *_, **__):
+        """Checks argument and returns fake result"""
+        assert address == dummy_ip
+        probes.append(booted[0])
+        return booted[0]
+
+    utl_check_port = utl.check_port
+    utl.check_port = dummy_check_port
+
+    # Tests
+    try:
+        # Test: Instance ready once booted, even if status not updated
+        host = DummyClass()
+        booted[0] = True
+        host._wait_instance_ready()
+        host._wait_instance_boot()
+        assert probes == [True]
+        assert len(statuses) == 1
+
+        # Test: Probes with increasing interval until booted
+        del probes[:]
+        booted[0] = False
+        host = DummyClass()
+        probe = host._start_boot_probe()
+        assert host._start_boot_probe() is probe
+        while len(probes) < 5:
+            time.sleep(0.001)
+        booted[0] = True
+        host._wait_instance_boot()
+        assert probes[-1]
+        assert not any(probes[:-1])
+
+        # Test: No probe during provisioning if not supported
+        del probes[:]
+        del statuses[:]
+        host = DummyClass()
+        host._PROBE_ON_PROVISIONING = False
+        host.TIMEOUT = 0.0
+        with pytest.raises(HostRuntimeException):
+            host._wait_instance_ready()
+        assert host._boot_probe is None
+        assert not probes
+
+        # Test: Boot timeout
+        booted[0] = False
+        host = DummyClass()
+        host.TIMEOUT = 0.0
+        with pytest.raises(HostRuntimeException):
+            host._wait_instance_boot()
+        assert host._boot_probe is None
+
+        # Test: Probe aborted on stop
+        host = DummyClass()
+        probe = host._start_boot_probe()
+        host.stop('term')
+        assert probe.cancelled()
+        assert host._boot_probe is None
+
+        # Test: Probe cancelled while waiting boot
+        host = DummyClass()
+        host._boot_probe = probe
+        with pytest.raises(HostRuntimeException):
+            host._wait_instance_boot()
+
+        # Test: Probe cancelled while waiting provisioning
+        host = DummyClass()
+        host._boot_probe = probe
+        with pytest.raises(HostRuntimeException):
+            host._wait_instance_ready()
+
+        # Test: Boot timeout restarted once instance running
+        del probes[:]
+        status[0] = 'running'
+        host = DummyClass()
+        probe = host._start_boot_probe()
+        deadline = host._boot_probe_deadline[0]
+        time.sleep(0.01)
+        host._wait_instance_ready()
+        assert host._boot_probe_deadline[0] > deadline
+        host.stop('term')
+        assert probe.cancelled()
+
+    # Restore mocked functions
+    finally:
+        utl.check_port = utl_check_port
+
+
 def test_csphost_stop(tmpdir):
     """Tests Host.stop"""
     from apyfal.host import Host
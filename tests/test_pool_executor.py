@@ -1,12 +1,12 @@
 # coding=utf-8
 """apyfal._pool_executor tests"""
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from time import sleep
 
 import pytest
 
 
-def test_abstract_async_accelerator_process_map():
+def test_abstract_async_accelerator_process_map(tmpdir):
     """Tests _AbstractAsyncAccelerator.process_map"""
     from apyfal._pool_executor import _AbstractAsyncAccelerator
     from apyfal.exceptions import ClientConfigurationException
@@ -79,6 +79,26 @@ def test_abstract_async_accelerator_process_map():
             srcs=files_in, dsts=files_out, **process_kwargs)
     files_in = ['i0', 'i1', 'i2', 'i3']
 
+    # Test: Files patterns
+    files_in = [str(tmpdir.join(name)) for name in ('i0', 'i1')]
+    files_out = [str(tmpdir.join('out', '%s.out' % name))
+                 for name in ('i0', 'i1')]
+    for file_in in files_in:
+        with open(file_in, 'wt') as file:
+            file.write('')
+    assert list(acc.process_map(
+        srcs=str(tmpdir.join('i*')),
+        dsts=str(tmpdir.join('out', '{name}.out')),
+        **process_kwargs)) == [True] * len(files_out)
+
+    with pytest.raises(ClientConfigurationException):
+        acc.process_map(dsts=str(tmpdir.join('{name}')), **process_kwargs)
+
+    with pytest.raises(ClientConfigurationException):
+        acc.process_map(srcs=files_in, dsts=str(tmpdir), **process_kwargs)
+    files_in = ['i0', 'i1', 'i2', 'i3']
+    files_out = ['o0', 'o1', 'o2', 'o3']
+
     # Test: timeout
     process_duration = 0.05
     with pytest.raises(TimeoutError):
@@ -86,6 +106,74 @@ def test_abstract_async_accelerator_process_map():
             srcs=files_in, dsts=files_out, timeout=0.001,
             **process_kwargs))
 
+    # Test: Prefetch inputs
+    from contextlib import contextmanager
+    process_duration = 0.02
+    prefetched = []
+    held = []
+
+    class PrefetchAsyncAccelerator(AsyncAccelerator):
+        """Mocked sub class with prefetch"""
+        _prefetch_window = 2
+
+        def __init__(self):
+            # Processes inputs one by one
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        @staticmethod
+        def _prefetch(src):
+            """Mocked prefetch"""
+            if src == 'i1':
+                return None
+
+            @contextmanager
+            def prefetch():
+                """Holds input"""
+                prefetched.append(src)
+                held.append(src)
+                yield
+                held.remove(src)
+
+            return prefetch()
+
+    acc = PrefetchAsyncAccelerator()
+    assert list(acc.process_map(
+        srcs=files_in, dsts=files_out,
+        **process_kwargs)) == [True] * len(files_out)
+    sleep(0.05)
+    assert prefetched[-2:] == ['i2', 'i3']
+    assert 'i1' not in prefetched
+    assert not held
+
+    # Test: Inputs of completed or running operations are not prefetched
+    del prefetched[:]
+    future = acc._executor.submit(lambda: True)
+    future.result()
+    acc._prefetch_inputs(['i0'], [future])
+    future = Future()
+    future.set_running_or_notify_cancel()
+    acc._prefetch_inputs(['i0'], [future])
+    sleep(0.05)
+    assert not prefetched
+
+    # Test: Window starts at first operation not yet started, inputs are
+    # held until operation completion
+    acc._PREFETCH_POLL_INTERVAL = 0.01
+    futures = [Future() for _ in range(3)]
+    acc._prefetch_inputs(['i0', 'i2', 'i3'], futures)
+    sleep(0.05)
+    assert prefetched == ['i0', 'i2']
+    futures[0].set_running_or_notify_cancel()
+    sleep(0.05)
+    assert prefetched == ['i0', 'i2', 'i3']
+    assert held == ['i0', 'i2', 'i3']
+    futures[0].set_result(True)
+    assert held == ['i2', 'i3']
+    for future in futures[1:]:
+        future.cancel()
+    sleep(0.05)
+    assert not held
+
 
 def test_accelerator_pool_executor():
     """Tests AcceleratorPoolExecutor"""
@@ -110,10 +198,18 @@ def test_accelerator_pool_executor():
             """Return fake result"""
             return True
 
+    prefetched = []
+
     class Accelerator:
         """Mocked accelerator"""
         client = 'client'
         host = 'host'
+        _prefetch_window = 1
+
+        @staticmethod
+        def _prefetch(src):
+            """Mocked prefetch"""
+            prefetched.append(src)
 
         def __init__(self, *_, **__):
             """Do nothing"""
@@ -228,6 +324,10 @@ def test_accelerator_pool_executor():
         pool.process_map(srcs=[''] * 10, info_list=info_list, **process_kwargs)
         assert info_list == 10 * [dict()]
 
+        # Prefetch inputs with workers
+        assert pool._prefetch_window == workers_count
+        assert prefetched == [''] * 10
+
         info_list = []
         pool.stop(info_list=info_list,
                   stop_mode='check_info_dict',  # avoid check on __del__
@@ -237,3 +337,144 @@ def test_accelerator_pool_executor():
     # Restores mocked class
     finally:
         apyfal.Accelerator = apyfal_accelerator
+
+
+def test_in_flight_processes(tmpdir):
+    """Tests _InFlightProcesses"""
+    from threading import Event
+    from apyfal._pool_executor import _InFlightProcesses
+
+    in_flight = _InFlightProcesses()
+    executor = ThreadPoolExecutor(max_workers=4)
+    processed = []
+    release = Event()
+    src = str(tmpdir.join('src'))
+    leader_dst = tmpdir.join('leader_dst')
+    content = b'processed'
+
+    def process(src=None, dst=None, info_dict=None, **parameters):
+        """Mocked process"""
+        release.wait()
+        processed.append((src, dst, parameters))
+        if dst is not None:
+            with open(dst, 'wb') as file:
+                file.write(content)
+        if info_dict is not None:
+            info_dict['app'] = {'key': 'value'}
+        return 'result'
+
+    # Test: Identical operations are processed once, output copied to all dst
+    leader_info_dict = dict()
+    leader = in_flight.submit(
+        executor.submit, process, src=src, dst=str(leader_dst),
+        info_dict=leader_info_dict, parameter='value')
+    follower_dst = tmpdir.join('follower_dst')
+    follower_info_dict = dict()
+    followers = [
+        in_flight.submit(executor.submit, process, src=src,
+                         dst=str(follower_dst), info_dict=follower_info_dict,
+                         parameter='value'),
+        in_flight.submit(executor.submit, process, src=src,
+                         dst=str(leader_dst), parameter='value'),
+        in_flight.submit(executor.submit, process, src=src,
+                         parameter='value')]
+    release.set()
+    assert leader.result() == 'result'
+    for future in followers:
+        assert future.result() == 'result'
+    assert len(processed) == 1
+    assert follower_dst.read_binary() == content
+    assert follower_info_dict == leader_info_dict == {'app': {'key': 'value'}}
+    assert follower_info_dict['app'] is not leader_info_dict['app']
+    del processed[:]
+
+    # Test: Each output copy is submitted as its own task
+    release.clear()
+    submitted = []
+
+    def submit_count(function, *args, **kwargs):
+        """Mocked submit counting tasks"""
+        submitted.append(function)
+        return executor.submit(function, *args, **kwargs)
+
+    leader = in_flight.submit(
+        submit_count, process, src=src, dst=str(leader_dst), parameter='copy')
+    followers = [in_flight.submit(
+        submit_count, process, src=src, dst=str(tmpdir.join('copy%d' % i)),
+        parameter='copy') for i in range(2)]
+    release.set()
+    for future in followers:
+        assert future.result() == 'result'
+    assert len(submitted) == 3
+    assert len(processed) == 1
+    for i in range(2):
+        assert tmpdir.join('copy%d' % i).read_binary() == content
+    del processed[:]
+
+    # Test: Attached operations get a copy of result
+    release.clear()
+    result = {'key': ['value']}
+    futures = [in_flight.submit(
+        executor.submit, lambda **_: release.wait() and result, src=src)
+        for _ in range(2)]
+    release.set()
+    assert futures[0].result() is result
+    assert futures[1].result() == result
+    assert futures[1].result() is not result
+
+    # Test: Operation already done on submission
+    def submit_done(function, **kwargs):
+        """Mocked submit returning a completed future"""
+        future = Future()
+        future.set_result(function(**kwargs))
+        return future
+
+    assert in_flight.submit(
+        submit_done, process, src=src, parameter='done').result() == 'result'
+    assert not in_flight._processes
+    del processed[:]
+
+    # Test: Operation done is not in flight anymore
+    assert in_flight.submit(
+        executor.submit, process, src=src, parameter='value').result()
+    assert len(processed) == 1
+    del processed[:]
+
+    # Test: Different operations are not coalesced
+    release.clear()
+    futures = [
+        in_flight.submit(executor.submit, process, src=src,
+                         parameter='value'),
+        in_flight.submit(executor.submit, process, src=src,
+                         parameter='other_value'),
+        in_flight.submit(executor.submit, process, src=None,
+                         parameter='value'),
+        in_flight.submit(executor.submit, process, src=None,
+                         parameter='value')]
+
+    # Test: Output that can't be shared
+    futures.append(in_flight.submit(
+        executor.submit, process, src=src, dst=str(leader_dst),
+        parameter='value'))
+    release.set()
+    for future in futures:
+        assert future.result() == 'result'
+    assert len(processed) == 5
+    del processed[:]
+
+    # Test: Exception is shared
+    release.clear()
+
+    def process_error(**_):
+        """Mocked process"""
+        release.wait()
+        processed.append(None)
+        raise ValueError
+
+    futures = [in_flight.submit(executor.submit, process_error, src=src)
+               for _ in range(3)]
+    release.set()
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    assert len(processed) == 1
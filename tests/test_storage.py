@@ -73,6 +73,77 @@ def test_mount():
         pycosio.mount = pycosio_mount
 
 
+def test_auto_mount():
+    """Tests _AutoMount"""
+    import apyfal.storage as srg
+    from apyfal.configuration import Configuration
+    import pycosio
+
+    # Mocks pycosio.mount
+    mounted = []
+
+    def mount(storage=None, **_):
+        """Dummy pycosio.mount"""
+        mounted.append(storage)
+
+    pycosio_mount = pycosio.mount
+    pycosio.mount = mount
+
+    # Tests
+    try:
+        config = Configuration()
+        config['host']['host_type'] = 'AWS'
+        config['storage.OpenStack']['client_id'] = 'dummy_client_id'
+        config['host.not_exists']['client_id'] = 'dummy_client_id'
+        auto_mount = srg._AutoMount(config)
+
+        # Test: Nothing mounted before use
+        assert auto_mount._to_mount is None
+        auto_mount('file')
+        assert auto_mount._to_mount is None
+        assert not mounted
+
+        # Test: Configuration read once, unknown storage ignored
+        auto_mount('unknown_scheme')
+        assert sorted(auto_mount._to_mount) == ['aws', 'openstack']
+        assert not mounted
+
+        # Test: Mount on storage scheme
+        auto_mount('s3')
+        assert mounted == ['s3']
+        assert list(auto_mount._to_mount) == ['openstack']
+        auto_mount('s3')
+        assert mounted == ['s3']
+
+        # Test: Manual mount cancels automatic mount
+        auto_mount.discard('swift')
+        auto_mount('swift')
+        assert mounted == ['s3']
+        assert auto_mount._to_mount == dict()
+
+        # Test: Mount all on HTTP
+        auto_mount = srg._AutoMount(config)
+        auto_mount('https')
+        assert sorted(mounted) == ['s3', 's3', 'swift']
+        assert auto_mount._to_mount == dict()
+
+        # Test: Mount on parse_url
+        del mounted[:]
+        auto_mount = srg._auto_mount
+        srg._auto_mount = srg._AutoMount(config)
+        try:
+            srg.parse_url('path')
+            assert not mounted
+            srg.parse_url('swift://container/object')
+            assert mounted == ['swift']
+        finally:
+            srg._auto_mount = auto_mount
+
+    # Restore pycosio
+    finally:
+        pycosio.mount = pycosio_mount
+
+
 def test_parse_url():
     """Tests parse_url"""
     from apyfal.storage import parse_url
@@ -120,6 +191,399 @@ def test_open(tmpdir):
     assert src_file.read_binary() == dst_file.read_binary()
 
 
+def test_byte_range(tmpdir):
+    """Tests byte range in URL"""
+    import apyfal.storage as srg
+    from apyfal.exceptions import StorageConfigurationException
+
+    content = b'0123456789'
+    src = tmpdir.join('src')
+    src.write_binary(content)
+    src_path = str(src)
+    dst = tmpdir.join('dst')
+
+    # Test: split_range
+    assert srg.split_range(src_path) == (src_path, None)
+    assert srg.split_range(src_path + '#bytes=2-5') == (src_path, (2, 6))
+    assert srg.split_range(src_path + '#bytes=2-') == (src_path, (2, None))
+    assert srg.split_range(src_path + '#bytes=-5') == (src_path, (0, 6))
+    stream = BytesIO(content)
+    assert srg.split_range(stream) == (stream, None)
+
+    # Test: Reads range
+    for fragment, expected in (('2-5', b'2345'), ('7-', b'789'),
+                               ('-1', b'01'), ('8-20', b'89'),
+                               ('12-15', b'')):
+        with srg.open('%s#bytes=%s' % (src_path, fragment), 'rb') as file:
+            assert file.read() == expected
+
+    # Test: Reads range by parts and seeks in range
+    with srg.open(src_path + '#bytes=2-7', 'rb') as file:
+        assert file.read(4) == b'2345'
+        assert file.read(4) == b'67'
+        assert file.read(4) == b''
+        assert file.seek(-3, 2) == 3
+        assert file.read() == b'567'
+        assert file.seek(1) == 1
+        assert file.tell() == 1
+        assert file.read(1) == b'3'
+
+    # Test: Text mode
+    with srg.open(src_path + '#bytes=2-5', 'rt') as file:
+        assert file.read() == '2345'
+
+    # Test: Write not supported
+    with pytest.raises(StorageConfigurationException):
+        with srg.open(str(dst) + '#bytes=2-5', 'wb'):
+            pass
+
+    # Test: Copy range
+    srg.copy(src_path + '#bytes=3-6', str(dst))
+    assert dst.read_binary() == b'3456'
+
+    # Test: Stat whole file
+    assert srg.stat(src_path + '#bytes=3-6').st_size == len(content)
+
+
+def test_copy(tmpdir):
+    """Tests copy"""
+    from contextlib import contextmanager
+    import apyfal.storage as srg
+    from apyfal.configuration import Configuration
+    import pycosio
+
+    # Mocks pycosio
+    content = urandom(1024)
+    copied = []
+    opened = {}
+
+    def copy(source, destination):
+        """Dummy pycosio.copy"""
+        copied.append((source, destination))
+
+    @contextmanager
+    def pycosio_open(url, mode, **kwargs):
+        """Dummy pycosio.open"""
+        opened[mode] = kwargs
+        stream = BytesIO(content if 'r' in mode else b'')
+        yield stream
+        if 'w' in mode:
+            opened['written'] = stream.getvalue()
+
+    config = Configuration()
+    config['storage']['copy_max_workers'] = '4'
+    auto_mount = srg._auto_mount
+    srg._auto_mount = srg._AutoMount(config)
+    pycosio_copy = pycosio.copy
+    pycosio.copy = copy
+    pycosio_open_func = pycosio.open
+    pycosio.open = pycosio_open
+
+    # Tests
+    try:
+        # Test: Same storage, server side copy
+        srg.copy('dummy://src', 'dummy://dst')
+        assert copied == [('dummy://src', 'dummy://dst')]
+        assert not opened
+
+        # Test: Different storage, copy by parts
+        srg.copy('dummy://src', 'other://dst')
+        assert len(copied) == 1
+        assert opened['written'] == content
+        for mode in ('rb', 'wb'):
+            assert opened[mode] == dict(buffer_size=8 * 2 ** 20,
+                                        max_workers=4)
+
+        # Test: Parameters overrides configuration
+        opened.clear()
+        srg.copy('dummy://src', 'other://dst', part_size=1, max_workers=2)
+        for mode in ('rb', 'wb'):
+            assert opened[mode] == dict(buffer_size=2 ** 20, max_workers=2)
+
+        # Test: Local destination, opened as local file
+        opened.clear()
+        local_file = tmpdir.join('dst')
+        srg.copy('dummy://src', str(local_file), part_size=1, max_workers=2)
+        assert opened['rb'] == dict(buffer_size=2 ** 20, max_workers=2)
+        assert 'wb' not in opened
+        assert local_file.read_binary() == content
+
+        # Test: Local source, opened as local file
+        opened.clear()
+        srg.copy(str(local_file), 'other://dst')
+        assert 'rb' not in opened
+        assert opened['wb'] == dict(buffer_size=8 * 2 ** 20, max_workers=4)
+        assert opened['written'] == content
+
+        # Test: File-like object destination, not closed
+        opened.clear()
+        stream = BytesIO()
+        srg.copy('dummy://src', stream)
+        assert 'wb' not in opened
+        assert not stream.closed
+        assert stream.getvalue() == content
+
+    # Restores mocked values
+    finally:
+        srg._auto_mount = auto_mount
+        pycosio.copy = pycosio_copy
+        pycosio.open = pycosio_open_func
+
+
+def test_copy_local(tmpdir):
+    """Tests copy between local files"""
+    import apyfal.storage as srg
+
+    content = urandom(4096)
+    src = tmpdir.join('src')
+    src.write_binary(content)
+    dst = tmpdir.join('dst')
+
+    # Test: Copy with best available method
+    srg.copy(str(src), 'file://%s' % dst)
+    assert dst.read_binary() == content
+
+    # Test: Copy in directory with permission bits
+    src.chmod(0o640)
+    directory = tmpdir.mkdir('directory')
+    srg.copy(str(src), str(directory))
+    assert directory.join('src').read_binary() == content
+    assert directory.join('src').stat().mode & 0o777 == 0o640
+
+    # Test: Fall back on each method
+    ioctl = getattr(srg, '_ioctl', None)
+    copy_file_range = srg._copy_file_range
+    sendfile = srg._sendfile
+    called = []
+
+    def not_supported(*_):
+        """Raises OSError"""
+        called.append(True)
+        raise OSError
+
+    srg._ioctl = not_supported
+    try:
+        for name in ('_copy_file_range', '_sendfile'):
+            dst.remove()
+            srg.copy(str(src), str(dst))
+            assert dst.read_binary() == content
+            setattr(srg, name, not_supported)
+            del called[:]
+
+        dst.write_binary(b'previous_content_to_overwrite' * 1000)
+        srg.copy(str(src), str(dst))
+        assert dst.read_binary() == content
+        assert len(called) == 3
+
+    # Restores functions
+    finally:
+        srg._copy_file_range = copy_file_range
+        srg._sendfile = sendfile
+        if ioctl is None:
+            del srg._ioctl
+        else:
+            srg._ioctl = ioctl
+
+
+def test_glob_copy_many(tmpdir):
+    """Tests glob and copy_many"""
+    from collections import namedtuple
+    import apyfal.storage as srg
+    from apyfal.exceptions import StorageConfigurationException
+    import pycosio
+
+    # Local files
+    src_dir = tmpdir.join('src')
+    content = 'dummy_content'.encode()
+    for name in ('1.gz', '2.gz', '3.txt'):
+        src_dir.join(name).write_binary(content, ensure=True)
+    src_dir.join('sub').ensure(dir=True)
+
+    # Test: Local glob
+    pattern = '%s/*.gz' % src_dir
+    assert srg.glob(pattern) == [str(src_dir.join(name))
+                                 for name in ('1.gz', '2.gz')]
+
+    # Test: Copy many to directory
+    dst_dir = tmpdir.join('dst')
+    dst_url = '%s/' % dst_dir
+    assert srg.copy_many(pattern, dst_url) == [
+        str(dst_dir.join(name)) for name in ('1.gz', '2.gz')]
+    for name in ('1.gz', '2.gz'):
+        assert dst_dir.join(name).read_binary() == content
+    assert not dst_dir.join('3.txt').check()
+
+    # Test: Copy many with name template
+    dst_url = '%s/{name}.copy' % dst_dir
+    srcs = [str(src_dir.join('3.txt'))]
+    assert srg.copy_many(srcs, dst_url) == [str(dst_dir.join('3.txt.copy'))]
+    assert dst_dir.join('3.txt.copy').read_binary() == content
+
+    # Test: Copy many with destinations list
+    dsts = [str(dst_dir.join('copy.txt'))]
+    assert srg.copy_many(srcs, dsts) == dsts
+    assert dst_dir.join('copy.txt').read_binary() == content
+
+    # Test: Bad destinations
+    with pytest.raises(StorageConfigurationException):
+        srg.copy_many(srcs, dsts * 2)
+    with pytest.raises(StorageConfigurationException):
+        srg.copy_many(srcs, str(dst_dir))
+
+    # Test: Nothing to copy
+    assert srg.copy_many([], '%s/' % dst_dir) == []
+
+    # Mocks pycosio.scandir
+    entry = namedtuple('DirEntry', 'name, is_dir')
+    storage = {
+        'dummy://bucket/': ['dir1/', 'dir2/', 'file.gz'],
+        'dummy://bucket/dir1/': ['1.gz', '1.txt'],
+        'dummy://bucket/dir2/': ['2.gz', 'sub/']}
+
+    def scandir(url):
+        """Dummy pycosio.scandir"""
+        return [entry(name, lambda name=name: name.endswith('/'))
+                for name in storage[url]]
+
+    pycosio_scandir = pycosio.scandir
+    pycosio.scandir = scandir
+
+    # Tests
+    try:
+        # Test: Storage glob
+        assert srg.glob('dummy://bucket/*.gz') == ['dummy://bucket/file.gz']
+        assert srg.glob('dummy://bucket/*/*.gz') == [
+            'dummy://bucket/dir1/1.gz', 'dummy://bucket/dir2/2.gz']
+        assert srg.glob('dummy://bucket/dir?') == []
+        assert srg.glob('dummy://bucket/file.gz') == ['dummy://bucket/file.gz']
+
+        # Test: Host files can't be listed
+        with pytest.raises(StorageConfigurationException):
+            srg.glob('host://path/*')
+
+    # Restores mocked values
+    finally:
+        pycosio.scandir = pycosio_scandir
+
+
+def test_copy_skip_identical(tmpdir):
+    """Tests copy with skip_identical"""
+    from collections import namedtuple
+    import json
+    import apyfal.storage as srg
+    import apyfal.storage._checksum as checksum
+    import apyfal.configuration as cfg
+
+    src = tmpdir.join('src')
+    dst = tmpdir.join('dst')
+    content = urandom(1024)
+    src.write_binary(content)
+    copied = []
+
+    def copy(source, destination):
+        """Dummy apyfal.storage._copy_local"""
+        copied.append(destination)
+        copy_local(source, destination)
+
+    checksums_index = cfg.CHECKSUMS_INDEX
+    cfg.CHECKSUMS_INDEX = str(tmpdir.join('checksums.json'))
+    copy_local = srg._copy_local
+    srg._copy_local = copy
+    checksum._INDEX.clear()
+    del checksum._INDEX_LOADED[:]
+
+    # Tests
+    try:
+        # Test: Destination not exists
+        srg.copy(str(src), str(dst), skip_identical=True)
+        assert copied == [str(dst)]
+
+        # Test: Destination identical, checksums cached
+        srg.copy(str(src), str(dst), skip_identical=True)
+        assert copied == [str(dst)]
+        assert str(src) in checksum._INDEX
+        assert tmpdir.join('checksums.json').check()
+
+        # Test: Not skipped if disabled
+        srg.copy(str(src), str(dst), skip_identical=False)
+        assert len(copied) == 2
+
+        # Test: Destination different with same size
+        dst.write_binary(urandom(1024))
+        srg.copy(str(src), str(dst), skip_identical=True)
+        assert len(copied) == 3
+        assert dst.read_binary() == content
+
+        # Test: Checksums index reloaded from file
+        checksum._INDEX.clear()
+        del checksum._INDEX_LOADED[:]
+        srg.copy(str(src), str(dst), skip_identical=True)
+        assert len(copied) == 3
+        assert str(src) in checksum._INDEX
+
+        # Test: Cloud objects
+        stat = namedtuple('Stat', 'st_size, st_etag')
+        local_stat = srg.stat(str(src))
+        md5 = checksum._INDEX[str(src)][2]
+        assert checksum.is_identical(
+            str(src), 's3://bucket/key', local_stat,
+            stat(1024, '"%s"' % md5))
+        assert not checksum.is_identical(
+            str(src), 's3://bucket/key', local_stat,
+            stat(1024, '"%s-2"' % md5))
+        assert checksum.is_identical(
+            's3://bucket/key1', 's3://bucket/key2',
+            stat(1024, 'etag-2'), stat(1024, 'etag-2'))
+        assert not checksum.is_identical(
+            's3://bucket/key1', 'oss://bucket/key2',
+            stat(1024, 'etag-2'), stat(1024, 'etag-2'))
+        assert not checksum.is_identical(
+            's3://bucket/key1', 's3://bucket/key2',
+            stat(1024, 'etag'), stat(1023, 'etag'))
+
+        # Test: Cloud object without ETag is not a local file
+        stat_no_etag = namedtuple('Stat', 'st_size')
+        assert not checksum.is_identical(
+            str(src), 's3://bucket/%s' % src, local_stat, stat_no_etag(1024))
+
+        # Test: New checksums appended to index file, compacted if too large
+        index_file = tmpdir.join('checksums.json')
+        other = tmpdir.join('other')
+        other.write_binary(content)
+        lines = len(index_file.readlines())
+        assert checksum.is_identical(
+            str(src), str(other), local_stat, srg.stat(str(other)))
+        assert len(index_file.readlines()) == lines + 1
+
+        index_size = checksum._INDEX_SIZE
+        checksum._INDEX_SIZE = 1
+        other.write_binary(urandom(2048))
+        try:
+            checksum._local_md5(str(other), srg.stat(str(other)))
+        finally:
+            checksum._INDEX_SIZE = index_size
+        assert len(index_file.readlines()) == 1
+
+        # Test: Entries appended by other processes kept on compaction
+        foreign = json.dumps(['/foreign', 1, 1.0, 'checksum'])
+        index_file.write(foreign + '\n', mode='a')
+        checksum._INDEX_LINES[0] = 2 * checksum._INDEX_SIZE
+        other.write_binary(urandom(2048))
+        checksum._local_md5(str(other), srg.stat(str(other)))
+        assert foreign + '\n' in index_file.readlines()
+        assert len(index_file.readlines()) == 2
+        assert checksum._INDEX['/foreign'] == [1, 1.0, 'checksum']
+        assert not [path for path in tmpdir.listdir()
+                    if path.basename.startswith('.checksums.json')]
+
+    # Restores mocked values
+    finally:
+        srg._copy_local = copy_local
+        cfg.CHECKSUMS_INDEX = checksums_index
+        checksum._INDEX.clear()
+        del checksum._INDEX_LOADED[:]
+
+
 def import_from_generic_test(storage_type, **kwargs):
     """
     Test to import a class from generic.
@@ -90,6 +90,29 @@ def test_create_key_pair_file(tmpdir):
         _utl.SSH_DIR = utl_ssh_dir
 
 
+def test_atomic_write(tmpdir):
+    """Tests atomic_write"""
+    from apyfal._utilities import atomic_write
+
+    file = tmpdir.join('file')
+    file.write('previous')
+
+    # Test: File replaced once written
+    with atomic_write(str(file)) as stream:
+        stream.write('new')
+        assert file.read() == 'previous'
+    assert file.read() == 'new'
+    assert tmpdir.listdir() == [file]
+
+    # Test: File unchanged on error
+    with pytest.raises(ValueError):
+        with atomic_write(str(file), 'wb') as stream:
+            stream.write(b'partial')
+            raise ValueError
+    assert file.read() == 'new'
+    assert tmpdir.listdir() == [file]
+
+
 def test_recursive_update():
     """Tests test_recursive_update"""
     from apyfal._utilities import recursive_update
@@ -141,6 +164,44 @@ def test_memoizedmethod():
     assert dummy.to_memoize(value) == value
 
 
+def test_shared_client():
+    """Tests shared_client and new_client"""
+    from apyfal._utilities import shared_client, new_client
+
+    class Client:
+        """Fake client"""
+
+        def __init__(self, *args, **kwargs):
+            self.args = args
+            self.kwargs = kwargs
+
+        def resource(self, name):
+            """Fake client method"""
+            return name, self
+
+    # Test: Same client for same arguments
+    client = shared_client(Client, 'aws', region='region', secret_id='1')
+    assert client.args == ('aws',)
+    assert client.kwargs == {'region': 'region', 'secret_id': '1'}
+    assert shared_client(
+        Client, 'aws', secret_id='1', region='region') is client
+
+    # Test: New client for other arguments
+    assert shared_client(Client, 'aws', region='region',
+                         secret_id='2') is not client
+    assert shared_client(Client, 'aws', region='other',
+                         secret_id='1') is not client
+
+    # Test: Shared client from shared client method
+    assert shared_client(client.resource, 'ec2') is shared_client(
+        client.resource, 'ec2')
+
+    # Test: New client not shared
+    assert new_client(Client, 'aws', region='region',
+                      secret_id='1') is not client
+    assert new_client(client.resource, 'ec2') == ('ec2', client)
+
+
 def test_format_url():
     """Tests format_url"""
     from apyfal._utilities import format_url